@@ -0,0 +1,80 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Event-loop lag while 1000 concurrent coroutines verify distinct tokens with
+AsyncCasdoorSDK.parse_jwt_token (on the loop) and aparse_jwt_token (on an
+executor). Lag is how late a 1 ms heartbeat task wakes up.
+
+Run from the repository root: python -m benchmarks.bench_aparse_jwt_token
+"""
+
+import asyncio
+import statistics
+import time
+
+import src.tests.test_util as test_util
+from src.casdoor import AsyncCasdoorSDK
+
+CONCURRENCY = 1000
+INTERVAL = 0.001
+
+
+async def heartbeat(lags, stop):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(INTERVAL)
+        lags.append(time.perf_counter() - start - INTERVAL)
+
+
+async def run(label, verify, tokens):
+    lags = []
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(heartbeat(lags, stop))
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await asyncio.gather(*(verify(token) for token in tokens))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await ticker
+
+    lags.sort()
+    p99 = lags[min(len(lags) - 1, int(len(lags) * 0.99))]
+    print(
+        f"{label:<20} total {elapsed * 1000:8.1f} ms  lag median {statistics.median(lags) * 1000:7.2f} ms"
+        f"  p99 {p99 * 1000:7.2f} ms  max {lags[-1] * 1000:7.2f} ms"
+    )
+
+
+async def main():
+    private_key, certificate = test_util.generate_signing_key()
+    sdk = AsyncCasdoorSDK(
+        test_util.TestEndpoint,
+        test_util.TestClientId,
+        test_util.TestClientSecret,
+        certificate,
+        test_util.TestOrganization,
+        test_util.TestApplication,
+    )
+    tokens = [test_util.sign_token(private_key, name=f"user{i}") for i in range(CONCURRENCY)]
+
+    async def verify_on_loop(token):
+        return sdk.parse_jwt_token(token)
+
+    await run("parse_jwt_token", verify_on_loop, tokens)
+    await run("aparse_jwt_token", sdk.aparse_jwt_token, tokens)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,74 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+A burst of 500 concurrent AsyncCasdoorSDK.enforce calls against a local
+stand-in server, sent one by one and through the enforce batcher.
+
+Run from the repository root: python -m benchmarks.bench_enforce_batcher
+"""
+
+import asyncio
+import json
+import time
+
+import src.tests.test_util as test_util
+from src.casdoor import AsyncCasdoorSDK
+
+BURST = 500
+PERMISSION_ID = f"{test_util.TestOrganization}/permission-built-in"
+
+
+def enforce(query, body):
+    return {"status": "ok", "data": [json.loads(body)[0] == "alice"]}
+
+
+def batch_enforce(query, body):
+    return {"status": "ok", "data": [[request[0] == "alice" for request in json.loads(body)]]}
+
+
+async def run(label, server, **kwargs):
+    server.requests.clear()
+    sdk = AsyncCasdoorSDK(
+        server.endpoint,
+        test_util.TestClientId,
+        test_util.TestClientSecret,
+        test_util.TestJwtPublicKey,
+        test_util.TestOrganization,
+        test_util.TestApplication,
+        **kwargs,
+    )
+    async with sdk:
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(sdk.enforce(PERMISSION_ID, "", "", "", "", ["alice", f"data{i}", "read"]) for i in range(BURST))
+        )
+        elapsed = time.perf_counter() - start
+    print(f"{label:<10} {elapsed * 1000:8.1f} ms  {len(server.requests):4d} requests")
+    if sdk.enforce_batcher is not None:
+        metrics = sdk.enforce_batcher.metrics()
+        print(
+            f"{'':<10} average batch {metrics['average_batch_size']:.1f}"
+            f"  average queue delay {metrics['average_queue_delay'] * 1000:.2f} ms"
+        )
+
+
+async def main():
+    with test_util.LocalCasdoorServer({"/api/enforce": enforce, "/api/batch-enforce": batch_enforce}) as server:
+        await run("unbatched", server)
+        await run("batched", server, enforce_batch_window=0.002, enforce_max_batch_size=100)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
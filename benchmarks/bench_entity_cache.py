@@ -0,0 +1,63 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Latency of CasdoorSDK.get_user for a handful of hot users against a local
+stand-in server, without and with an EntityCache.
+
+Run from the repository root: python -m benchmarks.bench_entity_cache
+"""
+
+import time
+
+import src.tests.test_util as test_util
+from src.casdoor import CasdoorSDK, EntityCache
+from src.casdoor.user import User
+
+CALLS = 5000
+NAMES = [f"user{i}" for i in range(10)]
+
+
+def get_user_route(query, body):
+    name = query["id"].split("/")[-1]
+    user = User.new(test_util.TestOrganization, name, "2025-01-01T00:00:00Z", name, f"{name}@example.com")
+    return {"status": "ok", "data": user.to_dict()}
+
+
+def run(sdk, label):
+    start = time.perf_counter()
+    for i in range(CALLS):
+        sdk.get_user(NAMES[i % len(NAMES)])
+    elapsed = time.perf_counter() - start
+    print(f"{label:<16} {elapsed / CALLS * 1e6:8.1f} µs per get_user")
+
+
+def main():
+    with test_util.LocalCasdoorServer({"/api/get-user": get_user_route}) as server:
+        for label, cache in (("no cache", None), ("EntityCache", EntityCache())):
+            sdk = CasdoorSDK(
+                server.endpoint,
+                test_util.TestClientId,
+                test_util.TestClientSecret,
+                test_util.TestJwtPublicKey,
+                test_util.TestOrganization,
+                test_util.TestApplication,
+                entity_cache=cache,
+            )
+            with sdk:
+                run(sdk, label)
+
+
+if __name__ == "__main__":
+    main()
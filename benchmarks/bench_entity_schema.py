@@ -0,0 +1,69 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Entities per second built by from_dict and serialized by to_dict for each
+entity class, with the schema-driven from_dict and with the previous
+__init__ followed by a hasattr and setattr per key.
+
+Run from the repository root: python -m benchmarks.bench_entity_schema
+"""
+
+import functools
+import time
+
+from src.casdoor.application import Application
+from src.casdoor.organization import Organization
+from src.casdoor.payment import Payment
+from src.casdoor.permission import Permission
+from src.casdoor.provider import Provider
+from src.casdoor.role import Role
+from src.casdoor.session import Session
+from src.casdoor.token import Token
+from src.casdoor.user import User
+
+ENTITIES = 20_000
+CLASSES = [User, Role, Permission, Token, Application, Organization, Provider, Payment, Session]
+
+
+def legacy_from_dict(cls, data):
+    entity = cls()
+    for key, value in data.items():
+        if hasattr(entity, key):
+            setattr(entity, key, value)
+    return entity
+
+
+def rate(function, items) -> float:
+    start = time.perf_counter()
+    for item in items:
+        function(item)
+    return len(items) / (time.perf_counter() - start)
+
+
+def main():
+    print(f"{'entity':14} {'legacy/s':>10} {'schema/s':>10} {'speedup':>8} {'to_dict/s':>10}")
+    for cls in CLASSES:
+        # server responses carry every field, plus some the SDK doesn't know
+        sample = dict(cls().__dict__, name="bench", owner="built-in", newServerField="x", anotherField=1)
+        items = [dict(sample, name=f"bench{i}") for i in range(ENTITIES)]
+        legacy = rate(functools.partial(legacy_from_dict, cls), items)
+        schema = rate(cls.from_dict, items)
+        entities = [cls.from_dict(data) for data in items]
+        serialized = rate(cls.to_dict, entities)
+        print(f"{cls.__name__:14} {legacy:10.0f} {schema:10.0f} {schema / legacy:7.1f}x {serialized:10.0f}")
+
+
+if __name__ == "__main__":
+    main()
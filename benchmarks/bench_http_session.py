@@ -0,0 +1,66 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Requests per second of CasdoorSDK.get_user against a local stand-in server,
+with a fresh connection per call versus the pooled keep-alive session.
+
+Run from the repository root: python -m benchmarks.bench_http_session
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+import src.tests.test_util as test_util
+from src.casdoor import CasdoorSDK
+
+CALLS = 2000
+THREADS = 8
+
+
+def get_user_route(query, body):
+    return {"status": "ok", "data": {"owner": test_util.TestOrganization, "name": "alice"}}
+
+
+def run(sdk, label):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        list(executor.map(lambda _: sdk.get_user("alice"), range(CALLS)))
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {CALLS / elapsed:10.0f} req/s")
+
+
+def main():
+    with test_util.LocalCasdoorServer({"/api/get-user": get_user_route}) as server:
+        sdk = CasdoorSDK(
+            server.endpoint,
+            test_util.TestClientId,
+            test_util.TestClientSecret,
+            test_util.TestJwtPublicKey,
+            test_util.TestOrganization,
+            test_util.TestApplication,
+            pool_maxsize=THREADS,
+        )
+        with sdk:
+            run(sdk, "pooled session")
+
+        # the pre-pool behaviour: module-level requests helpers, one connection per call
+        sdk.http_session = requests
+        run(sdk, "connection per call")
+
+
+if __name__ == "__main__":
+    main()
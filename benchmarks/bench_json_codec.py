@@ -0,0 +1,72 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Decoding a get-users response of 20k users and encoding as many
+update-user bodies with each available JSON library (best of 3), against the previous
+r.json() (decode to str, then json.loads) and json.dumps.
+
+Run from the repository root: python -m benchmarks.bench_json_codec
+"""
+
+import json
+import time
+
+from src.casdoor import codec
+from src.casdoor.user import User
+
+USERS = 20_000
+
+
+def payload() -> bytes:
+    users = []
+    for i in range(USERS):
+        user = User.new("bench", f"user{i}", "2025-01-01T00:00:00Z", f"Usér {i}", f"user{i}@example.com")
+        user.avatar = "https://cdn.casbin.org/img/casbin.svg"
+        user.properties = {"department": f"dept{i % 50}"}
+        users.append(user.to_dict())
+    return json.dumps({"status": "ok", "msg": "", "data": users}).encode("utf-8")
+
+
+def timed(function, *args) -> float:
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    data = payload()
+    users = json.loads(data)["data"]
+    print(f"{USERS} users, {len(data) / 2**20:.1f} MiB")
+
+    decode = timed(lambda: json.loads(data.decode("utf-8")))
+    encode = timed(lambda: [json.dumps(user) for user in users])
+    print(f"{'r.json()':10} decode {decode * 1000:7.1f} ms   encode {encode * 1000:7.1f} ms")
+
+    for library in ("json", "ujson", "orjson"):
+        try:
+            codec.use(library)
+        except ValueError:
+            print(f"{library:10} not installed")
+            continue
+        decode = timed(codec.loads, data)
+        encode = timed(lambda: [codec.dumps(user) for user in users])
+        print(f"{library:10} decode {decode * 1000:7.1f} ms   encode {encode * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
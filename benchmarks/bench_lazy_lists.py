@@ -0,0 +1,71 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Time and peak memory of turning the data of a get-users response of 20k
+users into a list, counting it and reading one user, with lazy_lists off
+(every User built) and on (LazyList).
+
+Run from the repository root: python -m benchmarks.bench_lazy_lists
+"""
+
+import time
+import tracemalloc
+
+from src.casdoor.entity_list import LazyList
+from src.casdoor.user import User
+
+USERS = 20_000
+
+
+def items():
+    users = []
+    for i in range(USERS):
+        user = User.new("bench", f"user{i}", "2025-01-01T00:00:00Z", f"User {i}", f"user{i}@example.com")
+        users.append(user.to_dict())
+    return users
+
+
+def eager(data):
+    users = [User.from_dict(item) for item in data]
+    return len(users), users[USERS // 2].name
+
+
+def lazy(data):
+    users = LazyList(User, data)
+    return len(users), users[USERS // 2].name
+
+
+def measure(function, data):
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        function(data)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    function(data)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+
+def main():
+    data = items()
+    for label, function in (("eager", eager), ("lazy", lazy)):
+        seconds, peak = measure(function, data)
+        print(f"{label:6} {seconds * 1000:8.2f} ms   peak {peak / 2**20:6.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
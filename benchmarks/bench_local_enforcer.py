@@ -0,0 +1,92 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Decisions per second of LocalEnforcer for a keyMatch2 model with 100k policy
+lines, with the compiled matcher and with the matcher source evaluated
+against a dict of tokens for every policy.
+
+Run from the repository root: python -m benchmarks.bench_local_enforcer
+"""
+
+import random
+import time
+
+from src.casdoor import LocalEnforcer
+from src.casdoor.matcher import FUNCTIONS, translate_matcher
+
+POLICIES = 100_000
+DECISIONS = 20
+
+MODEL = """
+[request_definition]
+r = sub, obj, act
+
+[policy_definition]
+p = sub, obj, act
+
+[role_definition]
+g = _, _
+
+[policy_effect]
+e = some(where (p.eft == allow))
+
+[matchers]
+m = g(r.sub, p.sub) && keyMatch2(r.obj, p.obj) && r.act == p.act
+"""
+
+
+def interpreted(enforcer, matcher, policies, request):
+    # the naive approach: evaluate the matcher source against a dict of tokens
+    tokens = enforcer.request_tokens + enforcer.policy_tokens
+    code = compile(translate_matcher(matcher, {token: token for token in tokens}, list(FUNCTIONS) + ["g"]), "", "eval")
+    namespace = dict(FUNCTIONS, g=lambda name, role: name == role, __builtins__={})
+    env = {token: request[i] for i, token in enumerate(enforcer.request_tokens)}
+    for policy in policies:
+        for i, token in enumerate(enforcer.policy_tokens):
+            env[token] = policy[i]
+        if eval(code, namespace, env):
+            return True
+    return False
+
+
+def main():
+    rng = random.Random(0)
+    policies = [
+        [f"built-in/user{rng.randrange(1000)}", f"/api/resource{i % 500}/:id", rng.choice(["read", "write"])]
+        for i in range(POLICIES)
+    ]
+    start = time.perf_counter()
+    enforcer = LocalEnforcer(MODEL, policies, {"g": []}, "built-in/bench")
+    print(f"build {(time.perf_counter() - start) * 1000:.1f} ms for {POLICIES} policies")
+
+    # requests nobody is allowed, so every decision scans all policies
+    requests = [["built-in/nobody", f"/api/resource{i}/1", "read"] for i in range(DECISIONS)]
+
+    start = time.perf_counter()
+    for request in requests:
+        enforcer.enforce(request)
+    compiled = DECISIONS / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for request in requests:
+        interpreted(enforcer, MODEL.rsplit("m = ", 1)[1], enforcer.policies, request)
+    naive = DECISIONS / (time.perf_counter() - start)
+
+    print(f"compiled     {compiled:10.1f} decisions/s")
+    print(f"interpreted  {naive:10.1f} decisions/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Wall-clock time of reading 5000 users in pages of 100 from a local
+stand-in server that takes 20 ms per request, one page after another
+(iter_users without prefetch) versus get_all_users at several levels of
+concurrency.
+
+Run from the repository root: python -m benchmarks.bench_parallel_pages
+"""
+
+import time
+
+import src.tests.test_util as test_util
+from src.casdoor import CasdoorSDK
+
+USERS = 5000
+PAGE_SIZE = 100
+LATENCY = 0.02
+
+ITEMS = [{"owner": test_util.TestOrganization, "name": f"user{i}"} for i in range(USERS)]
+
+
+def get_users_route(query, body):
+    time.sleep(LATENCY)
+    p, page_size = int(query["p"]), int(query["pageSize"])
+    return {"status": "ok", "data": ITEMS[(p - 1) * page_size : p * page_size], "data2": USERS}
+
+
+def run(label, function, *args, **kwargs):
+    start = time.perf_counter()
+    count = sum(1 for _ in function(*args, **kwargs))
+    print(f"{label:<28} {(time.perf_counter() - start) * 1000:8.0f} ms   {count} users")
+
+
+def main():
+    with test_util.LocalCasdoorServer({"/api/get-users": get_users_route}) as server:
+        sdk = CasdoorSDK(
+            server.endpoint,
+            test_util.TestClientId,
+            test_util.TestClientSecret,
+            test_util.TestJwtPublicKey,
+            test_util.TestOrganization,
+            test_util.TestApplication,
+            pool_maxsize=16,
+        )
+        with sdk:
+            run("sequential pages", sdk.iter_users, PAGE_SIZE, prefetch=False)
+            for concurrency in (1, 4, 8, 16):
+                run(f"get_all_users concurrency={concurrency}", sdk.get_all_users, PAGE_SIZE, concurrency)
+
+
+if __name__ == "__main__":
+    main()
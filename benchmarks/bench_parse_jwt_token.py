@@ -0,0 +1,64 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Tokens verified per second by CasdoorSDK.parse_jwt_token, parsing the
+certificate on every call, reusing the memoized public key, and serving
+repeated tokens from a TokenCache.
+
+Run from the repository root: python -m benchmarks.bench_parse_jwt_token
+"""
+
+import time
+
+import src.tests.test_util as test_util
+from src.casdoor import CasdoorSDK, TokenCache
+
+TOKENS = 2000
+
+
+def run(label, verify):
+    start = time.perf_counter()
+    for _ in range(TOKENS):
+        verify()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {TOKENS / elapsed:10.0f} tokens/s")
+
+
+def main():
+    private_key, certificate = test_util.generate_signing_key()
+    sdk = CasdoorSDK(
+        test_util.TestEndpoint,
+        test_util.TestClientId,
+        test_util.TestClientSecret,
+        certificate,
+        test_util.TestOrganization,
+        test_util.TestApplication,
+    )
+    token = test_util.sign_token(private_key, name="alice")
+
+    def parse_uncached():
+        # reassigning the certificate drops the memoized key, like the old per-call parse
+        sdk.certificate = certificate
+        sdk.parse_jwt_token(token)
+
+    run("certificate per call", parse_uncached)
+    run("memoized public key", lambda: sdk.parse_jwt_token(token))
+
+    sdk.token_cache = TokenCache()
+    run("token cache", lambda: sdk.parse_jwt_token(token))
+
+
+if __name__ == "__main__":
+    main()
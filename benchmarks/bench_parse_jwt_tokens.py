@@ -0,0 +1,63 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Tokens verified per second by CasdoorSDK.parse_jwt_tokens for a batch of
+distinct tokens, in the calling thread, on a thread pool and on a process pool.
+
+Run from the repository root: python -m benchmarks.bench_parse_jwt_tokens
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import src.tests.test_util as test_util
+from src.casdoor import CasdoorSDK
+
+TOKENS = 4000
+WORKERS = os.cpu_count() or 1
+
+
+def run(label, sdk, tokens, executor=None):
+    start = time.perf_counter()
+    results = sdk.parse_jwt_tokens(tokens, executor=executor)
+    elapsed = time.perf_counter() - start
+    assert all(isinstance(result, dict) for result in results)
+    print(f"{label:<24} {len(tokens) / elapsed:10.0f} tokens/s")
+
+
+def main():
+    private_key, certificate = test_util.generate_signing_key()
+    sdk = CasdoorSDK(
+        test_util.TestEndpoint,
+        test_util.TestClientId,
+        test_util.TestClientSecret,
+        certificate,
+        test_util.TestOrganization,
+        test_util.TestApplication,
+    )
+    tokens = [test_util.sign_token(private_key, name=f"user{i}") for i in range(TOKENS)]
+
+    run("calling thread", sdk, tokens)
+    with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+        run(f"{WORKERS} threads", sdk, tokens, executor)
+    with ProcessPoolExecutor(max_workers=WORKERS) as executor:
+        # warm the workers up so process start-up is not measured
+        sdk.parse_jwt_tokens(tokens[:WORKERS], executor=executor)
+        run(f"{WORKERS} processes", sdk, tokens, executor)
+
+
+if __name__ == "__main__":
+    main()
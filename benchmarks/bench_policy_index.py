@@ -0,0 +1,108 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Rebuild time and per-lookup cost of LocalEnforcer.from_permissions for 20k
+permissions with a domain-aware keyMatch2 model, with and without the policy
+index.
+
+Run from the repository root: python -m benchmarks.bench_policy_index
+"""
+
+import random
+import time
+
+from src.casdoor import LocalEnforcer
+from src.casdoor.permission import Permission
+from src.casdoor.role import Role
+
+PERMISSIONS = 20_000
+DECISIONS = 200
+
+MODEL = """
+[request_definition]
+r = sub, dom, obj, act
+
+[policy_definition]
+p = sub, dom, obj, act, eft, id
+
+[role_definition]
+g = _, _, _
+
+[policy_effect]
+e = some(where (p.eft == allow))
+
+[matchers]
+m = g(r.sub, p.sub, r.dom) && r.dom == p.dom && keyMatch2(r.obj, p.obj) && r.act == p.act
+"""
+
+
+def permissions(rng):
+    result = []
+    for i in range(PERMISSIONS):
+        permission = Permission.from_dict(
+            {
+                "owner": "bench",
+                "name": f"permission{i}",
+                "users": [f"bench/user{rng.randrange(5000)}"],
+                "roles": [f"bench/role{rng.randrange(50)}"] if i % 10 == 0 else [],
+                "domains": [f"tenant{rng.randrange(20)}"],
+                "resources": [f"/api/resource{rng.randrange(2000)}/:id", "/static/*"][: 1 + (i % 50 == 0)],
+                "actions": [rng.choice(["Read", "Write"])],
+                "effect": "Allow",
+                "isEnabled": True,
+            }
+        )
+        result.append(permission)
+    return result
+
+
+def roles(rng):
+    return [
+        Role.from_dict(
+            {
+                "owner": "bench",
+                "name": f"role{i}",
+                "users": [f"bench/user{rng.randrange(5000)}" for _ in range(20)],
+                "domains": [f"tenant{i % 20}"],
+                "roles": [],
+            }
+        )
+        for i in range(50)
+    ]
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    rng = random.Random(0)
+    perms, role_list = permissions(rng), roles(rng)
+    requests = [
+        [f"bench/user{rng.randrange(5000)}", f"tenant{rng.randrange(20)}", f"/api/resource{i}/1", "read"]
+        for i in range(DECISIONS)
+    ]
+
+    for use_index in (True, False):
+        label = "indexed" if use_index else "full scan"
+        enforcer, build = timed(LocalEnforcer.from_permissions, MODEL, perms, role_list, "bench/model", use_index)
+        _, elapsed = timed(enforcer.batch_enforce, requests)
+        print(f"{label:10} build {build * 1000:8.1f} ms   lookup {elapsed / DECISIONS * 1e6:10.1f} us/decision")
+
+
+if __name__ == "__main__":
+    main()
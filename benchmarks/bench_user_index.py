@@ -0,0 +1,54 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Building a UserIndex of 100k users, then looking users up by email with
+the index versus scanning the user list.
+
+Run from the repository root: python -m benchmarks.bench_user_index
+"""
+
+import time
+
+from src.casdoor import User, UserIndex
+
+USERS = 100_000
+LOOKUPS = 1000
+
+
+def main():
+    users = []
+    for i in range(USERS):
+        user = User.new("bench", f"user{i}", "2025-01-01T00:00:00Z", f"User {i}", f"user{i}@example.com")
+        user.id, user.phone = f"uid-{i}", f"555{i:06}"
+        users.append(user.to_dict())
+    emails = [f"user{i * (USERS // LOOKUPS)}@example.com" for i in range(LOOKUPS)]
+
+    start = time.perf_counter()
+    index = UserIndex(users)
+    print(f"load {USERS} users      {(time.perf_counter() - start) * 1000:8.0f} ms")
+
+    start = time.perf_counter()
+    for email in emails:
+        index.get("email", email)
+    print(f"index lookup          {(time.perf_counter() - start) / LOOKUPS * 1e6:8.1f} µs")
+
+    start = time.perf_counter()
+    for email in emails[::20]:
+        next(user for user in users if user["email"] == email)
+    print(f"list scan             {(time.perf_counter() - start) / 50 * 1e6:8.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
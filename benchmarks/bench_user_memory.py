@@ -0,0 +1,73 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Memory held by 100k users parsed from a get-users response as User and as
+CompactUser objects, measured with tracemalloc.
+
+Run from the repository root: python -m benchmarks.bench_user_memory
+"""
+
+import gc
+import json
+import time
+import tracemalloc
+
+from src.casdoor import CompactUser, User
+
+USERS = 100_000
+
+
+def payload() -> bytes:
+    users = []
+    for i in range(USERS):
+        user = User.new("bench", f"user{i}", "2025-01-01T00:00:00Z", f"User {i}", f"user{i}@example.com")
+        user.id = f"3b1f0c2e-{i:08d}"
+        user.type = "normal-user"
+        user.password = "***"
+        user.avatar = "https://cdn.casbin.org/img/casbin.svg"
+        user.signupApplication = "app-bench"
+        user.updatedTime = "2025-01-02T00:00:00Z"
+        if i % 10 == 0:
+            user.github = f"gh{i}"
+        users.append(user.to_dict())
+    return json.dumps({"status": "ok", "data": users}).encode("utf-8")
+
+
+def measure(user_class, data: bytes):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    users = [user_class.from_dict(user) for user in json.loads(data)["data"]]
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del users
+    return current, peak, elapsed
+
+
+def main():
+    data = payload()
+    print(f"{USERS} users, {len(data) / 2**20:.1f} MiB of JSON")
+    for user_class in (User, CompactUser):
+        current, peak, elapsed = measure(user_class, data)
+        print(
+            f"{user_class.__name__:12} held {current / 2**20:7.1f} MiB  peak {peak / 2**20:7.1f} MiB  "
+            f"{current / USERS:6.0f} B/user  parse+build {elapsed * 1000:6.0f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,13 @@
 from .async_main import AsyncCasdoorSDK  # noqa: F401
+from .decision_cache import DecisionCache  # noqa: F401
+from .enforce_batcher import AsyncEnforceBatcher, EnforceBatcher  # noqa: F401
+from .entity_cache import EntityCache  # noqa: F401
+from .entity_list import LazyList  # noqa: F401
+from .jwks import JwksKeySet  # noqa: F401
 from .main import CasdoorSDK  # noqa: F401
-from .user import User  # noqa: F401
+from .policy_engine import LocalEnforcer  # noqa: F401
+from .role_graph import AsyncRoleGraphRefresher, RoleGraph, RoleGraphRefresher  # noqa: F401
+from .token_cache import TokenCache  # noqa: F401
+from .token_manager import AsyncClientCredentialsTokenManager, ClientCredentialsTokenManager  # noqa: F401
+from .user import CompactUser, User  # noqa: F401
+from .user_index import UserIndex  # noqa: F401
@@ -12,10 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import json
-from typing import Dict, List
+from typing import Dict, Iterator, List
 
-import requests
+from . import codec
+from .entity_list import entity_list
+from .pagination import DEFAULT_PAGE_SIZE, iter_entities
+from .schema import schema_of
 
 
 class Adapter:
@@ -49,17 +51,13 @@ class Adapter:
         if data is None:
             return None
 
-        adapter = cls()
-        for key, value in data.items():
-            if hasattr(adapter, key):
-                setattr(adapter, key, value)
-        return adapter
+        return schema_of(cls).from_dict(data)
 
     def __str__(self):
         return str(self.__dict__)
 
     def to_dict(self) -> dict:
-        return self.__dict__
+        return dict(self.__dict__)
 
 
 class _AdapterSDK:
@@ -75,14 +73,23 @@ class _AdapterSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        r = requests.get(url, params)
-        response = r.json()
+        r = self.http_session.get(url, params=params)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
-        adapters = []
-        for adapter in response["data"]:
-            adapters.append(Adapter.from_dict(adapter))
-        return adapters
+        return entity_list(self, Adapter, response["data"])
+
+    def iter_adapters(self, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True) -> Iterator[Adapter]:
+        """
+        Iterate over the adapters from Casdoor one page at a time, without
+        holding the whole list in memory.
+
+        :param page_size: the number of adapters requested per page
+        :param prefetch: request the next page in the background while the
+            current one is consumed
+        """
+        params = {"owner": self.org_name}
+        return iter_entities(self, "/api/get-adapters", Adapter, params, page_size, prefetch)
 
     def get_adapter(self, adapter_id: str) -> Adapter:
         """
@@ -97,8 +104,8 @@ class _AdapterSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        r = requests.get(url, params)
-        response = r.json()
+        r = self.http_session.get(url, params=params)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
         return Adapter.from_dict(response["data"])
@@ -111,9 +118,9 @@ class _AdapterSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        adapter_info = json.dumps(adapter.to_dict())
-        r = requests.post(url, params=params, data=adapter_info)
-        response = r.json()
+        adapter_info = codec.dumps(adapter.to_dict())
+        r = self.http_session.post(url, params=params, data=adapter_info)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
         return str(response["data"])
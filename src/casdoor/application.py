@@ -12,13 +12,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import json
-from typing import List
+from typing import Iterator, List
 
-import requests
+from . import codec
+from .entity_cache import read_through
 
 # from .organization import Organization, ThemeData
+from .entity_list import entity_list
+from .pagination import DEFAULT_PAGE_SIZE, iter_entities
 from .provider import Provider
+from .schema import schema_of
 
 
 class ProviderItem:
@@ -37,7 +40,7 @@ class ProviderItem:
         return str(self.__dict__)
 
     def to_dict(self) -> dict:
-        return self.__dict__
+        return dict(self.__dict__)
 
 
 class SignupItem:
@@ -52,7 +55,7 @@ class SignupItem:
         return str(self.__dict__)
 
     def to_dict(self) -> dict:
-        return self.__dict__
+        return dict(self.__dict__)
 
 
 class Application:
@@ -114,17 +117,13 @@ class Application:
         if data is None:
             return None
 
-        app = cls()
-        for key, value in data.items():
-            if hasattr(app, key):
-                setattr(app, key, value)
-        return app
+        return schema_of(cls).from_dict(data)
 
     def __str__(self):
         return str(self.__dict__)
 
     def to_dict(self) -> dict:
-        return self.__dict__
+        return dict(self.__dict__)
 
 
 class _ApplicationSDK:
@@ -140,15 +139,24 @@ class _ApplicationSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        r = requests.get(url, params)
-        response = r.json()
+        r = self.http_session.get(url, params=params)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise ValueError(response["msg"])
 
-        res = []
-        for element in response["data"]:
-            res.append(Application.from_dict(element))
-        return res
+        return entity_list(self, Application, response["data"])
+
+    def iter_applications(self, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True) -> Iterator[Application]:
+        """
+        Iterate over the applications from Casdoor one page at a time, without
+        holding the whole list in memory.
+
+        :param page_size: the number of applications requested per page
+        :param prefetch: request the next page in the background while the
+            current one is consumed
+        """
+        params = {"owner": "admin"}
+        return iter_entities(self, "/api/get-applications", Application, params, page_size, prefetch)
 
     def get_application(self, application_id: str) -> Application:
         """
@@ -163,11 +171,15 @@ class _ApplicationSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        r = requests.get(url, params)
-        response = r.json()
-        if response["status"] != "ok":
-            raise ValueError(response["msg"])
-        return Application.from_dict(response["data"])
+
+        def fetch():
+            r = self.http_session.get(url, params=params)
+            response = codec.loads(r.content)
+            if response["status"] != "ok":
+                raise ValueError(response["msg"])
+            return response["data"]
+
+        return Application.from_dict(read_through(self, "application", "id:" + params["id"], fetch))
 
     def modify_application(self, method: str, application: Application) -> str:
         url = self.endpoint + f"/api/{method}"
@@ -178,9 +190,11 @@ class _ApplicationSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        application_info = json.dumps(application.to_dict())
-        r = requests.post(url, params=params, data=application_info)
-        response = r.json()
+        application_info = codec.dumps(application.to_dict())
+        r = self.http_session.post(url, params=params, data=application_info)
+        if getattr(self, "entity_cache", None) is not None:
+            self.entity_cache.invalidate("application", params["id"])
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise ValueError(response["msg"])
         return str(response["data"])
@@ -12,9 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import base64
 import json
-from typing import Dict, List, Optional
+from concurrent.futures import Executor
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Union
 
 import aiohttp
 import jwt
@@ -22,7 +24,18 @@ from cryptography import x509
 from cryptography.hazmat.backends import default_backend
 from yarl import URL
 
+from . import codec, jwt_batch
+from .decision_cache import DecisionCache
+from .enforce_batcher import AsyncEnforceBatcher
+from .entity_cache import EntityCache, aread_through
+from .jwks import JwksKeySet
+from .pagination import DEFAULT_CONCURRENCY, DEFAULT_PAGE_SIZE, afetch_all_pages, aiter_pages, page_of
+from .role import _merge_role_users
+from .role_graph import AsyncRoleGraphRefresher, RoleGraph
+from .token_cache import TokenCache
+from .token_manager import AsyncClientCredentialsTokenManager
 from .user import User
+from .user_index import UserIndex
 
 
 def _build_enforce_params(
@@ -63,16 +76,63 @@ def _build_enforce_params(
 
 
 class AioHttpClient:
-    def __init__(self, base_url):
+    """
+    Thin wrapper around one long-lived aiohttp.ClientSession.
+
+    The session and its TCPConnector are created lazily inside the running
+    event loop and then reused by every request, so concurrent coroutines
+    share the connection pool instead of opening a session per call.
+    """
+
+    def __init__(
+        self,
+        base_url,
+        limit: int = 100,
+        limit_per_host: int = 0,
+        keepalive_timeout: float = 15.0,
+        ttl_dns_cache: Optional[int] = 10,
+    ):
         self.base_url = base_url
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.ttl_dns_cache = ttl_dns_cache
         self.session = None
+        self._loop = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        # No await happens between the check and the assignment, so concurrent
+        # tasks on the same loop can never create two sessions.
+        loop = asyncio.get_running_loop()
+        if self.session is None or self.session.closed or self._loop is not loop:
+            stale = None
+            if self.session is not None and not self.session.closed:
+                if self._loop is not None and not self._loop.is_closed() and self._loop.is_running():
+                    raise RuntimeError(
+                        "AioHttpClient is in use by another running event loop, use one client per event loop"
+                    )
+                stale = self.session
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.ttl_dns_cache,
+            )
+            # Calls authenticate with the client credentials, keep them stateless.
+            self.session = aiohttp.ClientSession(connector=connector, cookie_jar=aiohttp.DummyCookieJar())
+            self._loop = loop
+            if stale is not None:
+                # The session of a finished loop (e.g. an earlier asyncio.run) can't
+                # be reused, close it so its connector doesn't leak.
+                await stale.close()
+        return self.session
 
     async def fetch(self, path, method="GET", **kwargs):
         url = self.base_url + path
-        async with self.session.request(method, url, **kwargs) as response:
-            if response.status != 200 and "application/json" not in response.headers["Content-Type"]:
-                raise ValueError(f"Casdoor response error:{response.text}")
-            return await response.json()
+        async with (await self._get_session()).request(method, url, **kwargs) as response:
+            if response.status != 200 and "application/json" not in response.headers.get("Content-Type", ""):
+                raise ValueError(f"Casdoor response error:{await response.text()}")
+            return codec.loads(await response.read())
 
     async def get(self, path, **kwargs):
         return await self.fetch(path, method="GET", **kwargs)
@@ -80,16 +140,18 @@ class AioHttpClient:
     async def post(self, path, **kwargs):
         return await self.fetch(path, method="POST", **kwargs)
 
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+        self.session = None
+        self._loop = None
+
     async def __aenter__(self):
-        self.session = await aiohttp.ClientSession().__aenter__()
+        await self._get_session()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        try:
-            if exc_type:
-                raise exc_val
-        finally:
-            await self.session.__aexit__(exc_type, exc_val, exc_tb)
+        await self.close()
 
 
 class AsyncCasdoorSDK:
@@ -102,6 +164,20 @@ class AsyncCasdoorSDK:
         org_name: str,
         application_name: str,
         front_endpoint: str = None,
+        connection_limit: int = 100,
+        connection_limit_per_host: int = 0,
+        keepalive_timeout: float = 15.0,
+        dns_cache_ttl: Optional[int] = 10,
+        token_cache: Optional[TokenCache] = None,
+        key_set: Optional[JwksKeySet] = None,
+        verification_executor: Optional[Executor] = None,
+        verification_concurrency: int = 64,
+        decision_cache: Optional[DecisionCache] = None,
+        enforce_batch_window: Optional[float] = None,
+        enforce_max_batch_size: int = 100,
+        role_graph_ttl: Optional[float] = None,
+        entity_cache: Optional[EntityCache] = None,
+        user_index: Optional[UserIndex] = None,
     ):
         self.endpoint = endpoint
         if front_endpoint:
@@ -111,12 +187,47 @@ class AsyncCasdoorSDK:
         self.client_id = client_id
         self.client_secret = client_secret
         self.certificate = certificate
+        self.token_cache = token_cache
+        self.key_set = key_set
+        self.decision_cache = decision_cache
+        self.entity_cache = entity_cache
+        self.user_index = user_index
+        self.verification_executor = verification_executor
+        self.verification_concurrency = verification_concurrency
+        self._verification_semaphore = None
+        self._verification_loop = None
         self.org_name = org_name
         self.application_name = application_name
         self.grant_type = "authorization_code"
 
         self.algorithms = ["RS256"]
-        self._session = AioHttpClient(base_url=self.endpoint)
+        self.token_manager = AsyncClientCredentialsTokenManager(self)
+        self.enforce_batcher = None
+        if enforce_batch_window is not None:
+            self.enforce_batcher = AsyncEnforceBatcher(self, enforce_batch_window, enforce_max_batch_size)
+        self.role_graph = None
+        if role_graph_ttl is not None:
+            self.role_graph = AsyncRoleGraphRefresher(self, role_graph_ttl)
+        self._session = AioHttpClient(
+            base_url=self.endpoint,
+            limit=connection_limit,
+            limit_per_host=connection_limit_per_host,
+            keepalive_timeout=keepalive_timeout,
+            ttl_dns_cache=dns_cache_ttl,
+        )
+
+    async def __aenter__(self):
+        await self._session.__aenter__()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
+        """
+        Close the shared HTTP session and release its pooled connections.
+        """
+        await self._session.close()
 
     @property
     def headers(self) -> Dict:
@@ -127,12 +238,47 @@ class AsyncCasdoorSDK:
             "Authorization": f"Basic {basic_auth}",
         }
 
+    @property
+    def certificate(self) -> str:
+        return self._certificate
+
+    @certificate.setter
+    def certificate(self, certificate: str):
+        self._certificate = certificate
+        self._public_key = None
+        # claims verified against the previous key must not be served anymore
+        if getattr(self, "token_cache", None) is not None:
+            self.token_cache.clear()
+
     @property
     def certification(self) -> bytes:
         if not isinstance(self.certificate, str):
             raise TypeError("certificate field must be str type")
         return self.certificate.encode("utf-8")
 
+    @property
+    def public_key(self):
+        """
+        The public key of the certificate, loaded on first use and kept
+        until the certificate is reassigned.
+        """
+        if self._public_key is None:
+            certificate = x509.load_pem_x509_certificate(self.certification, default_backend())
+            self._public_key = certificate.public_key()
+        return self._public_key
+
+    def _get_signing_key(self, token: str):
+        """
+        Pick the key to verify token with: the key_set entry matching the kid
+        in the token header when a key set is configured, the certificate's
+        public key otherwise.
+        """
+        if self.key_set is not None:
+            kid = jwt.get_unverified_header(token).get("kid")
+            if kid is not None:
+                return self.key_set.get_signing_key(kid)
+        return self.public_key
+
     async def get_auth_link(
         self,
         redirect_uri: str,
@@ -247,8 +393,7 @@ class AsyncCasdoorSDK:
         :return: Response from Casdoor
         """
         path = "/api/login/oauth/access_token"
-        async with self._session as session:
-            return await session.post(path, data=payload)
+        return await self._session.post(path, data=payload)
 
     async def refresh_token_request(self, refresh_token: str, scope: str = "") -> Dict:
         """
@@ -266,8 +411,7 @@ class AsyncCasdoorSDK:
             "scope": scope,
             "refresh_token": refresh_token,
         }
-        async with self._session as session:
-            return await session.post(path, data=params)
+        return await self._session.post(path, data=params)
 
     async def refresh_oauth_token(self, refresh_token: str, scope: str = "") -> str:
         """
@@ -285,19 +429,85 @@ class AsyncCasdoorSDK:
         Converts the returned access_token to real data using
         jwt (JSON Web Token) algorithms.
 
+        Verified claims are served from token_cache when one is configured and
+        no extra decode options are given.
+
         :param token: access_token
         :return: the data in dict format
         """
-        certificate = x509.load_pem_x509_certificate(self.certification, default_backend())
+        use_cache = self.token_cache is not None and not kwargs
+        if use_cache:
+            cached_json = self.token_cache.get(token)
+            if cached_json is not None:
+                return cached_json
+
+        return_json = self._decode_jwt_token(token, **kwargs)
+        if use_cache:
+            self.token_cache.set(token, return_json)
+        return return_json
 
-        return_json = jwt.decode(
+    def _decode_jwt_token(self, token: str, **kwargs) -> Dict:
+        """
+        Verify token and return its claims, bypassing token_cache.
+        """
+        return jwt.decode(
             token,
-            certificate.public_key(),
+            self._get_signing_key(token),
             algorithms=self.algorithms,
             audience=self.client_id,
             **kwargs,
         )
-        return return_json
+
+    def parse_jwt_tokens(
+        self, tokens: List[str], executor: Optional[Executor] = None, **kwargs
+    ) -> List[Union[Dict, Exception]]:
+        """
+        Verify a batch of access_tokens. Identical tokens are verified only
+        once and the cached public key is reused for all of them.
+
+        :param tokens: the access_tokens to verify
+        :param executor: an optional thread or process pool to fan the
+                         verifications out to, they run in the calling
+                         thread otherwise
+        :return: for each token, in input order, its data in dict format or
+                 the exception raised while verifying it
+        """
+        return jwt_batch.parse_jwt_tokens(self, tokens, executor, **kwargs)
+
+    def _get_verification_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._verification_semaphore is None or self._verification_loop is not loop:
+            self._verification_semaphore = asyncio.Semaphore(self.verification_concurrency)
+            self._verification_loop = loop
+        return self._verification_semaphore
+
+    async def aparse_jwt_token(self, token: str, **kwargs) -> Dict:
+        """
+        Converts the returned access_token to real data like parse_jwt_token,
+        but runs the RSA verification on verification_executor (the loop's
+        default executor if None) so other coroutines keep running. At most
+        verification_concurrency verifications are in flight at once, and
+        the key and token_cache are shared with parse_jwt_token.
+
+        :param token: access_token
+        :return: the data in dict format
+        """
+        return await jwt_batch.aparse_jwt_token(self, token, **kwargs)
+
+    async def aparse_jwt_tokens(
+        self, tokens: List[str], executor: Optional[Executor] = None, **kwargs
+    ) -> List[Union[Dict, Exception]]:
+        """
+        Verify a batch of access_tokens on an executor, so the event loop is
+        never blocked by the RSA work. Identical tokens are verified only once.
+
+        :param tokens: the access_tokens to verify
+        :param executor: a thread or process pool, verification_executor
+                         if None
+        :return: for each token, in input order, its data in dict format or
+                 the exception raised while verifying it
+        """
+        return await jwt_batch.aparse_jwt_tokens(self, tokens, executor, **kwargs)
 
     async def enforce(
         self,
@@ -319,17 +529,35 @@ class AsyncCasdoorSDK:
         :param casbin_request: a list containing the request data (i.e. sub, obj, act)
         :return: a boolean value indicating whether the request is allowed
         """
-        url = "/api/enforce"
         params = _build_enforce_params(permission_id, model_id, resource_id, enforce_id, owner)
-
-        async with self._session as session:
-            response = await session.post(
-                url,
-                params=params,
-                data=json.dumps(casbin_request),
-                auth=aiohttp.BasicAuth(self.client_id, self.client_secret),
-                headers={"Content-Type": "application/json"},
+        if self.decision_cache is not None:
+            # a write clearing the cache while this check is in flight bumps the generation
+            generation = self.decision_cache.generation
+            cached = self.decision_cache.get(params, casbin_request)
+            if cached is not None:
+                return cached
+
+        # batch-enforce has no resourceId selector, those checks are sent alone
+        if self.enforce_batcher is not None and not resource_id:
+            has_permission = await self.enforce_batcher.enforce(
+                permission_id, model_id, enforce_id, owner, casbin_request
             )
+        else:
+            has_permission = await self._send_enforce(params, casbin_request)
+
+        if self.decision_cache is not None:
+            self.decision_cache.set(params, casbin_request, has_permission, generation)
+        return has_permission
+
+    async def _send_enforce(self, params: Dict[str, str], casbin_request: Optional[List[str]]) -> bool:
+        url = "/api/enforce"
+        response = await self._session.post(
+            url,
+            params=params,
+            data=codec.dumps(casbin_request),
+            auth=aiohttp.BasicAuth(self.client_id, self.client_secret),
+            headers={"Content-Type": "application/json"},
+        )
 
         if isinstance(response, dict):
             data = response.get("data")
@@ -367,14 +595,13 @@ class AsyncCasdoorSDK:
         url = "/api/batch-enforce"
         params = _build_enforce_params(permission_id, model_id, "", enforce_id, owner)
 
-        async with self._session as session:
-            response = await session.post(
-                url,
-                params=params,
-                data=json.dumps(casbin_request),
-                auth=aiohttp.BasicAuth(self.client_id, self.client_secret),
-                headers={"Content-Type": "application/json"},
-            )
+        response = await self._session.post(
+            url,
+            params=params,
+            data=codec.dumps(casbin_request),
+            auth=aiohttp.BasicAuth(self.client_id, self.client_secret),
+            headers={"Content-Type": "application/json"},
+        )
 
         data = response.get("data")
         if data is None:
@@ -407,9 +634,142 @@ class AsyncCasdoorSDK:
         """
         path = "/api/get-users"
         params = {"owner": self.org_name}
-        async with self._session as session:
-            users = await session.get(path, headers=self.headers, params=params)
-            return users["data"]
+        users = await self._session.get(path, headers=self.headers, params=params)
+        return users["data"]
+
+    def _page_fetcher(self, path: str, params: Dict[str, str], page_size: int):
+        async def fetch_page(p: int):
+            query = dict(params, p=str(p), pageSize=str(page_size))
+            return page_of(await self._session.get(path, headers=self.headers, params=query))
+
+        return fetch_page
+
+    async def _get_all(self, path: str, page_size: int, concurrency: int) -> List[Dict]:
+        fetch_page = self._page_fetcher(path, {"owner": self.org_name}, page_size)
+        return await afetch_all_pages(fetch_page, page_size, concurrency)
+
+    async def _aiter(self, path: str, params: Dict[str, str], page_size: int, prefetch: bool) -> AsyncIterator[Dict]:
+        pages = aiter_pages(self._page_fetcher(path, params, page_size), page_size, prefetch)
+        try:
+            async for items in pages:
+                for item in items:
+                    yield item
+        finally:
+            await pages.aclose()
+
+    def aiter_users(self, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True) -> AsyncIterator[Dict]:
+        """
+        Iterate over the users from Casdoor one page at a time:
+
+            async for user in sdk.aiter_users(page_size=500):
+                ...
+
+        Users are yielded as each page arrives. With prefetch, the next page
+        is requested while the current one is consumed, never more than one
+        page ahead. Breaking out and calling aclose() on the iterator cancels
+        the pending request and stops further ones.
+
+        :param page_size: the number of users requested per page
+        :return: an async iterator of dicts containing user info
+        """
+        return self._aiter("/api/get-users", {"owner": self.org_name}, page_size, prefetch)
+
+    def aiter_roles(self, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True) -> AsyncIterator[Dict]:
+        """
+        Iterate over the roles from Casdoor one page at a time, see aiter_users.
+
+        :return: an async iterator of role dicts
+        """
+        return self._aiter("/api/get-roles", {"owner": self.org_name}, page_size, prefetch)
+
+    def aiter_permissions(self, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True) -> AsyncIterator[Dict]:
+        """
+        Iterate over the permissions from Casdoor one page at a time, see
+        aiter_users.
+
+        :return: an async iterator of permission dicts
+        """
+        return self._aiter("/api/get-permissions", {"owner": self.org_name}, page_size, prefetch)
+
+    def aiter_tokens(self, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True) -> AsyncIterator[Dict]:
+        """
+        Iterate over the tokens from Casdoor one page at a time, see aiter_users.
+
+        :return: an async iterator of token dicts
+        """
+        return self._aiter("/api/get-tokens", {"owner": self.org_name}, page_size, prefetch)
+
+    def aiter_sessions(self, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True) -> AsyncIterator[Dict]:
+        """
+        Iterate over the sessions from Casdoor one page at a time, see
+        aiter_users.
+
+        :return: an async iterator of session dicts
+        """
+        return self._aiter("/api/get-sessions", {"owner": self.org_name}, page_size, prefetch)
+
+    def aiter_resources(
+        self,
+        owner,
+        user,
+        field,
+        value,
+        sort_field,
+        sort_order,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> AsyncIterator[Dict]:
+        """
+        Iterate over the resources from Casdoor one page at a time, with the
+        filters of CasdoorSDK.get_resources, see aiter_users.
+
+        :return: an async iterator of resource dicts
+        """
+        params = {
+            "owner": owner,
+            "user": user,
+            "field": field,
+            "value": value,
+            "sortField": sort_field,
+            "sortOrder": sort_order,
+        }
+        return self._aiter("/api/get-resources", params, page_size, prefetch)
+
+    async def get_all_users(
+        self, page_size: int = DEFAULT_PAGE_SIZE, concurrency: int = DEFAULT_CONCURRENCY
+    ) -> List[Dict]:
+        """
+        Get all the users from Casdoor with parallel page requests, for large
+        exports. Page 1 gives the total count, then the other pages are
+        requested by concurrent tasks and put back in order.
+
+        :param page_size: the number of users requested per page
+        :param concurrency: the maximum number of pages requested at once
+        :return: a list of dicts containing user info
+        """
+        return await self._get_all("/api/get-users", page_size, concurrency)
+
+    async def get_all_tokens(
+        self, page_size: int = DEFAULT_PAGE_SIZE, concurrency: int = DEFAULT_CONCURRENCY
+    ) -> List[Dict]:
+        """
+        Get all the tokens from Casdoor with parallel page requests, see
+        get_all_users.
+
+        :return: a list of dicts containing token info
+        """
+        return await self._get_all("/api/get-tokens", page_size, concurrency)
+
+    async def get_all_payments(
+        self, page_size: int = DEFAULT_PAGE_SIZE, concurrency: int = DEFAULT_CONCURRENCY
+    ) -> List[Dict]:
+        """
+        Get all the payments from Casdoor with parallel page requests, see
+        get_all_users.
+
+        :return: a list of dicts containing payment info
+        """
+        return await self._get_all("/api/get-payments", page_size, concurrency)
 
     async def get_user(self, user_id: str) -> Dict:
         """
@@ -420,10 +780,20 @@ class AsyncCasdoorSDK:
         """
         path = "/api/get-user"
         params = {"id": f"{self.org_name}/{user_id}"}
-        async with self._session as session:
-            user = await session.get(path, headers=self.headers, params=params)
+
+        async def fetch():
+            user = await self._session.get(path, headers=self.headers, params=params)
             return user["data"]
 
+        if self.user_index is not None:
+            data = self.user_index.get("id", params["id"])
+            if data is not None:
+                return data
+        data = await aread_through(self, "user", "id:" + params["id"], fetch)
+        if self.user_index is not None and data is not None:
+            self.user_index.put(data)
+        return data
+
     async def get_user_count(self, is_online: bool = None) -> int:
         """
         Get the count of filtered users for an organization
@@ -441,14 +811,18 @@ class AsyncCasdoorSDK:
         else:
             params["isOnline"] = "1" if is_online else "0"
 
-        async with self._session as session:
-            count = await session.get(path, headers=self.headers, params=params)
-            return count["data"]
+        count = await self._session.get(path, headers=self.headers, params=params)
+        return count["data"]
 
     async def modify_user(self, method: str, user: User, params=None) -> Dict:
         path = f"/api/{method}"
-        async with self._session as session:
-            return await session.post(path, params=params, headers=self.headers, json=user.to_dict())
+        response = await self._session.post(path, params=params, headers=self.headers, data=codec.dumps(user.to_dict()))
+        user_id = (params or {}).get("id", f"{user.owner}/{user.name}")
+        if self.entity_cache is not None:
+            self.entity_cache.invalidate("user", user_id)
+        if self.user_index is not None:
+            self.user_index.remove(user_id)
+        return response
 
     async def add_user(self, user: User) -> Dict:
         response = await self.modify_user("add-user", user)
@@ -471,11 +845,19 @@ class AsyncCasdoorSDK:
         """
         path = "/api/get-roles"
         params = {"owner": self.org_name}
-        async with self._session as session:
-            response = await session.get(path, headers=self.headers, params=params)
-            if response.get("status") != "ok":
-                raise Exception(response.get("msg", "Failed to get roles"))
-            return response.get("data", [])
+        response = await self._session.get(path, headers=self.headers, params=params)
+        if response.get("status") != "ok":
+            raise Exception(response.get("msg", "Failed to get roles"))
+        return response.get("data", [])
+
+    async def _fetch_role(self, role_name: str) -> Optional[Dict]:
+        # bypasses the entity cache, for the read-modify-write paths below
+        path = "/api/get-role"
+        params = {"id": f"{self.org_name}/{role_name}"}
+        response = await self._session.get(path, headers=self.headers, params=params)
+        if response.get("status") != "ok":
+            raise Exception(response.get("msg", f"Role {role_name} not found"))
+        return response.get("data")
 
     async def get_role(self, role_name: str) -> Dict:
         """
@@ -484,13 +866,7 @@ class AsyncCasdoorSDK:
         :param role_name: the name of the role
         :return: role dict
         """
-        path = "/api/get-role"
-        params = {"id": f"{self.org_name}/{role_name}"}
-        async with self._session as session:
-            response = await session.get(path, headers=self.headers, params=params)
-            if response.get("status") != "ok":
-                raise Exception(response.get("msg", f"Role {role_name} not found"))
-            return response.get("data")
+        return await aread_through(self, "role", f"id:{self.org_name}/{role_name}", lambda: self._fetch_role(role_name))
 
     async def update_role(self, role: Dict) -> Dict:
         """
@@ -501,11 +877,16 @@ class AsyncCasdoorSDK:
         """
         path = "/api/update-role"
         params = {"id": f"{role['owner']}/{role['name']}"}
-        async with self._session as session:
-            response = await session.post(path, params=params, headers=self.headers, json=role)
-            if response.get("status") != "ok":
-                raise Exception(response.get("msg", "Failed to update role"))
-            return response
+        response = await self._session.post(path, params=params, headers=self.headers, data=codec.dumps(role))
+        if self.entity_cache is not None:
+            self.entity_cache.invalidate("role", params["id"])
+        if self.role_graph is not None:
+            self.role_graph.invalidate()
+        if self.decision_cache is not None:
+            self.decision_cache.clear()
+        if response.get("status") != "ok":
+            raise Exception(response.get("msg", "Failed to update role"))
+        return response
 
     async def assign_role_to_user(self, username: str, role_name: str) -> Dict:
         """
@@ -517,7 +898,7 @@ class AsyncCasdoorSDK:
         """
         user_id = f"{self.org_name}/{username}"
 
-        role = await self.get_role(role_name)
+        role = await self._fetch_role(role_name)
         if not role:
             raise Exception(f"Role {role_name} not found")
 
@@ -540,7 +921,7 @@ class AsyncCasdoorSDK:
         """
         user_id = f"{self.org_name}/{username}"
 
-        role = await self.get_role(role_name)
+        role = await self._fetch_role(role_name)
         if not role:
             raise Exception(f"Role {role_name} not found")
 
@@ -550,19 +931,64 @@ class AsyncCasdoorSDK:
 
         return {"status": "ok", "msg": "User does not have this role"}
 
-    async def get_user_roles(self, username: str) -> List[Dict]:
+    async def _change_role_users(self, role_name: str, add: List[str], remove: List[str], max_attempts: int) -> Dict:
+        response = {"status": "ok", "msg": "Role users already up to date"}
+        for attempt in range(max_attempts + 1):
+            role = await self._fetch_role(role_name)
+            if not role:
+                raise Exception(f"Role {role_name} not found")
+            users = _merge_role_users(role.get("users"), add, remove)
+            if users is None:
+                return response
+            if attempt == max_attempts:
+                break
+            role["users"] = users
+            response = await self.update_role(role)
+        raise Exception(f"Role {role_name} was modified concurrently, its users are not up to date")
+
+    async def assign_users_to_role(self, role_name: str, usernames: Iterable[str], max_attempts: int = 3) -> Dict:
+        """
+        Add users to a role with one read and one write, then read the role
+        back and apply the change again if a concurrent update overwrote it.
+
+        :param role_name: the name of the role
+        :param usernames: the usernames to add
+        :param max_attempts: how many times to write the role before giving up
+        :return: response dict with status
+        """
+        user_ids = list(dict.fromkeys(f"{self.org_name}/{username}" for username in usernames))
+        return await self._change_role_users(role_name, user_ids, [], max_attempts)
+
+    async def remove_users_from_role(self, role_name: str, usernames: Iterable[str], max_attempts: int = 3) -> Dict:
+        """
+        Remove users from a role, verified like assign_users_to_role.
+
+        :param role_name: the name of the role
+        :param usernames: the usernames to remove
+        :param max_attempts: how many times to write the role before giving up
+        :return: response dict with status
+        """
+        user_ids = [f"{self.org_name}/{username}" for username in usernames]
+        return await self._change_role_users(role_name, [], user_ids, max_attempts)
+
+    async def get_role_graph(self) -> RoleGraph:
+        """
+        Get a snapshot of the organization's roles with role inheritance
+        resolved, from self.role_graph when role_graph_ttl is set.
+
+        :return: a RoleGraph of role dicts
+        """
+        if self.role_graph is not None:
+            return await self.role_graph.get()
+        return RoleGraph(await self.get_roles())
+
+    async def get_user_roles(self, username: str, inherited: bool = False) -> List[Dict]:
         """
         Get all roles assigned to a user.
 
         :param username: the username to get roles for
+        :param inherited: whether to include the roles granted through sub-roles
         :return: list of role dicts assigned to the user
         """
-        user_id = f"{self.org_name}/{username}"
-        all_roles = await self.get_roles()
-
-        user_roles = []
-        for role in all_roles:
-            if role.get("users") and user_id in role["users"]:
-                user_roles.append(role)
-
-        return user_roles
+        graph = await self.get_role_graph()
+        return graph.get_user_roles(f"{self.org_name}/{username}", inherited)
@@ -12,10 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import json
-from typing import List
+from typing import Iterator, List
 
-import requests
+from . import codec
+from .entity_list import entity_list
+from .pagination import DEFAULT_PAGE_SIZE, iter_entities
+from .schema import schema_of
 
 
 class Cert:
@@ -53,17 +55,13 @@ class Cert:
         if data is None:
             return None
 
-        cert = cls()
-        for key, value in data.items():
-            if hasattr(cert, key):
-                setattr(cert, key, value)
-        return cert
+        return schema_of(cls).from_dict(data)
 
     def __str__(self):
         return str(self.__dict__)
 
     def to_dict(self) -> dict:
-        return self.__dict__
+        return dict(self.__dict__)
 
 
 class _CertSDK:
@@ -79,15 +77,24 @@ class _CertSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        r = requests.get(url, params)
-        response = r.json()
+        r = self.http_session.get(url, params=params)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise ValueError(response["msg"])
 
-        res = []
-        for element in response["data"]:
-            res.append(Cert.from_dict(element))
-        return res
+        return entity_list(self, Cert, response["data"])
+
+    def iter_certs(self, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True) -> Iterator[Cert]:
+        """
+        Iterate over the certs from Casdoor one page at a time, without
+        holding the whole list in memory.
+
+        :param page_size: the number of certs requested per page
+        :param prefetch: request the next page in the background while the
+            current one is consumed
+        """
+        params = {"owner": self.org_name}
+        return iter_entities(self, "/api/get-certs", Cert, params, page_size, prefetch)
 
     def get_cert(self, cert_id: str) -> Cert:
         """
@@ -102,8 +109,8 @@ class _CertSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        r = requests.get(url, params)
-        response = r.json()
+        r = self.http_session.get(url, params=params)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise ValueError(response["msg"])
 
@@ -117,9 +124,9 @@ class _CertSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        cert_info = json.dumps(cert.to_dict())
-        r = requests.post(url, params=params, data=cert_info)
-        response = r.json()
+        cert_info = codec.dumps(cert.to_dict())
+        r = self.http_session.post(url, params=params, data=cert_info)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise ValueError(response["msg"])
         return str(response["data"])
@@ -0,0 +1,98 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+The JSON codec of request bodies and responses.
+
+orjson is used when installed, then ujson, then the standard library.
+dumps returns bytes and loads accepts bytes, so bodies go to and come from
+the HTTP clients without a round trip through str. Call use() to pick a
+library explicitly.
+"""
+
+import json
+from typing import Any, Callable, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover - depends on the environment
+    ujson = None
+
+name = ""
+_dumps = _loads = None
+
+
+def _json_dumps(obj: Any, default: Optional[Callable] = None) -> bytes:
+    return json.dumps(obj, default=default).encode("utf-8")
+
+
+def _json_loads(data: Union[bytes, str]) -> Any:
+    return json.loads(data)
+
+
+def _orjson_dumps(obj: Any, default: Optional[Callable] = None) -> bytes:
+    return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _ujson_dumps(obj: Any, default: Optional[Callable] = None) -> bytes:
+    # ujson escapes / by default, json and orjson don't
+    return ujson.dumps(obj, default=default, escape_forward_slashes=False, ensure_ascii=False).encode("utf-8")
+
+
+_CODECS = {
+    "json": (_json_dumps, _json_loads),
+    "orjson": (_orjson_dumps, orjson.loads if orjson else None),
+    "ujson": (_ujson_dumps, ujson.loads if ujson else None),
+}
+
+
+def use(library: str):
+    """
+    Switch the codec of the SDK.
+
+    :param library: "orjson", "ujson" or "json"
+    :raises ValueError: if the library is unknown or not installed
+    """
+    global name, _dumps, _loads
+    codec = _CODECS.get(library)
+    if codec is None or codec[1] is None:
+        raise ValueError(f"JSON library {library!r} is not available")
+    name = library
+    _dumps, _loads = codec
+
+
+def dumps(obj: Any, default: Optional[Callable] = None) -> bytes:
+    """
+    Encode obj as UTF-8 JSON.
+
+    :param default: called for objects the library can't encode
+    """
+    return _dumps(obj, default)
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Decode a JSON document.
+
+    :raises ValueError: if data isn't valid JSON
+    """
+    return _loads(data)
+
+
+use("orjson" if orjson else "ujson" if ujson else "json")
@@ -0,0 +1,161 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+
+class DecisionCache:
+    """
+    Bounded LRU cache of enforce() decisions.
+
+    Decisions are keyed by the enforce selector (the single parameter built
+    by _build_enforce_params, e.g. permissionId=org/perm) plus the casbin
+    request. Allowed and denied decisions can live for different times, and
+    entries can be invalidated per selector. Every invalidation bumps
+    generation, so a decision requested before it can't be stored after it.
+    The cache is safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10000,
+        ttl: float = 60.0,
+        allow_ttl: Optional[float] = None,
+        deny_ttl: Optional[float] = None,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        """
+        :param max_size: the maximum number of decisions to keep
+        :param ttl: how long, in seconds, a decision is cached
+        :param allow_ttl: overrides ttl for allowed decisions
+        :param deny_ttl: overrides ttl for denied decisions
+        :param timer: the monotonic clock used for expiry
+        """
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self.max_size = max_size
+        self.allow_ttl = ttl if allow_ttl is None else allow_ttl
+        self.deny_ttl = ttl if deny_ttl is None else deny_ttl
+        self.timer = timer
+        self.hits = 0
+        self.misses = 0
+        self.generation = 0
+        self._entries = OrderedDict()
+        self._by_selector: Dict[tuple, set] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(params: Dict[str, str], casbin_request: Optional[List[str]]) -> Optional[tuple]:
+        (selector,) = params.items()
+        try:
+            key = (selector, tuple(casbin_request or ()))
+            hash(key)
+        except TypeError:
+            # requests carrying unhashable values (e.g. ABAC objects) are not cached
+            return None
+        return key
+
+    def _remove(self, key: tuple):
+        del self._entries[key]
+        keys = self._by_selector.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_selector[key[0]]
+
+    def get(self, params: Dict[str, str], casbin_request: Optional[List[str]]) -> Optional[bool]:
+        """
+        Return the cached decision, or None if there is no fresh one.
+
+        :param params: the enforce selector built by _build_enforce_params
+        :param casbin_request: the request data (i.e. sub, obj, act)
+        """
+        key = self._key(params, casbin_request)
+        if key is None:
+            return None
+        now = self.timer()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or now >= entry[0]:
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(
+        self,
+        params: Dict[str, str],
+        casbin_request: Optional[List[str]],
+        allowed: bool,
+        generation: Optional[int] = None,
+    ):
+        """
+        Cache a decision.
+
+        :param generation: the generation read before the decision was
+                           requested, the decision is dropped if the cache
+                           was invalidated since
+        """
+        key = self._key(params, casbin_request)
+        ttl = self.allow_ttl if allowed else self.deny_ttl
+        if key is None or ttl <= 0:
+            return
+        expires_at = self.timer() + ttl
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[key] = (expires_at, allowed)
+            self._entries.move_to_end(key)
+            self._by_selector.setdefault(key[0], set()).add(key)
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_selector(self, name: str, value: str):
+        """
+        Drop the decisions cached for one selector.
+
+        :param name: the enforce parameter name, i.e. permissionId, modelId,
+                     resourceId, enforcerId or owner
+        :param value: its value
+        """
+        with self._lock:
+            self.generation += 1
+            for key in list(self._by_selector.get((name, value), ())):
+                self._remove(key)
+
+    def invalidate_permission(self, permission_id: str):
+        self.invalidate_selector("permissionId", permission_id)
+
+    def invalidate_model(self, model_id: str):
+        self.invalidate_selector("modelId", model_id)
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._by_selector.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
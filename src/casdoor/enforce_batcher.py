@@ -0,0 +1,233 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional
+
+
+class _BatchMetrics:
+    """
+    Batch-size and queueing-delay metrics shared by the threaded and asyncio
+    batchers.
+    """
+
+    def __init__(self):
+        self.batch_count = 0
+        self.request_count = 0
+        self.max_batch_size = 0
+        self.total_queue_delay = 0.0
+        self.max_queue_delay = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, enqueued_at: List[float]):
+        now = time.perf_counter()
+        with self._lock:
+            self.batch_count += 1
+            self.request_count += len(enqueued_at)
+            self.max_batch_size = max(self.max_batch_size, len(enqueued_at))
+            for started in enqueued_at:
+                self.total_queue_delay += now - started
+                self.max_queue_delay = max(self.max_queue_delay, now - started)
+
+    def metrics(self) -> Dict:
+        with self._lock:
+            return {
+                "batch_count": self.batch_count,
+                "request_count": self.request_count,
+                "average_batch_size": self.request_count / self.batch_count if self.batch_count else None,
+                "max_batch_size": self.max_batch_size,
+                "average_queue_delay": self.total_queue_delay / self.request_count if self.request_count else None,
+                "max_queue_delay": self.max_queue_delay,
+            }
+
+
+def _check_results(results: List[bool], expected: int) -> List[bool]:
+    if len(results) != expected:
+        raise ValueError(f"Casdoor returned {len(results)} results for a batch of {expected} requests")
+    return results
+
+
+class _Batch:
+    def __init__(self):
+        self.requests = []
+        self.futures = []
+        self.enqueued_at = []
+        self.full = False
+        self.timer = None
+
+
+class EnforceBatcher:
+    """
+    Collects enforce calls made concurrently from several threads with the
+    same selector and sends them as one batch_enforce request.
+
+    The first caller of a batch waits up to window seconds for others to join
+    it, or until max_batch_size requests are queued, then sends the batch and
+    hands each waiting caller its own decision.
+    """
+
+    def __init__(self, sdk, window: float = 0.002, max_batch_size: int = 100):
+        """
+        :param sdk: the CasdoorSDK used to send the batches
+        :param window: how long, in seconds, a batch stays open
+        :param max_batch_size: the number of requests that closes a batch early
+        """
+        if max_batch_size <= 0:
+            raise ValueError("max_batch_size must be positive")
+        self.sdk = sdk
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._metrics = _BatchMetrics()
+        self._pending: Dict[tuple, _Batch] = {}
+        self._cond = threading.Condition()
+
+    def enforce(
+        self,
+        permission_id: str,
+        model_id: str,
+        enforce_id: str,
+        owner: str,
+        casbin_request: Optional[List[str]] = None,
+    ) -> bool:
+        """
+        Queue one request and wait for its decision. Takes the same
+        parameters as CasdoorSDK.batch_enforce, for a single request.
+
+        :return: a boolean value indicating whether the request is allowed
+        """
+        key = (permission_id, model_id, enforce_id, owner)
+        future = Future()
+        with self._cond:
+            batch = self._pending.get(key)
+            leader = batch is None
+            if leader:
+                batch = self._pending[key] = _Batch()
+            batch.requests.append(casbin_request)
+            batch.futures.append(future)
+            batch.enqueued_at.append(time.perf_counter())
+            if len(batch.requests) >= self.max_batch_size:
+                del self._pending[key]
+                batch.full = True
+                self._cond.notify_all()
+
+        if leader:
+            try:
+                with self._cond:
+                    deadline = time.monotonic() + self.window
+                    remaining = self.window
+                    while not batch.full and remaining > 0:
+                        self._cond.wait(remaining)
+                        remaining = deadline - time.monotonic()
+                    if self._pending.get(key) is batch:
+                        del self._pending[key]
+                self._dispatch(key, batch)
+            except BaseException as e:
+                # the leader left abnormally (e.g. KeyboardInterrupt), close the batch
+                # and fail its callers rather than leave them waiting forever
+                with self._cond:
+                    if self._pending.get(key) is batch:
+                        del self._pending[key]
+                for waiting in batch.futures:
+                    if not waiting.done():
+                        waiting.set_exception(e)
+                raise
+        return future.result()
+
+    def _dispatch(self, key: tuple, batch: _Batch):
+        self._metrics.record(batch.enqueued_at)
+        try:
+            results = _check_results(self.sdk.batch_enforce(*key, batch.requests), len(batch.requests))
+        except Exception as e:
+            for future in batch.futures:
+                future.set_exception(e)
+            return
+        for i, future in enumerate(batch.futures):
+            future.set_result(results[i])
+
+    def metrics(self) -> Dict:
+        """
+        :return: batch_count, request_count, average_batch_size,
+                 max_batch_size, average_queue_delay and max_queue_delay
+                 (in seconds)
+        """
+        return self._metrics.metrics()
+
+
+class AsyncEnforceBatcher:
+    """
+    Asyncio counterpart of EnforceBatcher for AsyncCasdoorSDK: enforce calls
+    awaited concurrently with the same selector within window seconds are
+    sent as one batch_enforce request.
+    """
+
+    def __init__(self, sdk, window: float = 0.002, max_batch_size: int = 100):
+        if max_batch_size <= 0:
+            raise ValueError("max_batch_size must be positive")
+        self.sdk = sdk
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._metrics = _BatchMetrics()
+        self._pending: Dict[tuple, _Batch] = {}
+        self._dispatching = set()
+
+    async def enforce(
+        self,
+        permission_id: str,
+        model_id: str,
+        enforce_id: str,
+        owner: str,
+        casbin_request: Optional[List[str]] = None,
+    ) -> bool:
+        key = (permission_id, model_id, enforce_id, owner)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = self._pending[key] = _Batch()
+            batch.timer = loop.call_later(self.window, self._flush, key, batch)
+        batch.requests.append(casbin_request)
+        batch.futures.append(future)
+        batch.enqueued_at.append(time.perf_counter())
+        if len(batch.requests) >= self.max_batch_size:
+            batch.timer.cancel()
+            self._flush(key, batch)
+        return await future
+
+    def _flush(self, key: tuple, batch: _Batch):
+        if self._pending.get(key) is batch:
+            del self._pending[key]
+            # keep a reference so the task isn't collected while in flight
+            task = asyncio.ensure_future(self._dispatch(key, batch))
+            self._dispatching.add(task)
+            task.add_done_callback(self._dispatching.discard)
+
+    async def _dispatch(self, key: tuple, batch: _Batch):
+        self._metrics.record(batch.enqueued_at)
+        try:
+            results = _check_results(await self.sdk.batch_enforce(*key, batch.requests), len(batch.requests))
+        except Exception as e:
+            for future in batch.futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for i, future in enumerate(batch.futures):
+            # a caller may have been cancelled while the batch was in flight
+            if not future.done():
+                future.set_result(results[i])
+
+    def metrics(self) -> Dict:
+        return self._metrics.metrics()
@@ -12,10 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import json
-from typing import Dict, List
+from typing import Dict, Iterator, List
 
-import requests
+from . import codec
+from .entity_list import entity_list
+from .pagination import DEFAULT_PAGE_SIZE, iter_entities
+from .schema import schema_of
 
 
 class Enforcer:
@@ -47,17 +49,13 @@ class Enforcer:
         if data is None:
             return None
 
-        enforcer = cls()
-        for key, value in data.items():
-            if hasattr(enforcer, key):
-                setattr(enforcer, key, value)
-        return enforcer
+        return schema_of(cls).from_dict(data)
 
     def __str__(self):
         return str(self.__dict__)
 
     def to_dict(self) -> dict:
-        return self.__dict__
+        return dict(self.__dict__)
 
 
 class _EnforcerSDK:
@@ -73,14 +71,23 @@ class _EnforcerSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        r = requests.get(url, params)
-        response = r.json()
+        r = self.http_session.get(url, params=params)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
-        enforcers = []
-        for enforcer in response["data"]:
-            enforcers.append(Enforcer.from_dict(enforcer))
-        return enforcers
+        return entity_list(self, Enforcer, response["data"])
+
+    def iter_enforcers(self, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True) -> Iterator[Enforcer]:
+        """
+        Iterate over the enforcers from Casdoor one page at a time, without
+        holding the whole list in memory.
+
+        :param page_size: the number of enforcers requested per page
+        :param prefetch: request the next page in the background while the
+            current one is consumed
+        """
+        params = {"owner": self.org_name}
+        return iter_entities(self, "/api/get-enforcers", Enforcer, params, page_size, prefetch)
 
     def get_enforcer(self, enforcer_id: str) -> Dict:
         """
@@ -95,8 +102,8 @@ class _EnforcerSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        r = requests.get(url, params)
-        response = r.json()
+        r = self.http_session.get(url, params=params)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
 
@@ -110,9 +117,9 @@ class _EnforcerSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        enforcer_info = json.dumps(enforcer.to_dict())
-        r = requests.post(url, params=params, data=enforcer_info)
-        response = r.json()
+        enforcer_info = codec.dumps(enforcer.to_dict())
+        r = self.http_session.post(url, params=params, data=enforcer_info)
+        response = codec.loads(r.content)
         return response
 
     def add_enforcer(self, enforcer: Enforcer) -> Dict:
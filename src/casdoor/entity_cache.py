@@ -0,0 +1,181 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from . import codec
+
+
+class EntityCache:
+    """
+    Bounded LRU cache of the entities returned by the SDK's point lookups
+    (get_user, get_user_by_email, get_application, get_role, ...).
+
+    Entries are keyed by the entity kind ("user", "application",
+    "organization", "role", "permission") and the lookup, e.g.
+    "email:alice@example.com", and each kind can have its own time to live.
+    Lookups that found nothing are cached too, for negative_ttl seconds.
+
+    Entries are kept encoded, so every hit returns a fresh dict and changes
+    made to a returned entity don't leak into the cache. The SDK drops the
+    entries of an entity when it adds, updates or deletes it. The cache is
+    safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10000,
+        ttl: float = 60.0,
+        ttls: Optional[Dict[str, float]] = None,
+        negative_ttl: float = 10.0,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        """
+        :param max_size: the maximum number of lookups to keep
+        :param ttl: how long, in seconds, an entity is cached
+        :param ttls: overrides ttl per kind, e.g. {"user": 30, "application": 600}
+        :param negative_ttl: how long a lookup that found nothing is cached, 0 to not cache them
+        :param timer: the monotonic clock used for expiry
+        """
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.ttls = dict(ttls or {})
+        self.negative_ttl = negative_ttl
+        self.timer = timer
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        # (kind, "owner/name") -> keys of the lookups that returned that entity
+        self._by_entity: Dict[Tuple[str, str], set] = {}
+        # kind -> keys of the lookups that found nothing
+        self._negative: Dict[str, set] = {}
+        self._lock = threading.Lock()
+
+    def _remove(self, key: tuple):
+        _, _, tag = self._entries.pop(key)
+        index = self._by_entity if tag is not None else self._negative
+        index_key = (key[0], tag) if tag is not None else key[0]
+        keys = index.get(index_key)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del index[index_key]
+
+    def get(self, kind: str, lookup: str) -> Tuple[bool, Optional[Dict]]:
+        """
+        Return (True, data) for a fresh entry, data being None when the
+        lookup found nothing, and (False, None) when it isn't cached.
+
+        :param kind: the entity kind, e.g. "user"
+        :param lookup: the lookup, e.g. "id:built-in/alice"
+        """
+        key = (kind, lookup)
+        now = self.timer()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or now >= entry[0]:
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            encoded = entry[1]
+        return True, None if encoded is None else codec.loads(encoded)
+
+    def set(self, kind: str, lookup: str, data: Optional[Dict]):
+        """
+        Cache the result of a lookup, None if it found nothing.
+        """
+        if data is None:
+            ttl, tag, encoded = self.negative_ttl, None, None
+        else:
+            ttl = self.ttls.get(kind, self.ttl)
+            tag, encoded = f"{data.get('owner')}/{data.get('name')}", codec.dumps(data)
+        if ttl <= 0:
+            return
+        key = (kind, lookup)
+        expires_at = self.timer() + ttl
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expires_at, encoded, tag)
+            if tag is None:
+                self._negative.setdefault(kind, set()).add(key)
+            else:
+                self._by_entity.setdefault((kind, tag), set()).add(key)
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, kind: str, entity_id: str):
+        """
+        Drop the lookups that returned an entity, and the cached not-found
+        lookups of its kind, which the entity may now answer.
+
+        :param kind: the entity kind, e.g. "user"
+        :param entity_id: the entity's id, i.e. owner/name
+        """
+        with self._lock:
+            keys = list(self._by_entity.get((kind, entity_id), ())) + list(self._negative.get(kind, ()))
+            for key in keys:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_entity.clear()
+            self._negative.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def read_through(sdk, kind: str, lookup: str, fetch: Callable[[], Optional[Dict]]) -> Optional[Dict]:
+    """
+    Return the data of a point lookup from the SDK's entity cache, calling
+    fetch and caching its result on a miss. Without a cache, just fetch.
+    Errors raised by fetch are not cached.
+    """
+    cache = getattr(sdk, "entity_cache", None)
+    if cache is None:
+        return fetch()
+    found, data = cache.get(kind, lookup)
+    if not found:
+        data = fetch()
+        cache.set(kind, lookup, data)
+    return data
+
+
+async def aread_through(sdk, kind: str, lookup: str, fetch: Callable[[], Awaitable[Optional[Dict]]]) -> Optional[Dict]:
+    """
+    The asyncio version of read_through, fetch being a coroutine function.
+    """
+    cache = getattr(sdk, "entity_cache", None)
+    if cache is None:
+        return await fetch()
+    found, data = cache.get(kind, lookup)
+    if not found:
+        data = await fetch()
+        cache.set(kind, lookup, data)
+    return data
@@ -0,0 +1,82 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections.abc import Sequence
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class LazyList(Sequence):
+    """
+    A read-only list of entities that keeps the parsed JSON of a list
+    response and builds each entity with cls.from_dict on first access.
+
+    Counting, slicing or reading one element doesn't build the others, and
+    raw gives the dicts for filtering without building any entity. An
+    element is built once, even when reached through a slice, so changes made
+    to it are kept.
+    """
+
+    def __init__(self, cls, items: List[Dict[str, Any]], _view: Optional[Tuple[List, List, range]] = None):
+        """
+        :param cls: the entity class, e.g. User
+        :param items: the elements of the response's data
+        """
+        self.cls = cls
+        self.raw = items
+        # a slice reads and builds into its parent's storage, so an element is
+        # the same object whichever list it was reached through
+        if _view is None:
+            _view = (items, [None] * len(items), range(len(items)))
+        self._items, self._entities, self._positions = _view
+
+    def __len__(self) -> int:
+        return len(self.raw)
+
+    def _entity(self, index: int):
+        position = self._positions[index]
+        entity = self._entities[position]
+        if entity is None:
+            entity = self._entities[position] = self.cls.from_dict(self._items[position])
+        return entity
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return LazyList(self.cls, self.raw[index], (self._items, self._entities, self._positions[index]))
+        if index < 0:
+            index += len(self.raw)
+        if not 0 <= index < len(self.raw):
+            raise IndexError("list index out of range")
+        return self._entity(index)
+
+    def __iter__(self):
+        for index in range(len(self.raw)):
+            yield self._entity(index)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (LazyList, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"LazyList({self.cls.__name__}, {len(self.raw)} items)"
+
+
+def entity_list(sdk, cls, items: List[Dict[str, Any]]) -> List:
+    """
+    Turn the data of a list response into entities: a LazyList when the SDK
+    was created with lazy_lists=True, a list otherwise.
+    """
+    if getattr(sdk, "lazy_lists", False):
+        return LazyList(cls, items)
+    return [cls.from_dict(item) for item in items]
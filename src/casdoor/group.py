@@ -12,11 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import json
-from typing import Dict, List
-
-import requests
+from typing import Dict, Iterator, List
 
+from . import codec
+from .entity_list import entity_list
+from .pagination import DEFAULT_PAGE_SIZE, iter_entities
+from .schema import schema_of
 from .user import User
 
 
@@ -51,17 +52,13 @@ class Group:
     def from_dict(cls, data: dict):
         if not data:
             return None
-        group = cls()
-        for key, value in data.items():
-            if hasattr(group, key):
-                setattr(group, key, value)
-        return group
+        return schema_of(cls).from_dict(data)
 
     def __str__(self):
         return str(self.__dict__)
 
     def to_dict(self) -> dict:
-        return self.__dict__
+        return dict(self.__dict__)
 
 
 class _GroupSDK:
@@ -77,16 +74,24 @@ class _GroupSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        r = requests.get(url, params)
-        response = r.json()
+        r = self.http_session.get(url, params=params)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise ValueError(response["msg"])
 
-        res = []
-        for element in response["data"]:
-            res.append(Group.from_dict(element))
+        return entity_list(self, Group, response["data"])
+
+    def iter_groups(self, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True) -> Iterator[Group]:
+        """
+        Iterate over the groups from Casdoor one page at a time, without
+        holding the whole list in memory.
 
-        return res
+        :param page_size: the number of groups requested per page
+        :param prefetch: request the next page in the background while the
+            current one is consumed
+        """
+        params = {"owner": self.org_name}
+        return iter_entities(self, "/api/get-groups", Group, params, page_size, prefetch)
 
     def get_group(self, group_id: str) -> Dict:
         """
@@ -101,8 +106,8 @@ class _GroupSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        r = requests.get(url, params)
-        response = r.json()
+        r = self.http_session.get(url, params=params)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise ValueError(response["msg"])
         return Group.from_dict(response["data"])
@@ -119,9 +124,9 @@ class _GroupSDK:
         }
 
         # group_info = json.dumps(group.to_dict())
-        group_info = json.dumps(group.to_dict(), default=self.custom_encoder)
-        r = requests.post(url, params=params, data=group_info)
-        response = r.json()
+        group_info = codec.dumps(group.to_dict(), default=self.custom_encoder)
+        r = self.http_session.post(url, params=params, data=group_info)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise ValueError(response["msg"])
 
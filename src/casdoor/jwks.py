@@ -0,0 +1,158 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import jwt
+import requests
+
+from . import codec
+
+
+class JwksKeySet:
+    """
+    Signing keys published by Casdoor at /.well-known/jwks, indexed by kid.
+
+    The key set is fetched on first use and kept for ``ttl`` seconds; once
+    stale it keeps being served while a background refresh runs. A token
+    signed with an unknown kid (e.g. right after a certificate rotation)
+    triggers one background refresh that the caller waits for, and refreshes
+    are never started more often than every ``min_refresh_interval`` seconds,
+    however many threads ask for unknown keys.
+    """
+
+    def __init__(
+        self,
+        jwks_uri: str,
+        ttl: float = 300.0,
+        min_refresh_interval: float = 30.0,
+        timeout: float = 10.0,
+        session: Optional[requests.Session] = None,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        """
+        :param jwks_uri: the JWKS URL, usually endpoint + "/.well-known/jwks"
+        :param ttl: how long, in seconds, a fetched key set is considered fresh
+        :param min_refresh_interval: the minimum delay, in seconds, between two refreshes
+        :param timeout: the HTTP timeout, and how long a caller waits for a refresh
+        :param session: the requests session used to fetch the key set
+        :param timer: the monotonic clock used for ttl and rate limiting
+        """
+        self.jwks_uri = jwks_uri
+        self.ttl = ttl
+        self.min_refresh_interval = min_refresh_interval
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        self.timer = timer
+        self.refresh_count = 0
+        self.last_error = None
+        self._keys: Dict[Optional[str], Any] = {}
+        self._fetched_at = None
+        self._last_attempt = None
+        self._refresh_thread = None
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+
+    @classmethod
+    def from_endpoint(cls, endpoint: str, **kwargs) -> "JwksKeySet":
+        return cls(endpoint + "/.well-known/jwks", **kwargs)
+
+    def refresh(self):
+        """
+        Fetch the key set from Casdoor and replace the cached keys.
+        """
+        with self._lock:
+            self._last_attempt = self.timer()
+        r = self.session.get(self.jwks_uri, timeout=self.timeout)
+        r.raise_for_status()
+        jwk_set = jwt.PyJWKSet.from_dict(codec.loads(r.content))
+        keys = {jwk.key_id: jwk.key for jwk in jwk_set.keys}
+        with self._lock:
+            self._keys = keys
+            self._fetched_at = self.timer()
+            self.refresh_count += 1
+
+    def _run_refresh(self):
+        try:
+            self.refresh()
+            self.last_error = None
+        except Exception as e:
+            self.last_error = e
+        finally:
+            with self._lock:
+                self._refresh_thread = None
+
+    def _start_refresh(self) -> Optional[threading.Thread]:
+        """
+        Start a background refresh unless one is already running or the last
+        one started less than min_refresh_interval ago.
+
+        :return: the in-flight refresh thread, or None when rate limited
+        """
+        with self._lock:
+            if self._refresh_thread is not None:
+                return self._refresh_thread
+            now = self.timer()
+            if self._last_attempt is not None and now - self._last_attempt < self.min_refresh_interval:
+                return None
+            self._last_attempt = now
+            thread = threading.Thread(target=self._run_refresh, name="casdoor-jwks-refresh", daemon=True)
+            self._refresh_thread = thread
+        thread.start()
+        return thread
+
+    def _ensure_loaded(self):
+        if self._fetched_at is not None:
+            return
+        with self._load_lock:
+            if self._fetched_at is not None:
+                return
+            # a failed first load is rate limited like any refresh, so callers
+            # don't all hit Casdoor while it is down
+            if self._last_attempt is not None and self.timer() - self._last_attempt < self.min_refresh_interval:
+                raise jwt.PyJWKClientError(f'Unable to load the key set: "{self.last_error}"')
+            try:
+                self.refresh()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = e
+                raise jwt.PyJWKClientError(f'Unable to load the key set: "{e}"') from e
+
+    def get_signing_key(self, kid: Optional[str]):
+        """
+        Return the public key published under kid.
+
+        :param kid: the kid from the token header
+        :return: the public key object
+        :raises jwt.PyJWKClientError: if the key set can't be loaded, or no key matches kid
+            even after a refresh
+        """
+        self._ensure_loaded()
+        if self.timer() - self._fetched_at >= self.ttl:
+            self._start_refresh()
+
+        key = self._keys.get(kid)
+        if key is None:
+            thread = self._start_refresh()
+            if thread is not None:
+                thread.join(self.timeout)
+            key = self._keys.get(kid)
+        if key is None:
+            raise jwt.PyJWKClientError(f'Unable to find a signing key that matches: "{kid}"')
+        return key
+
+    def __len__(self) -> int:
+        return len(self._keys)
@@ -0,0 +1,176 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import functools
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Union
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+
+
+@functools.lru_cache(maxsize=16)
+def _load_public_key(key_pem: bytes):
+    return serialization.load_pem_public_key(key_pem)
+
+
+def _decode_token(token: str, key_pem: bytes, algorithms: tuple, audience: str, kwargs: Dict) -> Dict:
+    """
+    Verify token in a worker process. Key objects cannot be pickled, so the
+    key travels as PEM, serialized once per key and loaded once per worker.
+    """
+    return jwt.decode(token, _load_public_key(key_pem), algorithms=list(algorithms), audience=audience, **kwargs)
+
+
+# PEM of the recently used keys by id, least recently used first. Keys are
+# unhashable, each entry holds its key so that the id can't be reused.
+_pems: "OrderedDict[int, tuple]" = OrderedDict()
+_pems_lock = threading.Lock()
+
+
+def _public_key_pem(key) -> bytes:
+    with _pems_lock:
+        entry = _pems.get(id(key))
+        if entry is not None and entry[0] is key:
+            _pems.move_to_end(id(key))
+            return entry[1]
+    key_pem = key.public_bytes(serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo)
+    with _pems_lock:
+        _pems[id(key)] = (key, key_pem)
+        while len(_pems) > 16:
+            _pems.popitem(last=False)
+    return key_pem
+
+
+def _process_call(sdk, token: str, key, kwargs: Dict) -> Callable[[], Dict]:
+    return functools.partial(_decode_token, token, _public_key_pem(key), tuple(sdk.algorithms), sdk.client_id, kwargs)
+
+
+def _verification_call(sdk, token: str, kwargs: Dict, in_process: bool) -> Callable[[], Dict]:
+    """
+    Return a zero-argument callable verifying token with sdk's key, suitable
+    for submission to a thread or process pool. The call bypasses the token
+    cache, callers consult it on their own thread.
+    """
+    if not in_process:
+        return functools.partial(sdk._decode_jwt_token, token, **kwargs)
+    return _process_call(sdk, token, sdk._get_signing_key(token), kwargs)
+
+
+def _collect(tokens: List[str], results: Dict[str, Union[Dict, Exception]]) -> List[Union[Dict, Exception]]:
+    # duplicates get their own copy so callers can mutate results independently
+    seen = set()
+    ordered = []
+    for token in tokens:
+        result = results[token]
+        if token in seen and isinstance(result, dict):
+            result = dict(result)
+        seen.add(token)
+        ordered.append(result)
+    return ordered
+
+
+def parse_jwt_tokens(sdk, tokens: List[str], executor: Optional[Executor] = None, **kwargs):
+    """
+    Verify a batch of tokens with sdk, see CasdoorSDK.parse_jwt_tokens.
+    """
+    in_process = isinstance(executor, ProcessPoolExecutor)
+    use_cache = sdk.token_cache is not None and not kwargs
+    results = {}
+    futures = {}
+    for token in dict.fromkeys(tokens):
+        try:
+            cached_json = sdk.token_cache.get(token) if use_cache else None
+            if cached_json is not None:
+                results[token] = cached_json
+                continue
+            call = _verification_call(sdk, token, kwargs, in_process)
+            if executor is None:
+                results[token] = call()
+                if use_cache:
+                    sdk.token_cache.set(token, results[token])
+            else:
+                futures[token] = executor.submit(call)
+        except Exception as e:
+            results[token] = e
+
+    for token, future in futures.items():
+        try:
+            results[token] = future.result()
+        except Exception as e:
+            results[token] = e
+            continue
+        if use_cache:
+            sdk.token_cache.set(token, results[token])
+    return _collect(tokens, results)
+
+
+async def _run_verification(sdk, token: str, kwargs: Dict, executor: Optional[Executor]) -> Dict:
+    loop = asyncio.get_running_loop()
+    async with sdk._get_verification_semaphore():
+        if isinstance(executor, ProcessPoolExecutor):
+            # picking the key may fetch the key set, so it can't run on the loop either
+            key = await loop.run_in_executor(None, sdk._get_signing_key, token)
+            call = _process_call(sdk, token, key, kwargs)
+        else:
+            call = _verification_call(sdk, token, kwargs, False)
+        return await loop.run_in_executor(executor, call)
+
+
+async def aparse_jwt_token(sdk, token: str, **kwargs) -> Dict:
+    """
+    Verify token with sdk on its verification executor, see
+    AsyncCasdoorSDK.aparse_jwt_token.
+    """
+    use_cache = sdk.token_cache is not None and not kwargs
+    if use_cache:
+        cached_json = sdk.token_cache.get(token)
+        if cached_json is not None:
+            return cached_json
+
+    return_json = await _run_verification(sdk, token, kwargs, sdk.verification_executor)
+    if use_cache:
+        sdk.token_cache.set(token, return_json)
+    return return_json
+
+
+async def aparse_jwt_tokens(sdk, tokens: List[str], executor: Optional[Executor] = None, **kwargs):
+    """
+    Verify a batch of tokens with sdk without blocking the event loop, see
+    AsyncCasdoorSDK.aparse_jwt_tokens.
+    """
+    if executor is None:
+        executor = sdk.verification_executor
+    use_cache = sdk.token_cache is not None and not kwargs
+    results = {}
+    pending = []
+    for token in dict.fromkeys(tokens):
+        cached_json = sdk.token_cache.get(token) if use_cache else None
+        if cached_json is not None:
+            results[token] = cached_json
+        else:
+            pending.append(token)
+
+    outcomes = await asyncio.gather(
+        *(_run_verification(sdk, token, kwargs, executor) for token in pending), return_exceptions=True
+    )
+    for index, outcome in enumerate(outcomes):
+        token = pending[index]
+        results[token] = outcome
+        if use_cache and not isinstance(outcome, BaseException):
+            sdk.token_cache.set(token, outcome)
+    return _collect(tokens, results)
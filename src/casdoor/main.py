@@ -12,34 +12,47 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import json
-from typing import Dict, List, Optional
+from concurrent.futures import Executor
+from http import cookiejar
+from typing import Dict, List, Optional, Union
+from urllib.parse import quote_plus
 
 import jwt
 import requests
 from cryptography import x509
 from cryptography.hazmat.backends import default_backend
+from requests.adapters import HTTPAdapter
 
+from . import codec, jwt_batch
 from .adapter import _AdapterSDK
 from .application import _ApplicationSDK
 from .cert import _CertSDK
+from .decision_cache import DecisionCache
+from .enforce_batcher import EnforceBatcher
 from .enforcer import _EnforcerSDK
+from .entity_cache import EntityCache
 from .group import _GroupSDK
-from .model import _ModelSDK
+from .jwks import JwksKeySet
+from .model import Model, _ModelSDK
 from .organization import _OrganizationSDK
 from .payment import _PaymentSDK
-from .permission import _PermissionSDK
+from .permission import Permission, _PermissionSDK
 from .plan import _PlanSDK
+from .policy_engine import LocalEnforcer
 from .pricing import _PricingSDK
 from .product import _ProductSDK
 from .provider import _ProviderSDK
 from .resource import _ResourceSDK
-from .role import _RoleSDK
+from .role import Role, _RoleSDK
+from .role_graph import RoleGraphRefresher
 from .session import _SessionSDK
 from .subscription import _SubscriptionSDK
 from .syncer import _SyncerSDK
 from .token import _TokenSDK
+from .token_cache import TokenCache
+from .token_manager import ClientCredentialsTokenManager
 from .user import _UserSDK
+from .user_index import UserIndex
 from .webhook import _WebhookSDK
 
 
@@ -80,6 +93,46 @@ def _build_enforce_params(
     return params
 
 
+class _BlockAllCookiesPolicy(cookiejar.DefaultCookiePolicy):
+    """
+    Cookie policy that never stores or sends cookies.
+
+    The SDK authenticates every call with the client credentials, so the
+    pooled session must stay as stateless as the module-level requests
+    helpers it replaces. Dropping cookies also means no shared jar is
+    mutated when the session is used from several threads.
+    """
+
+    def set_ok(self, cookie, request):
+        return False
+
+    def return_ok(self, cookie, request):
+        return False
+
+
+def _build_http_session(pool_connections: int, pool_maxsize: int, pool_block: bool, max_retries: int):
+    """
+    Build the keep-alive session shared by every API call of a CasdoorSDK.
+
+    :param pool_connections: the number of per-host connection pools to keep
+    :param pool_maxsize: the maximum number of connections kept per host
+    :param pool_block: whether to block instead of opening extra connections when a host pool is exhausted
+    :param max_retries: the number of retries for failed connections
+    :return: a configured requests.Session
+    """
+    session = requests.Session()
+    session.cookies.set_policy(_BlockAllCookiesPolicy())
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=max_retries,
+        pool_block=pool_block,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
 class CasdoorSDK(
     _UserSDK,
     _AdapterSDK,
@@ -112,6 +165,20 @@ class CasdoorSDK(
         org_name: str,
         application_name: str,
         front_endpoint: str = None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        max_retries: int = 0,
+        token_cache: Optional[TokenCache] = None,
+        key_set: Optional[JwksKeySet] = None,
+        decision_cache: Optional[DecisionCache] = None,
+        enforce_batch_window: Optional[float] = None,
+        enforce_max_batch_size: int = 100,
+        role_graph_ttl: Optional[float] = None,
+        compact_users: bool = False,
+        lazy_lists: bool = False,
+        entity_cache: Optional[EntityCache] = None,
+        user_index: Optional[UserIndex] = None,
     ):
         self.endpoint = endpoint
         if front_endpoint:
@@ -121,11 +188,51 @@ class CasdoorSDK(
         self.client_id = client_id
         self.client_secret = client_secret
         self.certificate = certificate
+        self.token_cache = token_cache
+        self.key_set = key_set
+        self.decision_cache = decision_cache
+        self.entity_cache = entity_cache
+        self.user_index = user_index
+        self.compact_users = compact_users
+        self.lazy_lists = lazy_lists
         self.org_name = org_name
         self.application_name = application_name
         self.grant_type = "authorization_code"
 
         self.algorithms = ["RS256"]
+        self._auth_link_parts = None
+        self.token_manager = ClientCredentialsTokenManager(self)
+        self.enforce_batcher = None
+        if enforce_batch_window is not None:
+            self.enforce_batcher = EnforceBatcher(self, enforce_batch_window, enforce_max_batch_size)
+        self.role_graph = None
+        if role_graph_ttl is not None:
+            self.role_graph = RoleGraphRefresher(self, role_graph_ttl)
+        self.http_session = _build_http_session(pool_connections, pool_maxsize, pool_block, max_retries)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """
+        Close the pooled HTTP session and release its connections.
+        """
+        self.http_session.close()
+
+    @property
+    def certificate(self) -> str:
+        return self._certificate
+
+    @certificate.setter
+    def certificate(self, certificate: str):
+        self._certificate = certificate
+        self._public_key = None
+        # claims verified against the previous key must not be served anymore
+        if getattr(self, "token_cache", None) is not None:
+            self.token_cache.clear()
 
     @property
     def certification(self) -> bytes:
@@ -133,17 +240,56 @@ class CasdoorSDK(
             raise TypeError("certificate field must be str type")
         return self.certificate.encode("utf-8")
 
-    def get_auth_link(self, redirect_uri: str, response_type: str = "code", scope: str = "read"):
-        url = self.front_endpoint + "/login/oauth/authorize"
-        params = {
-            "client_id": self.client_id,
-            "response_type": response_type,
-            "redirect_uri": redirect_uri,
-            "scope": scope,
-            "state": self.application_name,
-        }
-        r = requests.request("", url, params=params)
-        return r.url
+    @property
+    def public_key(self):
+        """
+        The public key of the certificate, loaded on first use and kept
+        until the certificate is reassigned.
+        """
+        if self._public_key is None:
+            certificate = x509.load_pem_x509_certificate(self.certification, default_backend())
+            self._public_key = certificate.public_key()
+        return self._public_key
+
+    def _get_signing_key(self, token: str):
+        """
+        Pick the key to verify token with: the key_set entry matching the kid
+        in the token header when a key set is configured, the certificate's
+        public key otherwise.
+        """
+        if self.key_set is not None:
+            kid = jwt.get_unverified_header(token).get("kid")
+            if kid is not None:
+                return self.key_set.get_signing_key(kid)
+        return self.public_key
+
+    def _get_auth_link_parts(self):
+        """
+        Return the constant prefix and suffix of the authorize URL, rebuilt
+        only when front_endpoint, client_id or application_name change.
+        """
+        key = (self.front_endpoint, self.client_id, self.application_name)
+        if self._auth_link_parts is None or self._auth_link_parts[0] != key:
+            prefix = f"{self.front_endpoint}/login/oauth/authorize?client_id={quote_plus(self.client_id)}"
+            suffix = f"&state={quote_plus(self.application_name)}"
+            self._auth_link_parts = (key, prefix, suffix)
+        return self._auth_link_parts[1], self._auth_link_parts[2]
+
+    def get_auth_link(self, redirect_uri: str, response_type: str = "code", scope: str = "read") -> str:
+        """
+        Build the Casdoor login URL to redirect users to. The URL is built
+        locally, no request is sent.
+
+        :param redirect_uri: the URL Casdoor redirects back to with the code
+        :param response_type: the OAuth response type
+        :param scope: the OAuth scope
+        :return: the authorize URL
+        """
+        prefix, suffix = self._get_auth_link_parts()
+        return (
+            f"{prefix}&response_type={quote_plus(response_type)}"
+            f"&redirect_uri={quote_plus(redirect_uri)}&scope={quote_plus(scope)}{suffix}"
+        )
 
     def get_oauth_token(
         self, code: Optional[str] = None, username: Optional[str] = None, password: Optional[str] = None
@@ -160,7 +306,7 @@ class CasdoorSDK(
         :return: token: OAuth token
         """
         response = self.oauth_token_request(code, username, password)
-        token = response.json()
+        token = codec.loads(response.content)
 
         return token
 
@@ -237,7 +383,7 @@ class CasdoorSDK(
         :return: Response from Casdoor
         """
         url = self.endpoint + "/api/login/oauth/access_token"
-        response = requests.post(url, payload)
+        response = self.http_session.post(url, payload)
         return response
 
     def refresh_token_request(self, refresh_token: str, scope: str = "") -> requests.Response:
@@ -256,7 +402,7 @@ class CasdoorSDK(
             "scope": scope,
             "refresh_token": refresh_token,
         }
-        return requests.post(url, params)
+        return self.http_session.post(url, params)
 
     def refresh_oauth_token(self, refresh_token: str, scope: str = "") -> str:
         """
@@ -267,7 +413,7 @@ class CasdoorSDK(
         :return: Response from Casdoor
         """
         r = self.refresh_token_request(refresh_token, scope)
-        access_token = r.json().get("access_token")
+        access_token = codec.loads(r.content).get("access_token")
 
         return access_token
 
@@ -280,7 +426,7 @@ class CasdoorSDK(
         :return: Response from Casdoor
         """
         r = self.refresh_token_request(refresh_token, scope)
-        refreshed_token = r.json()
+        refreshed_token = codec.loads(r.content)
 
         return refreshed_token
 
@@ -289,19 +435,50 @@ class CasdoorSDK(
         Converts the returned access_token to real data using
         jwt (JSON Web Token) algorithms.
 
+        Verified claims are served from token_cache when one is configured and
+        no extra decode options are given.
+
         :param token: access_token
         :return: the data in dict format
         """
-        certificate = x509.load_pem_x509_certificate(self.certification, default_backend())
+        use_cache = self.token_cache is not None and not kwargs
+        if use_cache:
+            cached_json = self.token_cache.get(token)
+            if cached_json is not None:
+                return cached_json
+
+        return_json = self._decode_jwt_token(token, **kwargs)
+        if use_cache:
+            self.token_cache.set(token, return_json)
+        return return_json
 
-        return_json = jwt.decode(
+    def _decode_jwt_token(self, token: str, **kwargs) -> Dict:
+        """
+        Verify token and return its claims, bypassing token_cache.
+        """
+        return jwt.decode(
             token,
-            certificate.public_key(),
+            self._get_signing_key(token),
             algorithms=self.algorithms,
             audience=self.client_id,
             **kwargs,
         )
-        return return_json
+
+    def parse_jwt_tokens(
+        self, tokens: List[str], executor: Optional[Executor] = None, **kwargs
+    ) -> List[Union[Dict, Exception]]:
+        """
+        Verify a batch of access_tokens. Identical tokens are verified only
+        once and the cached public key is reused for all of them.
+
+        :param tokens: the access_tokens to verify
+        :param executor: an optional thread or process pool to fan the
+                         verifications out to, they run in the calling
+                         thread otherwise
+        :return: for each token, in input order, its data in dict format or
+                 the exception raised while verifying it
+        """
+        return jwt_batch.parse_jwt_tokens(self, tokens, executor, **kwargs)
 
     def enforce(
         self,
@@ -323,20 +500,37 @@ class CasdoorSDK(
         :param casbin_request: a list containing the request data (i.e. sub, obj, act)
         :return: a boolean value indicating whether the request is allowed
         """
-        url = self.endpoint + "/api/enforce"
         params = _build_enforce_params(permission_id, model_id, resource_id, enforce_id, owner)
+        if self.decision_cache is not None:
+            # a write clearing the cache while this check is in flight bumps the generation
+            generation = self.decision_cache.generation
+            cached = self.decision_cache.get(params, casbin_request)
+            if cached is not None:
+                return cached
+
+        # batch-enforce has no resourceId selector, those checks are sent alone
+        if self.enforce_batcher is not None and not resource_id:
+            has_permission = self.enforce_batcher.enforce(permission_id, model_id, enforce_id, owner, casbin_request)
+        else:
+            has_permission = self._send_enforce(params, casbin_request)
 
-        r = requests.post(
+        if self.decision_cache is not None:
+            self.decision_cache.set(params, casbin_request, has_permission, generation)
+        return has_permission
+
+    def _send_enforce(self, params: Dict[str, str], casbin_request: Optional[List[str]]) -> bool:
+        url = self.endpoint + "/api/enforce"
+        r = self.http_session.post(
             url,
             params=params,
-            data=json.dumps(casbin_request),
+            data=codec.dumps(casbin_request),
             auth=(self.client_id, self.client_secret),
         )
         if r.status_code != 200 or "json" not in r.headers["content-type"]:
             error_str = "Casdoor response error:\n" + str(r.text)
             raise ValueError(error_str)
 
-        response = r.json()
+        response = codec.loads(r.content)
         if isinstance(response, dict):
             data = response.get("data")
             if isinstance(data, list) and len(data) > 0:
@@ -372,10 +566,10 @@ class CasdoorSDK(
         url = self.endpoint + "/api/batch-enforce"
         params = _build_enforce_params(permission_id, model_id, "", enforce_id, owner)
 
-        r = requests.post(
+        r = self.http_session.post(
             url,
             params=params,
-            data=json.dumps(casbin_request),
+            data=codec.dumps(casbin_request),
             auth=(self.client_id, self.client_secret),
         )
 
@@ -383,7 +577,7 @@ class CasdoorSDK(
             error_str = "Casdoor response error:\n" + str(r.text)
             raise ValueError(error_str)
 
-        response = r.json()
+        response = codec.loads(r.content)
         data = response.get("data")
         if data is None:
             error_str = "Casdoor response error:\n" + r.text
@@ -402,3 +596,49 @@ class CasdoorSDK(
             raise ValueError(error_str)
 
         return enforce_results
+
+    def load_local_enforcer(self, permission_id: str = "", model_id: str = "") -> LocalEnforcer:
+        """
+        Download a model with its permissions and roles, and build a
+        LocalEnforcer answering enforce and batch_enforce checks in process.
+
+        Exactly one of the parameters must be provided: the enforcer holds
+        the policies of that permission, or of every permission using that
+        model, as the enforce API does. Everything is read from the
+        organization named in the id, and a ValueError is raised when the
+        permission or the model doesn't exist. Reload it to pick up changes.
+
+        :param permission_id: the permission id (i.e. organization name/permission name)
+        :param model_id: the model id (i.e. organization name/model name)
+        :return: a LocalEnforcer
+        """
+        if bool(permission_id) == bool(model_id):
+            raise ValueError("Exactly one of (permission_id, model_id) must be provided and non-empty.")
+        # the entity getters are scoped to org_name, look everything up under the id's owner
+        owner, _, name = (permission_id or model_id).rpartition("/")
+        owner = owner or self.org_name
+        if permission_id:
+            permission = Permission.from_dict(self._get_owned("/api/get-permission", {"id": f"{owner}/{name}"}))
+            if permission is None:
+                raise ValueError(f"Permission {owner}/{name} not found")
+            permissions = [permission]
+            model_name = permission.model
+        else:
+            model_name = name
+            data = self._get_owned("/api/get-permissions", {"owner": owner}) or []
+            permissions = [
+                permission for permission in map(Permission.from_dict, data) if permission.model == model_name
+            ]
+        model = Model.from_dict(self._get_owned("/api/get-model", {"id": f"{owner}/{model_name}"}))
+        if model is None:
+            raise ValueError(f"Model {owner}/{model_name} not found")
+        roles = [Role.from_dict(role) for role in self._get_owned("/api/get-roles", {"owner": owner}) or []]
+        return LocalEnforcer.from_permissions(model.modelText, permissions, roles, f"{model.owner}/{model.name}")
+
+    def _get_owned(self, path: str, params: Dict[str, str]):
+        params = dict(params, clientId=self.client_id, clientSecret=self.client_secret)
+        r = self.http_session.get(self.endpoint + path, params=params)
+        response = codec.loads(r.content)
+        if response["status"] != "ok":
+            raise Exception(response["msg"])
+        return response["data"]
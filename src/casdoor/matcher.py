@@ -0,0 +1,249 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import ipaddress
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from types import CodeType
+from typing import Callable, Dict, Iterable, List, Sequence
+
+_TOKEN = re.compile(
+    r"""\s*(?:
+        (?P<string>"[^"]*"|'[^']*')
+        |(?P<op>&&|\|\||==|!=|<=|>=|!|[()<>,+\-*/%])
+        |(?P<number>\d+(?:\.\d+)?)
+        |(?P<name>[A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)*)
+    )""",
+    re.VERBOSE,
+)
+_OPERATORS = {"&&": " and ", "||": " or ", "!": " not "}
+_KEYWORDS = {"true": "True", "false": "False", "in": " in "}
+
+
+@lru_cache(maxsize=4096)
+def _regex(pattern: str):
+    return re.compile(pattern)
+
+
+def key_match(key1: str, key2: str) -> bool:
+    """
+    keyMatch: key2 may end with *, e.g. /foo/bar matches /foo/*.
+    """
+    i = key2.find("*")
+    if i == -1:
+        return key1 == key2
+    return key1[:i] == key2[:i]
+
+
+@lru_cache(maxsize=4096)
+def _key_match2_regex(key2: str):
+    pattern = re.sub(r":[^/]+", "[^/]+", key2.replace("/*", "/.*"))
+    if pattern == "*":
+        pattern = "(.*)"
+    return re.compile("^" + pattern + "$")
+
+
+def key_match2(key1: str, key2: str) -> bool:
+    """
+    keyMatch2: key2 may contain :name segments, e.g. /resource/1 matches
+    /resource/:id.
+    """
+    return _key_match2_regex(key2).match(key1) is not None
+
+
+@lru_cache(maxsize=4096)
+def _key_match3_regex(key2: str):
+    pattern = re.sub(r"\{[^/]+?\}", "[^/]+", key2.replace("/*", "/.*"))
+    return re.compile("^" + pattern + "$")
+
+
+def key_match3(key1: str, key2: str) -> bool:
+    """
+    keyMatch3: key2 may contain {name} segments, e.g. /resource/1 matches
+    /resource/{id}.
+    """
+    return _key_match3_regex(key2).match(key1) is not None
+
+
+def regex_match(key1: str, key2: str) -> bool:
+    return _regex(key2).search(key1) is not None
+
+
+@lru_cache(maxsize=4096)
+def _glob_regex(pattern: str):
+    # the path.Match syntax of the Go server: * and ? don't cross a /
+    parts = []
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "*":
+            parts.append("[^/]*")
+        elif c == "?":
+            parts.append("[^/]")
+        elif c == "\\" and i + 1 < len(pattern):
+            i += 1
+            parts.append(re.escape(pattern[i]))
+        elif c == "[" and pattern.find("]", i + 2) != -1:
+            end = pattern.find("]", i + 2)
+            parts.append("[" + pattern[i + 1 : end].replace("\\", "\\\\") + "]")
+            i = end
+        else:
+            parts.append(re.escape(c))
+        i += 1
+    return re.compile("".join(parts) + r"\Z")
+
+
+def glob_match(key1: str, key2: str) -> bool:
+    return _glob_regex(key2).match(key1) is not None
+
+
+@lru_cache(maxsize=4096)
+def _ip_network(ip: str):
+    return ipaddress.ip_network(ip, strict=False)
+
+
+def ip_match(ip1: str, ip2: str) -> bool:
+    """
+    ipMatch: ip2 is an address or a CIDR block, e.g. 192.168.2.123 matches
+    192.168.2.0/24.
+    """
+    return ipaddress.ip_address(ip1) in _ip_network(ip2)
+
+
+FUNCTIONS = {
+    "keyMatch": key_match,
+    "keyMatch2": key_match2,
+    "keyMatch3": key_match3,
+    "regexMatch": regex_match,
+    "globMatch": glob_match,
+    "ipMatch": ip_match,
+}
+
+
+def translate_matcher(matcher: str, variables: Dict[str, str], functions: Iterable[str]) -> str:
+    """
+    Translate a Casbin matcher into the equivalent Python expression: &&
+    becomes and, r.sub becomes variables["r_sub"], and so on.
+
+    :param matcher: the [matchers] expression
+    :param variables: the Python expression to read each r_* and p_* token with
+    :param functions: the names of the functions the matcher may call
+    :raises ValueError: if the matcher uses unknown names or syntax
+    """
+    functions = set(functions)
+    parts = []
+    position = 0
+    matcher = matcher.strip()
+    while position < len(matcher):
+        match = _TOKEN.match(matcher, position)
+        if match is None or match.end() == position:
+            raise ValueError(f"invalid matcher syntax at {matcher[position:]!r}")
+        position = match.end()
+        kind = match.lastgroup
+        token = match.group(kind)
+        if kind == "op":
+            parts.append(_OPERATORS.get(token, token))
+        elif kind == "name":
+            if token in _KEYWORDS:
+                parts.append(_KEYWORDS[token])
+                continue
+            head, _, rest = token.partition(".")
+            second, _, attributes = rest.partition(".")
+            name = f"{head}_{second}"
+            if any(part.startswith("_") for part in attributes.split(".") if part):
+                raise ValueError(f"private attribute in {token!r} in matcher")
+            if second and name in variables:
+                # r.sub.Owner reads the Owner attribute of an ABAC request value
+                parts.append(variables[name] + (f".{attributes}" if attributes else ""))
+            elif not rest and token in functions:
+                parts.append(token)
+            else:
+                raise ValueError(f"unknown name {token!r} in matcher")
+        else:
+            parts.append(token)
+    return "".join(parts)
+
+
+def matcher_expression(
+    matcher: str, request_tokens: List[str], policy_tokens: List[str], role_functions: Iterable[str] = ()
+) -> str:
+    """
+    Translate a matcher into a Python expression reading the request values
+    as r[i] and the policy values as p[j].
+    """
+    variables = {token: f"r[{i}]" for i, token in enumerate(request_tokens)}
+    variables.update({token: f"p[{i}]" for i, token in enumerate(policy_tokens)})
+    return translate_matcher(matcher, variables, list(FUNCTIONS) + list(role_functions))
+
+
+# compiled matchers, least recently used first
+_compiled: "OrderedDict[str, tuple]" = OrderedDict()
+_compiled_lock = threading.Lock()
+_COMPILED_MAX_SIZE = 256
+
+
+def compile_matcher(
+    matcher: str,
+    request_tokens: List[str],
+    policy_tokens: List[str],
+    role_functions: Iterable[str] = (),
+    model_id: str = "",
+) -> CodeType:
+    """
+    Compile a matcher into the code of a lambda r, p: ... reading the
+    request and policy values by position.
+
+    The compiled code is cached by model_id and a hash of the matcher and
+    definitions, so rebuilding an enforcer for an unchanged model skips the
+    translation. A changed model replaces its previous entry, and the least
+    recently used entries are dropped beyond 256 matchers.
+
+    :param matcher: the [matchers] expression
+    :param request_tokens: the request definition, e.g. ["r_sub", "r_obj", "r_act"]
+    :param policy_tokens: the policy definition, e.g. ["p_sub", "p_obj", "p_act"]
+    :param role_functions: the role definition names, e.g. ["g"]
+    :param model_id: the model id (i.e. organization name/model name)
+    """
+    role_functions = sorted(role_functions)
+    content = "\n".join([matcher, ",".join(request_tokens), ",".join(policy_tokens), ",".join(role_functions)])
+    digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    key = model_id or digest
+    with _compiled_lock:
+        entry = _compiled.get(key)
+        if entry is not None and entry[0] == digest:
+            _compiled.move_to_end(key)
+            return entry[1]
+
+    expression = matcher_expression(matcher, request_tokens, policy_tokens, role_functions)
+    code = compile(f"lambda r, p: {expression}", f"<matcher {key}>", "eval")
+    with _compiled_lock:
+        _compiled[key] = (digest, code)
+        _compiled.move_to_end(key)
+        while len(_compiled) > _COMPILED_MAX_SIZE:
+            _compiled.popitem(last=False)
+    return code
+
+
+def bind_matcher(code: CodeType, role_functions: Dict[str, Callable]) -> Callable[[Sequence, Sequence], bool]:
+    """
+    Turn compiled matcher code into a callable match(request_values,
+    policy_values), with the built-in and role functions pre-bound.
+    """
+    namespace = dict(FUNCTIONS)
+    namespace.update(role_functions)
+    namespace["__builtins__"] = {}
+    return eval(code, namespace)
@@ -12,11 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import json
-from typing import Dict, List
-
-import requests
+from typing import Dict, Iterator, List
 
+from . import codec
+from .entity_list import entity_list
+from .pagination import DEFAULT_PAGE_SIZE, iter_entities
+from .schema import schema_of
 from .user import User
 
 
@@ -53,17 +54,13 @@ class Model:
     def from_dict(cls, data: dict):
         if not data:
             return None
-        model = cls()
-        for key, value in data.items():
-            if hasattr(model, key):
-                setattr(model, key, value)
-        return model
+        return schema_of(cls).from_dict(data)
 
     def __str__(self):
         return str(self.__dict__)
 
     def to_dict(self) -> dict:
-        return self.__dict__
+        return dict(self.__dict__)
 
 
 class _ModelSDK:
@@ -79,14 +76,23 @@ class _ModelSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        r = requests.get(url, params)
-        response = r.json()
+        r = self.http_session.get(url, params=params)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
-        models = []
-        for model in response["data"]:
-            models.append(Model.from_dict(model))
-        return models
+        return entity_list(self, Model, response["data"])
+
+    def iter_models(self, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True) -> Iterator[Model]:
+        """
+        Iterate over the models from Casdoor one page at a time, without
+        holding the whole list in memory.
+
+        :param page_size: the number of models requested per page
+        :param prefetch: request the next page in the background while the
+            current one is consumed
+        """
+        params = {"owner": self.org_name}
+        return iter_entities(self, "/api/get-models", Model, params, page_size, prefetch)
 
     def get_model(self, model_id: str) -> Dict:
         """
@@ -101,8 +107,8 @@ class _ModelSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        r = requests.get(url, params)
-        response = r.json()
+        r = self.http_session.get(url, params=params)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
         return Model.from_dict(response["data"])
@@ -115,9 +121,13 @@ class _ModelSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        model_info = json.dumps(model.to_dict(), default=self.custom_encoder)
-        r = requests.post(url, params=params, data=model_info)
-        response = r.json()
+        model_info = codec.dumps(model.to_dict(), default=self.custom_encoder)
+        r = self.http_session.post(url, params=params, data=model_info)
+        response = codec.loads(r.content)
+        if getattr(self, "decision_cache", None) is not None:
+            # decisions cached under any selector (model, owner, enforcer)
+            # may depend on it, so none of them can be trusted anymore
+            self.decision_cache.clear()
         return response
 
     def add_model(self, model: Model) -> Dict:
@@ -12,10 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import json
-from typing import Dict, List
+from typing import Dict, Iterator, List
 
-import requests
+from . import codec
+from .entity_cache import read_through
+from .entity_list import entity_list
+from .pagination import DEFAULT_PAGE_SIZE, iter_entities
+from .schema import schema_of
 
 
 class AccountItem:
@@ -29,7 +32,7 @@ class AccountItem:
         return str(self.__dict__)
 
     def to_dict(self) -> dict:
-        return self.__dict__
+        return dict(self.__dict__)
 
 
 class ThemeData:
@@ -44,7 +47,7 @@ class ThemeData:
         return str(self.__dict__)
 
     def to_dict(self) -> dict:
-        return self.__dict__
+        return dict(self.__dict__)
 
 
 class MfaItem:
@@ -56,7 +59,7 @@ class MfaItem:
         return str(self.__dict__)
 
     def to_dict(self) -> dict:
-        return self.__dict__
+        return dict(self.__dict__)
 
 
 class Organization:
@@ -122,17 +125,13 @@ class Organization:
         if data is None:
             return None
 
-        org = cls()
-        for key, value in data.items():
-            if hasattr(org, key):
-                setattr(org, key, value)
-        return org
+        return schema_of(cls).from_dict(data)
 
     def __str__(self):
         return str(self.__dict__)
 
     def to_dict(self) -> dict:
-        return self.__dict__
+        return dict(self.__dict__)
 
 
 class _OrganizationSDK:
@@ -148,15 +147,24 @@ class _OrganizationSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        r = requests.get(url, params)
-        response = r.json()
+        r = self.http_session.get(url, params=params)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise ValueError(response.msg)
 
-        res = []
-        for element in response["data"]:
-            res.append(Organization.from_dict(element))
-        return res
+        return entity_list(self, Organization, response["data"])
+
+    def iter_organizations(self, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True) -> Iterator[Organization]:
+        """
+        Iterate over the organizations from Casdoor one page at a time, without
+        holding the whole list in memory.
+
+        :param page_size: the number of organizations requested per page
+        :param prefetch: request the next page in the background while the
+            current one is consumed
+        """
+        params = {"owner": self.org_name}
+        return iter_entities(self, "/api/get-organizations", Organization, params, page_size, prefetch)
 
     def get_organization(self, organization_id: str) -> Dict:
         """
@@ -171,11 +179,15 @@ class _OrganizationSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        r = requests.get(url, params)
-        response = r.json()
-        if response["status"] != "ok":
-            raise ValueError(response.msg)
-        return Organization.from_dict(response["data"])
+
+        def fetch():
+            r = self.http_session.get(url, params=params)
+            response = codec.loads(r.content)
+            if response["status"] != "ok":
+                raise ValueError(response.msg)
+            return response["data"]
+
+        return Organization.from_dict(read_through(self, "organization", "id:" + params["id"], fetch))
 
     def modify_organization(self, method: str, organization: Organization) -> Dict:
         url = self.endpoint + f"/api/{method}"
@@ -185,9 +197,11 @@ class _OrganizationSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        organization_info = json.dumps(organization.to_dict())
-        r = requests.post(url, params=params, data=organization_info)
-        response = r.json()
+        organization_info = codec.dumps(organization.to_dict())
+        r = self.http_session.post(url, params=params, data=organization_info)
+        if getattr(self, "entity_cache", None) is not None:
+            self.entity_cache.invalidate("organization", params["id"])
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise ValueError(response)
         return str(response["data"])
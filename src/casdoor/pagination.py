@@ -0,0 +1,269 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+from . import codec
+from .entity_list import entity_list
+
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_CONCURRENCY = 4
+
+Page = Tuple[List[Dict[str, Any]], Optional[int]]
+
+
+def _has_next(page: Page, p: int, page_size: int) -> bool:
+    items, total = page
+    if len(items) != page_size:
+        # a short page is the last one, and a longer one means the
+        # server ignored p and pageSize and sent everything
+        return False
+    return total is None or p * page_size < total
+
+
+def _last_page(page: Page, page_size: int) -> Optional[int]:
+    """
+    The number of the last page according to the total count of page 1, or
+    None when the total is unknown or page 1 is the only page.
+    """
+    total = page[1]
+    if total is None or not _has_next(page, 1, page_size):
+        return None
+    return -(-total // page_size)
+
+
+def page_of(response: Dict) -> Page:
+    """
+    The items and the total count (data2) of a paged list response.
+
+    :raises Exception: if the response's status isn't ok
+    """
+    if response.get("status") != "ok":
+        raise Exception(response.get("msg"))
+    total = response.get("data2")
+    return response.get("data") or [], total if isinstance(total, int) else None
+
+
+def iter_pages(fetch_page: Callable[[int], Page], page_size: int, prefetch: bool = True) -> Iterator[List[Dict]]:
+    """
+    Yield the pages of a list endpoint, starting with p=1, until a page is
+    shorter than page_size or the total count has been reached.
+
+    With prefetch, page p + 1 is requested in a background thread while the
+    caller consumes page p. Closing the generator early drops the pending
+    request's result.
+
+    :param fetch_page: takes the 1-based page number and returns the page's
+        items and the total count (None if the server doesn't send it)
+    """
+    if page_size <= 0:
+        raise ValueError("page_size must be positive")
+    if not prefetch:
+        p = 1
+        while True:
+            page = fetch_page(p)
+            yield page[0]
+            if not _has_next(page, p, page_size):
+                return
+            p += 1
+
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="casdoor-prefetch")
+    future = None
+    try:
+        p = 1
+        page = fetch_page(p)
+        while True:
+            has_next = _has_next(page, p, page_size)
+            if has_next:
+                future = executor.submit(fetch_page, p + 1)
+            yield page[0]
+            if not has_next:
+                return
+            page, future = future.result(), None
+            p += 1
+    finally:
+        if future is not None:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+async def aiter_pages(
+    fetch_page: Callable[[int], Awaitable[Page]], page_size: int, prefetch: bool = True
+) -> AsyncIterator[List[Dict]]:
+    """
+    The asyncio version of iter_pages: with prefetch, page p + 1 is requested
+    by a task while the caller consumes page p. No more than one page is
+    requested ahead, so a slow consumer holds back the requests. Closing the
+    generator (aclose) cancels the pending request.
+
+    :param fetch_page: a coroutine function taking the 1-based page number
+    """
+    if page_size <= 0:
+        raise ValueError("page_size must be positive")
+    task = None
+    try:
+        p = 1
+        page = await fetch_page(p)
+        while True:
+            has_next = _has_next(page, p, page_size)
+            if has_next and prefetch:
+                task = asyncio.ensure_future(fetch_page(p + 1))
+            yield page[0]
+            if not has_next:
+                return
+            if task is None:
+                page = await fetch_page(p + 1)
+            else:
+                page, task = await task, None
+            p += 1
+    finally:
+        if task is not None:
+            task.cancel()
+
+
+def fetch_all_pages(
+    fetch_page: Callable[[int], Page], page_size: int, concurrency: int = DEFAULT_CONCURRENCY
+) -> List[Dict]:
+    """
+    Read every page of a list endpoint and return their items in order.
+
+    Page 1 gives the total count, then the other pages are requested at
+    most concurrency at a time on a thread pool. If the total is unknown, or
+    the collection grew past it in the meantime, the remaining pages are
+    read one after another.
+
+    :param fetch_page: see iter_pages
+    :param concurrency: the maximum number of pages requested at once
+    """
+    if page_size <= 0 or concurrency <= 0:
+        raise ValueError("page_size and concurrency must be positive")
+    page = fetch_page(1)
+    items = list(page[0])
+    p = 1
+    last = _last_page(page, page_size)
+    if last is not None:
+        executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="casdoor-pages")
+        futures = [executor.submit(fetch_page, number) for number in range(2, last + 1)]
+        try:
+            for future in futures:
+                page = future.result()
+                items.extend(page[0])
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+        p = last
+    while _has_next(page, p, page_size):
+        p += 1
+        page = fetch_page(p)
+        items.extend(page[0])
+    return items
+
+
+async def afetch_all_pages(
+    fetch_page: Callable[[int], Awaitable[Page]], page_size: int, concurrency: int = DEFAULT_CONCURRENCY
+) -> List[Dict]:
+    """
+    The asyncio version of fetch_all_pages: the pages after the first are
+    requested by tasks, at most concurrency at a time.
+
+    :param fetch_page: a coroutine function taking the 1-based page number
+    """
+    if page_size <= 0 or concurrency <= 0:
+        raise ValueError("page_size and concurrency must be positive")
+    page = await fetch_page(1)
+    items = list(page[0])
+    p = 1
+    last = _last_page(page, page_size)
+    if last is not None:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(number: int) -> Page:
+            async with semaphore:
+                return await fetch_page(number)
+
+        tasks = [asyncio.ensure_future(fetch(number)) for number in range(2, last + 1)]
+        try:
+            pages = await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+        for page in pages:
+            items.extend(page[0])
+        p = last
+    while _has_next(page, p, page_size):
+        p += 1
+        page = await fetch_page(p)
+        items.extend(page[0])
+    return items
+
+
+def _page_fetcher(sdk, path: str, params: Dict[str, str], page_size: int) -> Callable[[int], Page]:
+    url = sdk.endpoint + path
+
+    def fetch_page(p: int) -> Page:
+        query = dict(
+            params,
+            p=str(p),
+            pageSize=str(page_size),
+            clientId=sdk.client_id,
+            clientSecret=sdk.client_secret,
+        )
+        r = sdk.http_session.get(url, params=query)
+        return page_of(codec.loads(r.content))
+
+    return fetch_page
+
+
+def iter_entities(
+    sdk,
+    path: str,
+    cls,
+    params: Dict[str, str],
+    page_size: int = DEFAULT_PAGE_SIZE,
+    prefetch: bool = True,
+) -> Iterator:
+    """
+    Yield the entities of a list endpoint one page at a time, see iter_pages.
+
+    :param path: the API path, e.g. "/api/get-users"
+    :param cls: the entity class the items are built with
+    :param params: the endpoint's query parameters besides p, pageSize and
+        the client credentials
+    """
+    pages = iter_pages(_page_fetcher(sdk, path, params, page_size), page_size, prefetch)
+    try:
+        for items in pages:
+            for item in items:
+                yield cls.from_dict(item)
+    finally:
+        pages.close()
+
+
+def get_all_entities(
+    sdk,
+    path: str,
+    cls,
+    params: Dict[str, str],
+    page_size: int = DEFAULT_PAGE_SIZE,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> List:
+    """
+    Read all the entities of a list endpoint with parallel page requests, see
+    fetch_all_pages and iter_entities.
+    """
+    items = fetch_all_pages(_page_fetcher(sdk, path, params, page_size), page_size, concurrency)
+    return entity_list(sdk, cls, items)
@@ -12,10 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import json
-from typing import Dict, List
+from typing import Dict, Iterator, List
 
-import requests
+from . import codec
+from .entity_list import entity_list
+from .pagination import DEFAULT_CONCURRENCY, DEFAULT_PAGE_SIZE, get_all_entities, iter_entities
+from .schema import schema_of
 
 
 class Payment:
@@ -62,17 +64,13 @@ class Payment:
     def from_dict(cls, data: dict):
         if not data:
             return None
-        payment = cls()
-        for key, value in data.items():
-            if hasattr(payment, key):
-                setattr(payment, key, value)
-        return payment
+        return schema_of(cls).from_dict(data)
 
     def __str__(self):
         return str(self.__dict__)
 
     def to_dict(self) -> dict:
-        return self.__dict__
+        return dict(self.__dict__)
 
 
 class _PaymentSDK:
@@ -88,14 +86,37 @@ class _PaymentSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        r = requests.get(url, params)
-        response = r.json()
+        r = self.http_session.get(url, params=params)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
-        payments = []
-        for payment in response["data"]:
-            payments.append(Payment.from_dict(payment))
-        return payments
+        return entity_list(self, Payment, response["data"])
+
+    def iter_payments(self, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True) -> Iterator[Payment]:
+        """
+        Iterate over the payments from Casdoor one page at a time, without
+        holding the whole list in memory.
+
+        :param page_size: the number of payments requested per page
+        :param prefetch: request the next page in the background while the
+            current one is consumed
+        """
+        params = {"owner": self.org_name}
+        return iter_entities(self, "/api/get-payments", Payment, params, page_size, prefetch)
+
+    def get_all_payments(
+        self, page_size: int = DEFAULT_PAGE_SIZE, concurrency: int = DEFAULT_CONCURRENCY
+    ) -> List[Payment]:
+        """
+        Get all the payments from Casdoor with parallel page requests, for
+        large exports. Page 1 gives the total count, then the other pages are
+        requested concurrently and put back in order.
+
+        :param page_size: the number of payments requested per page
+        :param concurrency: the maximum number of pages requested at once
+        """
+        params = {"owner": self.org_name}
+        return get_all_entities(self, "/api/get-payments", Payment, params, page_size, concurrency)
 
     def get_payment(self, payment_id: str) -> Dict:
         """
@@ -110,8 +131,8 @@ class _PaymentSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        r = requests.get(url, params)
-        response = r.json()
+        r = self.http_session.get(url, params=params)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
         return Payment.from_dict(response["data"])
@@ -124,9 +145,9 @@ class _PaymentSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        payment_info = json.dumps(payment.to_dict())
-        r = requests.post(url, params=params, data=payment_info)
-        response = r.json()
+        payment_info = codec.dumps(payment.to_dict())
+        r = self.http_session.post(url, params=params, data=payment_info)
+        response = codec.loads(r.content)
         return response
 
     def add_payment(self, payment: Payment) -> Dict:
@@ -12,10 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import json
-from typing import Dict, List
+from typing import Dict, Iterator, List
 
-import requests
+from . import codec
+from .entity_cache import read_through
+from .entity_list import entity_list
+from .pagination import DEFAULT_PAGE_SIZE, iter_entities
+from .schema import schema_of
 
 
 class Permission:
@@ -79,17 +82,13 @@ class Permission:
     def from_dict(cls, data: dict):
         if not data:
             return None
-        permission = cls()
-        for key, value in data.items():
-            if hasattr(permission, key):
-                setattr(permission, key, value)
-        return permission
+        return schema_of(cls).from_dict(data)
 
     def __str__(self):
         return str(self.__dict__)
 
     def to_dict(self) -> dict:
-        return self.__dict__
+        return dict(self.__dict__)
 
 
 class _PermissionSDK:
@@ -105,14 +104,23 @@ class _PermissionSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        r = requests.get(url, params)
-        response = r.json()
+        r = self.http_session.get(url, params=params)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
-        permissions = []
-        for permission in response["data"]:
-            permissions.append(Permission.from_dict(permission))
-        return permissions
+        return entity_list(self, Permission, response["data"])
+
+    def iter_permissions(self, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True) -> Iterator[Permission]:
+        """
+        Iterate over the permissions from Casdoor one page at a time, without
+        holding the whole list in memory.
+
+        :param page_size: the number of permissions requested per page
+        :param prefetch: request the next page in the background while the
+            current one is consumed
+        """
+        params = {"owner": self.org_name}
+        return iter_entities(self, "/api/get-permissions", Permission, params, page_size, prefetch)
 
     def get_permission(self, permission_id: str) -> Dict:
         """
@@ -127,11 +135,15 @@ class _PermissionSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        r = requests.get(url, params)
-        response = r.json()
-        if response["status"] != "ok":
-            raise Exception(response["msg"])
-        return Permission.from_dict(response["data"])
+
+        def fetch():
+            r = self.http_session.get(url, params=params)
+            response = codec.loads(r.content)
+            if response["status"] != "ok":
+                raise Exception(response["msg"])
+            return response["data"]
+
+        return Permission.from_dict(read_through(self, "permission", "id:" + params["id"], fetch))
 
     def modify_permission(self, method: str, permission: Permission) -> Dict:
         url = self.endpoint + f"/api/{method}"
@@ -141,9 +153,15 @@ class _PermissionSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        permission_info = json.dumps(permission.to_dict())
-        r = requests.post(url, params=params, data=permission_info)
-        response = r.json()
+        permission_info = codec.dumps(permission.to_dict())
+        r = self.http_session.post(url, params=params, data=permission_info)
+        if getattr(self, "entity_cache", None) is not None:
+            self.entity_cache.invalidate("permission", params["id"])
+        response = codec.loads(r.content)
+        if getattr(self, "decision_cache", None) is not None:
+            # decisions cached under any selector (model, owner, enforcer)
+            # may depend on it, so none of them can be trusted anymore
+            self.decision_cache.clear()
         if response["status"] != "ok":
             raise Exception(response["msg"])
         return str(response["data"])
@@ -12,10 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import json
-from typing import Dict, List
+from typing import Dict, Iterator, List
 
-import requests
+from . import codec
+from .entity_list import entity_list
+from .pagination import DEFAULT_PAGE_SIZE, iter_entities
+from .schema import schema_of
 
 
 class Plan:
@@ -47,17 +49,13 @@ class Plan:
         if data is None:
             return None
 
-        plan = cls()
-        for key, value in data.items():
-            if hasattr(plan, key):
-                setattr(plan, key, value)
-        return plan
+        return schema_of(cls).from_dict(data)
 
     def __str__(self):
         return str(self.__dict__)
 
     def to_dict(self) -> dict:
-        return self.__dict__
+        return dict(self.__dict__)
 
 
 class _PlanSDK:
@@ -73,14 +71,23 @@ class _PlanSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        r = requests.get(url, params)
-        response = r.json()
+        r = self.http_session.get(url, params=params)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
-        plans = []
-        for plan in response["data"]:
-            plans.append(Plan.from_dict(plan))
-        return plans
+        return entity_list(self, Plan, response["data"])
+
+    def iter_plans(self, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True) -> Iterator[Plan]:
+        """
+        Iterate over the plans from Casdoor one page at a time, without
+        holding the whole list in memory.
+
+        :param page_size: the number of plans requested per page
+        :param prefetch: request the next page in the background while the
+            current one is consumed
+        """
+        params = {"owner": self.org_name}
+        return iter_entities(self, "/api/get-plans", Plan, params, page_size, prefetch)
 
     def get_plan(self, plan_id: str) -> Dict:
         """
@@ -95,8 +102,8 @@ class _PlanSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        r = requests.get(url, params)
-        response = r.json()
+        r = self.http_session.get(url, params=params)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
 
@@ -110,9 +117,9 @@ class _PlanSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        plan_info = json.dumps(plan.to_dict())
-        r = requests.post(url, params=params, data=plan_info)
-        response = r.json()
+        plan_info = codec.dumps(plan.to_dict())
+        r = self.http_session.post(url, params=params, data=plan_info)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
         return response
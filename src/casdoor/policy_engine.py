@@ -0,0 +1,265 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import re
+from types import SimpleNamespace
+from typing import Dict, Iterable, List, Optional
+
+from .matcher import bind_matcher, compile_matcher, matcher_expression
+from .policy_index import PolicyIndex
+
+_SECTIONS = {
+    "request_definition": "r",
+    "policy_definition": "p",
+    "role_definition": "g",
+    "policy_effect": "e",
+    "matchers": "m",
+}
+
+ALLOW_OVERRIDE = "some(where(p.eft==allow))"
+DENY_OVERRIDE = "!some(where(p.eft==deny))"
+ALLOW_AND_DENY = "some(where(p.eft==allow))&&!some(where(p.eft==deny))"
+PRIORITY = "priority(p.eft)||deny"
+_EFFECTS = (ALLOW_OVERRIDE, DENY_OVERRIDE, ALLOW_AND_DENY, PRIORITY)
+
+
+def parse_model_text(model_text: str) -> Dict[str, Dict[str, str]]:
+    """
+    Parse the text of a Casbin model, i.e. Model.modelText.
+
+    :return: {"r": {"r": "sub, obj, act"}, "p": {...}, "g": {...}, "e": {...}, "m": {...}}
+    """
+    sections = {}
+    section = None
+    pending = ""
+    for raw_line in model_text.splitlines():
+        line = raw_line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        if line.endswith("\\"):
+            pending += line[:-1].strip() + " "
+            continue
+        line, pending = pending + line, ""
+        if line.startswith("[") and line.endswith("]"):
+            section = _SECTIONS.get(line[1:-1].strip())
+            if section is None:
+                raise ValueError(f"unknown model section {line}")
+            sections.setdefault(section, {})
+            continue
+        if section is None or "=" not in line:
+            raise ValueError(f"invalid model line {raw_line!r}")
+        key, value = line.split("=", 1)
+        sections[section][key.strip()] = value.strip()
+
+    for section in ("r", "p", "e", "m"):
+        if section not in sections or section not in sections[section]:
+            raise ValueError(f"model is missing {section} = ... in [{_section_name(section)}]")
+    return sections
+
+
+def _section_name(key: str) -> str:
+    return next(name for name, section in _SECTIONS.items() if section == key)
+
+
+def _tokens(definition: str) -> List[str]:
+    return [token.strip() for token in definition.split(",") if token.strip()]
+
+
+class _RoleLinks:
+    """
+    The g (or g2, ...) rules of an enforcer: has_link(name, role, domain) is
+    True when name inherits role, directly or transitively, in domain.
+    """
+
+    def __init__(self, rules: Iterable[List[str]]):
+        self._roles = {}
+        for rule in rules:
+            domain = rule[2] if len(rule) > 2 else ""
+            self._roles.setdefault((rule[0], domain), []).append(rule[1])
+        self._reachable = {}
+
+    def roles(self, name: str, domain: str = "") -> set:
+        """
+        The roles name inherits in domain, directly or transitively.
+        """
+        key = (name, domain)
+        reachable = self._reachable.get(key)
+        if reachable is None:
+            reachable = set()
+            stack = list(self._roles.get(key, ()))
+            while stack:
+                current = stack.pop()
+                if current not in reachable:
+                    reachable.add(current)
+                    stack.extend(self._roles.get((current, domain), ()))
+            self._reachable[key] = reachable
+        return reachable
+
+    def has_link(self, name: str, role: str, domain: str = "") -> bool:
+        return name == role or role in self.roles(name, domain)
+
+
+def _wrap_value(value):
+    # ABAC matchers read request attributes, e.g. r.sub.Owner
+    if isinstance(value, dict):
+        return SimpleNamespace(**{key: _wrap_value(item) for key, item in value.items()})
+    return value
+
+
+class LocalEnforcer:
+    """
+    Evaluates a Casdoor model in process, with the same semantics as the
+    server's enforce API: the request and policy definitions, g role rules,
+    and the allow-override, deny-override, allow-and-deny and priority
+    effects.
+    """
+
+    def __init__(
+        self,
+        model_text: str,
+        policies: Optional[List[List[str]]] = None,
+        grouping_policies: Optional[Dict[str, List[List[str]]]] = None,
+        model_id: str = "",
+        use_index: bool = True,
+    ):
+        """
+        :param model_text: the Casbin model, i.e. Model.modelText
+        :param policies: the p rules, positionally matching the policy definition
+        :param grouping_policies: the rules of each role definition, e.g. {"g": [[user, role]]}
+        :param model_id: the model id, used to cache the compiled matcher
+        :param use_index: whether to index the policies by the fields the matcher compares
+        """
+        sections = parse_model_text(model_text)
+        self.request_tokens = ["r_" + token for token in _tokens(sections["r"]["r"])]
+        self.policy_tokens = ["p_" + token for token in _tokens(sections["p"]["p"])]
+        self._eft_index = self.policy_tokens.index("p_eft") if "p_eft" in self.policy_tokens else None
+
+        self.effect = re.sub(r"\s+", "", sections["e"]["e"])
+        if self.effect not in _EFFECTS:
+            raise ValueError(f"unsupported policy effect {sections['e']['e']!r}")
+
+        grouping_policies = grouping_policies or {}
+        role_links = {name: _RoleLinks(grouping_policies.get(name, ())) for name in sections.get("g", {})}
+        role_functions = {name: links.has_link for name, links in role_links.items()}
+        code = compile_matcher(sections["m"]["m"], self.request_tokens, self.policy_tokens, role_functions, model_id)
+        self._match = bind_matcher(code, role_functions)
+
+        size = len(self.policy_tokens)
+        self.policies = [(list(policy) + [""] * size)[:size] for policy in policies or ()]
+        if "p_priority" in self.policy_tokens:
+            index = self.policy_tokens.index("p_priority")
+            self.policies.sort(key=lambda policy: int(policy[index] or 0))
+
+        self._index = None
+        if use_index:
+            expression = matcher_expression(sections["m"]["m"], self.request_tokens, self.policy_tokens, role_links)
+            self._index = PolicyIndex(expression, self.policies, role_links)
+
+    @classmethod
+    def from_permissions(
+        cls, model_text: str, permissions: Iterable, roles: Iterable = (), model_id: str = "", use_index: bool = True
+    ):
+        """
+        Build an enforcer from Casdoor permissions and roles, generating the
+        p and g rules the way the server does.
+
+        :param model_text: the text of the permissions' model
+        :param permissions: Permission objects; disabled ones are skipped
+        :param roles: Role objects, used to expand the permissions' roles
+        :param model_id: the model id, used to cache the compiled matcher
+        :param use_index: whether to index the policies by the fields the matcher compares
+        """
+        roles_by_id = {f"{role.owner}/{role.name}": role for role in roles}
+        policies = []
+        grouping = []
+        for permission in permissions:
+            if not permission.isEnabled:
+                continue
+            policies.extend(_get_policies(permission))
+            grouping.extend(_get_grouping_policies(permission, roles_by_id))
+        return cls(model_text, policies, {"g": grouping}, model_id, use_index)
+
+    def enforce(self, casbin_request: List) -> bool:
+        """
+        Decide a request locally.
+
+        :param casbin_request: the request data (i.e. sub, obj, act)
+        :return: a boolean value indicating whether the request is allowed
+        """
+        if len(casbin_request) != len(self.request_tokens):
+            raise ValueError(f"invalid request size: expected {len(self.request_tokens)}, got {len(casbin_request)}")
+        request = [_wrap_value(value) for value in casbin_request]
+        match = self._match
+
+        allowed = False
+        policies = self._index.candidates(request) if self._index is not None else self.policies
+        for policy in policies:
+            if not match(request, policy):
+                continue
+            eft = policy[self._eft_index] if self._eft_index is not None else "allow"
+            if eft == "allow":
+                if self.effect in (ALLOW_OVERRIDE, PRIORITY):
+                    return True
+                allowed = True
+            elif eft == "deny":
+                if self.effect != ALLOW_OVERRIDE:
+                    return False
+        if self.effect == DENY_OVERRIDE:
+            return True
+        return allowed and self.effect == ALLOW_AND_DENY
+
+    def batch_enforce(self, casbin_requests: List[List]) -> List[bool]:
+        return [self.enforce(casbin_request) for casbin_request in casbin_requests]
+
+
+def _get_policies(permission) -> List[List[str]]:
+    """
+    The p rules of a permission: one per subject, (domain,) resource and
+    action, with the effect and the permission id in the trailing columns.
+    """
+    permission_id = f"{permission.owner}/{permission.name}"
+    effect = (permission.effect or "").lower()
+    policies = []
+    for subject in list(permission.users or ()) + list(permission.roles or ()):
+        for resource in permission.resources or ():
+            for action in permission.actions or ():
+                if permission.domains:
+                    for domain in permission.domains:
+                        policies.append([subject, domain, resource, action.lower(), effect, permission_id])
+                else:
+                    policies.append([subject, resource, action.lower(), effect, "", permission_id])
+    return policies
+
+
+def _get_grouping_policies(permission, roles_by_id: Dict) -> List[List[str]]:
+    """
+    The g rules of a permission: its roles' users and sub-roles, following
+    nested roles transitively.
+    """
+    rules = []
+    visited = set()
+    stack = list(permission.roles or ())
+    while stack:
+        role_id = stack.pop()
+        role = roles_by_id.get(role_id)
+        if role is None or role_id in visited:
+            continue
+        visited.add(role_id)
+        for member in list(role.users or ()) + list(role.roles or ()):
+            if permission.domains:
+                rules.extend([member, role_id, domain] for domain in permission.domains)
+            else:
+                rules.append([member, role_id])
+        stack.extend(role.roles or ())
+    return rules
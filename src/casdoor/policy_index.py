@@ -0,0 +1,208 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import ast
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .matcher import _key_match2_regex, _key_match3_regex
+
+_REGEX_SPECIAL = set(".^$*+?()[]{}|\\")
+_GLOB_SPECIAL = set("*?[\\")
+
+
+def _literal_prefix(regex: str) -> Tuple[bool, str]:
+    """
+    Split a regular expression into (is_exact, literal prefix): the text
+    every match starts with, and whether the expression matches nothing
+    but that text.
+    """
+    if "|" in regex or not regex.startswith("^"):
+        return False, ""
+    body = regex[1:]
+    anchored = body.endswith("$") and not body.endswith("\\$")
+    if anchored:
+        body = body[:-1]
+    i = 0
+    while i < len(body) and body[i] not in _REGEX_SPECIAL:
+        i += 1
+    if i == len(body):
+        return anchored, body
+    if body[i] in "?*{":
+        # the last literal character is optional
+        i -= 1
+    return False, body[: max(i, 0)]
+
+
+def _pattern_key(function: str, pattern: str) -> Tuple[bool, str]:
+    if function == "keyMatch":
+        star = pattern.find("*")
+        return (True, pattern) if star == -1 else (False, pattern[:star])
+    if function == "globMatch":
+        for i, c in enumerate(pattern):
+            if c in _GLOB_SPECIAL:
+                return False, pattern[:i]
+        return True, pattern
+    if function == "keyMatch2":
+        return _literal_prefix(_key_match2_regex(pattern).pattern)
+    if function == "keyMatch3":
+        return _literal_prefix(_key_match3_regex(pattern).pattern)
+    return _literal_prefix(pattern)
+
+
+_PATTERN_FUNCTIONS = ("keyMatch", "keyMatch2", "keyMatch3", "regexMatch", "globMatch")
+
+
+def _position(node, name: str) -> Optional[int]:
+    # r[0] parses as Subscript(Name("r"), Constant(0)), or Index(Num(0)) before Python 3.9
+    if isinstance(node, ast.Subscript) and isinstance(node.value, ast.Name) and node.value.id == name:
+        index = node.slice
+        if type(index).__name__ == "Index":
+            index = index.value
+        value = getattr(index, "value", getattr(index, "n", None))
+        if isinstance(value, int):
+            return value
+    return None
+
+
+def _conjuncts(node) -> List:
+    if isinstance(node, ast.BoolOp) and isinstance(node.op, ast.And):
+        return [conjunct for value in node.values for conjunct in _conjuncts(value)]
+    return [node]
+
+
+class _FieldIndex:
+    """
+    The buckets of one policy field: literal values, patterns matching
+    anything (wildcards) and other patterns by their literal prefix.
+    """
+
+    def __init__(self, policies: List[List[str]], field: int, kind: str, request_field: int, domain_field=None):
+        self.kind = kind
+        self.request_field = request_field
+        self.domain_field = domain_field
+        self.exact: Dict[str, List[int]] = {}
+        self.wildcard: List[int] = []
+        self.patterns: Dict[str, List[int]] = {}
+        for i, policy in enumerate(policies):
+            value = policy[field]
+            if kind in _PATTERN_FUNCTIONS:
+                exact, value = _pattern_key(kind, value)
+                if not exact:
+                    if value:
+                        self.patterns.setdefault(value, []).append(i)
+                    else:
+                        self.wildcard.append(i)
+                    continue
+            self.exact.setdefault(value, []).append(i)
+        self._prefix_lengths = sorted({len(prefix) for prefix in self.patterns})
+
+    def candidates(self, request: Sequence, role_links) -> Optional[List[List[int]]]:
+        """
+        :return: the buckets holding every policy this field may match, or
+                 None when the request value can't be looked up
+        """
+        value = request[self.request_field]
+        if not isinstance(value, str):
+            return None
+        if self.kind == "==":
+            return [self.exact.get(value, [])]
+        if self.kind in _PATTERN_FUNCTIONS:
+            buckets = [self.exact.get(value, []), self.wildcard]
+            for length in self._prefix_lengths:
+                if length > len(value):
+                    break
+                bucket = self.patterns.get(value[:length])
+                if bucket:
+                    buckets.append(bucket)
+            return buckets
+
+        domain = ""
+        if self.domain_field is not None:
+            domain = request[self.domain_field]
+            if not isinstance(domain, str):
+                return None
+        names = {value} | role_links[self.kind].roles(value, domain)
+        return [self.exact[name] for name in names if name in self.exact]
+
+
+class PolicyIndex:
+    """
+    Narrows the policies a request has to be matched against.
+
+    Each top-level && clause of the matcher comparing a policy field to a
+    request field, i.e. r.obj == p.obj, g(r.sub, p.sub[, r.dom]) or
+    keyMatch2(r.obj, p.obj) and the other pattern functions, gets a field
+    index. A lookup picks the field with the fewest candidates and returns
+    them in policy order; the matcher still decides every candidate, so the
+    index never changes a decision.
+    """
+
+    def __init__(self, expression: str, policies: List[List[str]], role_links: Dict):
+        """
+        :param expression: the matcher translated by matcher_expression
+        :param policies: the policies, in the order they are evaluated
+        :param role_links: the role links of each role definition
+        """
+        self.policies = policies
+        self.role_links = role_links
+        self.fields: List[_FieldIndex] = []
+        for conjunct in _conjuncts(ast.parse(expression, mode="eval").body):
+            spec = self._field_spec(conjunct)
+            if spec is not None:
+                self.fields.append(_FieldIndex(policies, *spec))
+
+    def _field_spec(self, node):
+        if isinstance(node, ast.Compare) and len(node.ops) == 1 and isinstance(node.ops[0], ast.Eq):
+            left, right = node.left, node.comparators[0]
+            for a, b in ((left, right), (right, left)):
+                if _position(a, "r") is not None and _position(b, "p") is not None:
+                    return _position(b, "p"), "==", _position(a, "r")
+            return None
+        if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and len(node.args) >= 2):
+            return None
+        name = node.func.id
+        request_field, field = _position(node.args[0], "r"), _position(node.args[1], "p")
+        if request_field is None or field is None:
+            return None
+        if name in _PATTERN_FUNCTIONS and len(node.args) == 2:
+            return field, name, request_field
+        if name in self.role_links:
+            if len(node.args) == 2:
+                return field, name, request_field
+            domain_field = _position(node.args[2], "r")
+            if len(node.args) == 3 and domain_field is not None:
+                return field, name, request_field, domain_field
+        return None
+
+    def candidates(self, request: Sequence) -> Sequence[List[str]]:
+        """
+        :param request: the request values
+        :return: the policies the request may match, in policy order
+        """
+        best = None
+        best_size = len(self.policies)
+        for field in self.fields:
+            buckets = field.candidates(request, self.role_links)
+            if buckets is None:
+                continue
+            size = sum(len(bucket) for bucket in buckets)
+            if size < best_size:
+                best, best_size = buckets, size
+        if best is None:
+            return self.policies
+        if len(best) == 1:
+            indexes = best[0]
+        else:
+            indexes = sorted(i for bucket in best for i in bucket)
+        return [self.policies[i] for i in indexes]
@@ -12,10 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import json
-from typing import Dict, List
+from typing import Dict, Iterator, List
 
-import requests
+from . import codec
+from .entity_list import entity_list
+from .pagination import DEFAULT_PAGE_SIZE, iter_entities
+from .schema import schema_of
 
 
 class Pricing:
@@ -50,17 +52,13 @@ class Pricing:
         if data is None:
             return None
 
-        pricing = cls()
-        for key, value in data.items():
-            if hasattr(pricing, key):
-                setattr(pricing, key, value)
-        return pricing
+        return schema_of(cls).from_dict(data)
 
     def __str__(self):
         return str(self.__dict__)
 
     def to_dict(self) -> dict:
-        return self.__dict__
+        return dict(self.__dict__)
 
 
 class _PricingSDK:
@@ -76,14 +74,23 @@ class _PricingSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        r = requests.get(url, params)
-        response = r.json()
+        r = self.http_session.get(url, params=params)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
-        pricings = []
-        for pricing in response["data"]:
-            pricings.append(Pricing.from_dict(pricing))
-        return pricings
+        return entity_list(self, Pricing, response["data"])
+
+    def iter_pricings(self, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True) -> Iterator[Pricing]:
+        """
+        Iterate over the pricings from Casdoor one page at a time, without
+        holding the whole list in memory.
+
+        :param page_size: the number of pricings requested per page
+        :param prefetch: request the next page in the background while the
+            current one is consumed
+        """
+        params = {"owner": self.org_name}
+        return iter_entities(self, "/api/get-pricings", Pricing, params, page_size, prefetch)
 
     def get_pricing(self, pricing_id: str) -> Dict:
         """
@@ -98,8 +105,8 @@ class _PricingSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        r = requests.get(url, params)
-        response = r.json()
+        r = self.http_session.get(url, params=params)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
 
@@ -113,9 +120,9 @@ class _PricingSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        pricing_info = json.dumps(pricing.to_dict())
-        r = requests.post(url, params=params, data=pricing_info)
-        response = r.json()
+        pricing_info = codec.dumps(pricing.to_dict())
+        r = self.http_session.post(url, params=params, data=pricing_info)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
         return response
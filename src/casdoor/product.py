@@ -12,12 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import json
-from typing import Dict, List
-
-import requests
+from typing import Dict, Iterator, List
 
+from . import codec
+from .entity_list import entity_list
+from .pagination import DEFAULT_PAGE_SIZE, iter_entities
 from .provider import Provider
+from .schema import schema_of
 
 
 class Product:
@@ -59,17 +60,13 @@ class Product:
         if data is None:
             return None
 
-        product = cls()
-        for key, value in data.items():
-            if hasattr(product, key):
-                setattr(product, key, value)
-        return product
+        return schema_of(cls).from_dict(data)
 
     def __str__(self):
         return str(self.__dict__)
 
     def to_dict(self) -> dict:
-        return self.__dict__
+        return dict(self.__dict__)
 
 
 class _ProductSDK:
@@ -85,14 +82,23 @@ class _ProductSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        r = requests.get(url, params)
-        response = r.json()
+        r = self.http_session.get(url, params=params)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
-        products = []
-        for product in response["data"]:
-            products.append(Product.from_dict(product))
-        return products
+        return entity_list(self, Product, response["data"])
+
+    def iter_products(self, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True) -> Iterator[Product]:
+        """
+        Iterate over the products from Casdoor one page at a time, without
+        holding the whole list in memory.
+
+        :param page_size: the number of products requested per page
+        :param prefetch: request the next page in the background while the
+            current one is consumed
+        """
+        params = {"owner": self.org_name}
+        return iter_entities(self, "/api/get-products", Product, params, page_size, prefetch)
 
     def get_product(self, product_id: str) -> Dict:
         """
@@ -107,8 +113,8 @@ class _ProductSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        r = requests.get(url, params)
-        response = r.json()
+        r = self.http_session.get(url, params=params)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
 
@@ -122,9 +128,9 @@ class _ProductSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        product_info = json.dumps(product.to_dict(), default=self.custom_encoder)
-        r = requests.post(url, params=params, data=product_info)
-        response = r.json()
+        product_info = codec.dumps(product.to_dict(), default=self.custom_encoder)
+        r = self.http_session.post(url, params=params, data=product_info)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
         return response
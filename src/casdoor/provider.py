@@ -12,10 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import json
-from typing import Dict, List
+from typing import Dict, Iterator, List
 
-import requests
+from . import codec
+from .entity_list import entity_list
+from .pagination import DEFAULT_PAGE_SIZE, iter_entities
+from .schema import schema_of
 
 
 class Provider:
@@ -75,17 +77,13 @@ class Provider:
     def from_dict(cls, d: dict):
         if not d:
             return None
-        provider = cls()
-        for key, value in d.items():
-            if hasattr(provider, key):
-                setattr(provider, key, value)
-        return provider
+        return schema_of(cls).from_dict(d)
 
     def __str__(self):
         return str(self.__dict__)
 
     def to_dict(self) -> dict:
-        return self.__dict__
+        return dict(self.__dict__)
 
 
 class _ProviderSDK:
@@ -101,14 +99,23 @@ class _ProviderSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        r = requests.get(url, params)
-        response = r.json()
+        r = self.http_session.get(url, params=params)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
-        providers = []
-        for provider in response["data"]:
-            providers.append(Provider.from_dict(provider))
-        return providers
+        return entity_list(self, Provider, response["data"])
+
+    def iter_providers(self, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True) -> Iterator[Provider]:
+        """
+        Iterate over the providers from Casdoor one page at a time, without
+        holding the whole list in memory.
+
+        :param page_size: the number of providers requested per page
+        :param prefetch: request the next page in the background while the
+            current one is consumed
+        """
+        params = {"owner": self.org_name}
+        return iter_entities(self, "/api/get-providers", Provider, params, page_size, prefetch)
 
     def get_provider(self, provider_id: str) -> Provider:
         """
@@ -123,8 +130,8 @@ class _ProviderSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        r = requests.get(url, params)
-        response = r.json()
+        r = self.http_session.get(url, params=params)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
 
@@ -138,9 +145,9 @@ class _ProviderSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        provider_info = json.dumps(provider.to_dict())
-        r = requests.post(url, params=params, data=provider_info)
-        response = r.json()
+        provider_info = codec.dumps(provider.to_dict())
+        r = self.http_session.post(url, params=params, data=provider_info)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
         return response
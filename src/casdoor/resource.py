@@ -12,10 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import json
-from typing import Dict, List
+from typing import Dict, Iterator, List
 
-import requests
+from . import codec
+from .entity_list import entity_list
+from .pagination import DEFAULT_PAGE_SIZE, iter_entities
+from .schema import schema_of
 
 
 class Resource:
@@ -46,16 +48,15 @@ class Resource:
     def from_dict(cls, data: dict):
         if data is None:
             return None
-        resource = cls()
-        for key, value in data.items():
-            setattr(resource, key, value)
+        resource = schema_of(cls).new()
+        resource.__dict__.update(data)
         return resource
 
     def __str__(self):
         return str(self.__dict__)
 
     def to_dict(self) -> dict:
-        return self.__dict__
+        return dict(self.__dict__)
 
 
 class _ResourceSDK:
@@ -76,14 +77,40 @@ class _ResourceSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        r = requests.get(url, params)
-        response = r.json()
+        r = self.http_session.get(url, params=params)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
-        resources = []
-        for resource in response["data"]:
-            resources.append(Resource.from_dict(resource))
-        return resources
+        return entity_list(self, Resource, response["data"])
+
+    def iter_resources(
+        self,
+        owner,
+        user,
+        field,
+        value,
+        sort_field,
+        sort_order,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> Iterator[Resource]:
+        """
+        Iterate over the resources from Casdoor one page at a time, with the
+        filters of get_resources.
+
+        :param page_size: the number of resources requested per page
+        :param prefetch: request the next page in the background while the
+            current one is consumed
+        """
+        params = {
+            "owner": owner,
+            "user": user,
+            "field": field,
+            "value": value,
+            "sortField": sort_field,
+            "sortOrder": sort_order,
+        }
+        return iter_entities(self, "/api/get-resources", Resource, params, page_size, prefetch)
 
     def get_resource(self, resource_id: str) -> Dict:
         """
@@ -98,8 +125,8 @@ class _ResourceSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        r = requests.get(url, params)
-        response = r.json()
+        r = self.http_session.get(url, params=params)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
 
@@ -113,9 +140,9 @@ class _ResourceSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        resource_info = json.dumps(resource.to_dict())
-        r = requests.post(url, params=params, data=resource_info)
-        response = r.json()
+        resource_info = codec.dumps(resource.to_dict())
+        r = self.http_session.post(url, params=params, data=resource_info)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
         return response
@@ -142,15 +169,15 @@ class _ResourceSDK:
         }
 
         files = {"file": file}
-        r = requests.post(url, params=params, files=files)
-        response = r.json()
+        r = self.http_session.post(url, params=params, files=files)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
         return response
 
     def delete_resource(self, name) -> Dict:
         resource = Resource.new(self.org_name, name)
-        user_str = json.dumps(resource.to_dict())
+        user_str = codec.dumps(resource.to_dict())
         url = self.endpoint + "/api/delete-resource"
         params = {
             "owner": self.org_name,
@@ -158,8 +185,8 @@ class _ResourceSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        r = requests.post(url, params=params, data=user_str)
-        response = r.json()
+        r = self.http_session.post(url, params=params, data=user_str)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
         return response
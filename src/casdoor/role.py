@@ -12,10 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import json
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator, List, Optional
 
-import requests
+from . import codec
+from .entity_cache import read_through
+from .entity_list import entity_list
+from .pagination import DEFAULT_PAGE_SIZE, iter_entities
+from .role_graph import RoleGraph
+from .schema import schema_of
 
 
 class Role:
@@ -45,17 +49,29 @@ class Role:
         if data is None:
             return None
 
-        role = cls()
-        for key, value in data.items():
-            if hasattr(role, key):
-                setattr(role, key, value)
-        return role
+        return schema_of(cls).from_dict(data)
 
     def __str__(self):
         return str(self.__dict__)
 
     def to_dict(self) -> dict:
-        return self.__dict__
+        return dict(self.__dict__)
+
+
+def _merge_role_users(users: Optional[List[str]], add: List[str], remove: List[str]) -> Optional[List[str]]:
+    """
+    Apply a membership change to a role's users list.
+
+    :return: the new users list, or None when users already reflects the change
+    """
+    current = [user for user in users or () if user]
+    present = set(current)
+    if all(user in present for user in add) and not any(user in present for user in remove):
+        return None
+    removed = set(remove)
+    merged = [user for user in current if user not in removed]
+    merged.extend(user for user in add if user not in present)
+    return merged
 
 
 class _RoleSDK:
@@ -71,33 +87,47 @@ class _RoleSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        r = requests.get(url, params)
-        response = r.json()
+        r = self.http_session.get(url, params=params)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
-        roles = []
-        for role in response["data"]:
-            roles.append(Role.from_dict(role))
-        return roles
+        return entity_list(self, Role, response["data"])
 
-    def get_role(self, role_id: str) -> Dict:
+    def iter_roles(self, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True) -> Iterator[Role]:
         """
-        Get the role from Casdoor providing the role_id.
+        Iterate over the roles from Casdoor one page at a time, without
+        holding the whole list in memory.
 
-        :param role_id: the id of the role
-        :return: a dict that contains role's info
+        :param page_size: the number of roles requested per page
+        :param prefetch: request the next page in the background while the
+            current one is consumed
         """
+        params = {"owner": self.org_name}
+        return iter_entities(self, "/api/get-roles", Role, params, page_size, prefetch)
+
+    def _fetch_role(self, role_id: str) -> Optional[Dict]:
+        # bypasses the entity cache, for the read-modify-write paths below
         url = self.endpoint + "/api/get-role"
         params = {
             "id": f"{self.org_name}/{role_id}",
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        r = requests.get(url, params)
-        response = r.json()
+        r = self.http_session.get(url, params=params)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
-        return Role.from_dict(response["data"])
+        return response["data"]
+
+    def get_role(self, role_id: str) -> Dict:
+        """
+        Get the role from Casdoor providing the role_id.
+
+        :param role_id: the id of the role
+        :return: a dict that contains role's info
+        """
+        data = read_through(self, "role", f"id:{self.org_name}/{role_id}", lambda: self._fetch_role(role_id))
+        return Role.from_dict(data)
 
     def modify_role(self, method: str, role: Role) -> Dict:
         url = self.endpoint + f"/api/{method}"
@@ -107,9 +137,16 @@ class _RoleSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        role_info = json.dumps(role.to_dict())
-        r = requests.post(url, params=params, data=role_info)
-        response = r.json()
+        role_info = codec.dumps(role.to_dict())
+        r = self.http_session.post(url, params=params, data=role_info)
+        if getattr(self, "entity_cache", None) is not None:
+            self.entity_cache.invalidate("role", params["id"])
+        if getattr(self, "role_graph", None) is not None:
+            self.role_graph.invalidate()
+        if getattr(self, "decision_cache", None) is not None:
+            # role membership and inheritance feed the g rules of every model
+            self.decision_cache.clear()
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
         return response
@@ -136,7 +173,7 @@ class _RoleSDK:
         """
         user_id = f"{self.org_name}/{username}"
 
-        role = self.get_role(role_name)
+        role = Role.from_dict(self._fetch_role(role_name))
         if role is None:
             raise Exception(f"Role {role_name} not found")
 
@@ -159,7 +196,7 @@ class _RoleSDK:
         """
         user_id = f"{self.org_name}/{username}"
 
-        role = self.get_role(role_name)
+        role = Role.from_dict(self._fetch_role(role_name))
         if role is None:
             raise Exception(f"Role {role_name} not found")
 
@@ -169,19 +206,69 @@ class _RoleSDK:
 
         return {"status": "ok", "msg": "User does not have this role"}
 
-    def get_user_roles(self, username: str) -> List[Role]:
+    def _change_role_users(self, role_name: str, add: List[str], remove: List[str], max_attempts: int) -> Dict:
+        # Casdoor has no conditional update, so a concurrent write of the role
+        # is detected by reading the role back and the change is retried
+        response = {"status": "ok", "msg": "Role users already up to date"}
+        for attempt in range(max_attempts + 1):
+            role = Role.from_dict(self._fetch_role(role_name))
+            if role is None:
+                raise Exception(f"Role {role_name} not found")
+            users = _merge_role_users(role.users, add, remove)
+            if users is None:
+                return response
+            if attempt == max_attempts:
+                break
+            role.users = users
+            response = self.update_role(role)
+        raise Exception(f"Role {role_name} was modified concurrently, its users are not up to date")
+
+    def assign_users_to_role(self, role_name: str, usernames: Iterable[str], max_attempts: int = 3) -> Dict:
+        """
+        Add users to a role with one read and one write, however many users
+        are added, instead of one get_role and update_role per user.
+
+        The role is read back to verify the change wasn't overwritten by a
+        concurrent update, and the change is applied again if it was.
+
+        :param role_name: the name of the role
+        :param usernames: the usernames to add
+        :param max_attempts: how many times to write the role before giving up
+        :return: response dict with status
+        """
+        user_ids = list(dict.fromkeys(f"{self.org_name}/{username}" for username in usernames))
+        return self._change_role_users(role_name, user_ids, [], max_attempts)
+
+    def remove_users_from_role(self, role_name: str, usernames: Iterable[str], max_attempts: int = 3) -> Dict:
+        """
+        Remove users from a role with one read and one write, verified like
+        assign_users_to_role.
+
+        :param role_name: the name of the role
+        :param usernames: the usernames to remove
+        :param max_attempts: how many times to write the role before giving up
+        :return: response dict with status
+        """
+        user_ids = [f"{self.org_name}/{username}" for username in usernames]
+        return self._change_role_users(role_name, [], user_ids, max_attempts)
+
+    def get_role_graph(self) -> RoleGraph:
+        """
+        Get a snapshot of the organization's roles with role inheritance
+        resolved, from self.role_graph when role_graph_ttl is set.
+
+        :return: a RoleGraph of Role objects
+        """
+        if getattr(self, "role_graph", None) is not None:
+            return self.role_graph.get()
+        return RoleGraph(self.get_roles())
+
+    def get_user_roles(self, username: str, inherited: bool = False) -> List[Role]:
         """
         Get all roles assigned to a user.
 
         :param username: the username to get roles for
+        :param inherited: whether to include the roles granted through sub-roles
         :return: list of Role objects assigned to the user
         """
-        user_id = f"{self.org_name}/{username}"
-        all_roles = self.get_roles()
-
-        user_roles = []
-        for role in all_roles:
-            if hasattr(role, "users") and role.users and user_id in role.users:
-                user_roles.append(role)
-
-        return user_roles
+        return self.get_role_graph().get_user_roles(f"{self.org_name}/{username}", inherited)
@@ -0,0 +1,274 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import threading
+import time
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional
+
+from .token_manager import _consume_exception
+
+
+def _field(role, name: str):
+    # Role objects from CasdoorSDK, plain dicts from AsyncCasdoorSDK
+    if isinstance(role, dict):
+        return role.get(name)
+    return getattr(role, name, None)
+
+
+class RoleGraph:
+    """
+    An immutable snapshot of an organization's roles with the transitive
+    closure of role inheritance and a user -> roles index precomputed.
+
+    A role lists its sub-roles in Role.roles and, as on the server, the
+    members of a sub-role inherit the role: if admin has editor as a
+    sub-role, editor's users are also admins. Domains are not considered.
+    """
+
+    def __init__(self, roles: Iterable):
+        """
+        :param roles: Role objects or role dicts, e.g. the result of get_roles()
+        """
+        self._roles: Dict[str, object] = {}
+        parents: Dict[str, List[str]] = {}
+        direct: Dict[str, List[str]] = {}
+        for role in roles:
+            role_id = f"{_field(role, 'owner')}/{_field(role, 'name')}"
+            self._roles[role_id] = role
+            for sub_role in _field(role, "roles") or ():
+                if sub_role:
+                    parents.setdefault(sub_role, []).append(role_id)
+            for user in _field(role, "users") or ():
+                if user:
+                    direct.setdefault(user, []).append(role_id)
+
+        self._inherited: Dict[str, FrozenSet[str]] = {}
+        for role_id in self._roles:
+            self._inherited[role_id] = self._closure(role_id, parents)
+        self._direct = {user: frozenset(role_ids) for user, role_ids in direct.items()}
+        self._effective: Dict[str, FrozenSet[str]] = {}
+        for user, role_ids in self._direct.items():
+            self._effective[user] = frozenset().union(*(self._inherited.get(r, (r,)) for r in role_ids))
+
+    def _closure(self, role_id: str, parents: Dict[str, List[str]]) -> FrozenSet[str]:
+        reachable = {role_id}
+        stack = [role_id]
+        while stack:
+            current = stack.pop()
+            for parent in parents.get(current, ()):
+                if parent in reachable:
+                    continue
+                known = self._inherited.get(parent)
+                if known is not None:
+                    reachable |= known
+                else:
+                    reachable.add(parent)
+                    stack.append(parent)
+        return frozenset(reachable)
+
+    def inherited_role_ids(self, role_id: str) -> FrozenSet[str]:
+        """
+        :param role_id: the role id, i.e. owner/name
+        :return: the ids of role_id and every role it grants
+        """
+        return self._inherited.get(role_id, frozenset((role_id,)))
+
+    def user_role_ids(self, user_id: str, inherited: bool = True) -> FrozenSet[str]:
+        """
+        :param user_id: the user id, i.e. owner/name
+        :param inherited: whether to include the roles granted through sub-roles
+        :return: the ids of the user's roles
+        """
+        index = self._effective if inherited else self._direct
+        return index.get(user_id, frozenset())
+
+    def has_role(self, user_id: str, role_id: str) -> bool:
+        return role_id in self._effective.get(user_id, ())
+
+    def get_user_roles(self, user_id: str, inherited: bool = True) -> List:
+        """
+        :param user_id: the user id, i.e. owner/name
+        :param inherited: whether to include the roles granted through sub-roles
+        :return: the user's roles in the order of the snapshot's roles
+        """
+        role_ids = self.user_role_ids(user_id, inherited)
+        return [role for role_id, role in self._roles.items() if role_id in role_ids]
+
+    def __len__(self) -> int:
+        return len(self._roles)
+
+
+class _Snapshot:
+    """
+    The current RoleGraph and its age, shared by the threaded and asyncio
+    refreshers.
+    """
+
+    def __init__(self, ttl: float, timer: Callable[[], float]):
+        self.ttl = ttl
+        self.timer = timer
+        self.graph: Optional[RoleGraph] = None
+        self.loaded_at = 0.0
+        self.refresh_count = 0
+        self.last_error = None
+        # bumped by invalidate(), so that a download started before a role
+        # change doesn't install its outdated roles
+        self.generation = 0
+
+    def is_fresh(self) -> bool:
+        return self.graph is not None and self.timer() - self.loaded_at < self.ttl
+
+    def store(self, roles: Iterable, generation: int) -> RoleGraph:
+        graph = RoleGraph(roles)
+        if generation == self.generation:
+            self.graph = graph
+            self.loaded_at = self.timer()
+            self.refresh_count += 1
+            self.last_error = None
+        return graph
+
+    def invalidate(self):
+        self.generation += 1
+        self.graph = None
+
+
+class RoleGraphRefresher:
+    """
+    Keeps a RoleGraph of a CasdoorSDK's organization no older than ttl
+    seconds.
+
+    The first call loads the graph; once stale, the current graph keeps
+    being served while a single background thread downloads the roles
+    again. invalidate() drops the graph, so that the next call waits for a
+    fresh one, e.g. after a role was changed.
+    """
+
+    def __init__(self, sdk, ttl: float = 60.0, timer: Callable[[], float] = time.monotonic):
+        """
+        :param sdk: the CasdoorSDK used to download the roles
+        :param ttl: how long, in seconds, a snapshot is considered fresh
+        :param timer: the monotonic clock used for ttl
+        """
+        self.sdk = sdk
+        self._snapshot = _Snapshot(ttl, timer)
+        self._refresh_thread = None
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+
+    @property
+    def refresh_count(self) -> int:
+        return self._snapshot.refresh_count
+
+    @property
+    def last_error(self) -> Optional[Exception]:
+        return self._snapshot.last_error
+
+    def refresh(self) -> RoleGraph:
+        """
+        Download the roles and replace the snapshot.
+        """
+        generation = self._snapshot.generation
+        return self._snapshot.store(self.sdk.get_roles(), generation)
+
+    def _run_refresh(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            self._snapshot.last_error = e
+        finally:
+            with self._lock:
+                self._refresh_thread = None
+
+    def _start_refresh(self):
+        with self._lock:
+            if self._refresh_thread is not None:
+                return
+            self._refresh_thread = threading.Thread(
+                target=self._run_refresh, name="casdoor-role-graph-refresh", daemon=True
+            )
+            self._refresh_thread.start()
+
+    def get(self) -> RoleGraph:
+        """
+        :return: the current snapshot, loading it if there is none
+        """
+        snapshot = self._snapshot
+        graph = snapshot.graph
+        if graph is None:
+            with self._load_lock:
+                graph = snapshot.graph
+                if graph is None:
+                    graph = self.refresh()
+                return graph
+        if not snapshot.is_fresh():
+            self._start_refresh()
+        return graph
+
+    def invalidate(self):
+        self._snapshot.invalidate()
+
+
+class AsyncRoleGraphRefresher:
+    """
+    Asyncio counterpart of RoleGraphRefresher for AsyncCasdoorSDK: a stale
+    graph is refreshed by a single background task.
+    """
+
+    def __init__(self, sdk, ttl: float = 60.0, timer: Callable[[], float] = time.monotonic):
+        self.sdk = sdk
+        self._snapshot = _Snapshot(ttl, timer)
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    @property
+    def refresh_count(self) -> int:
+        return self._snapshot.refresh_count
+
+    @property
+    def last_error(self) -> Optional[Exception]:
+        return self._snapshot.last_error
+
+    async def _refresh(self):
+        try:
+            generation = self._snapshot.generation
+            return self._snapshot.store(await self.sdk.get_roles(), generation)
+        except Exception as e:
+            self._snapshot.last_error = e
+            raise
+
+    def _start_refresh(self) -> asyncio.Task:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.ensure_future(self._refresh())
+            self._refresh_task.add_done_callback(_consume_exception)
+        return self._refresh_task
+
+    async def refresh(self) -> RoleGraph:
+        return await asyncio.shield(self._start_refresh())
+
+    async def get(self) -> RoleGraph:
+        """
+        :return: the current snapshot, loading it if there is none
+        """
+        snapshot = self._snapshot
+        graph = snapshot.graph
+        if graph is None:
+            return await self.refresh()
+        if not snapshot.is_fresh():
+            self._start_refresh()
+        return graph
+
+    def invalidate(self):
+        self._snapshot.invalidate()
+        # a download in flight is outdated, the next call starts a new one
+        self._refresh_task = None
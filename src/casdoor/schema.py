@@ -0,0 +1,112 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+from typing import Any, Callable, Dict, Optional, Tuple
+
+_IMMUTABLE = (str, int, float, bool, bytes, tuple, frozenset, type(None))
+# the key layouts remembered per class, far more than Casdoor versions return
+_MAX_PLANS = 64
+
+
+def _factory(default) -> Optional[Callable[[], Any]]:
+    """
+    :return: how to create a fresh copy of a mutable default value, or None
+             when the value can be shared by every instance
+    """
+    if isinstance(default, _IMMUTABLE):
+        return None
+    if isinstance(default, (list, dict)):
+        items = default.values() if isinstance(default, dict) else default
+        if all(isinstance(item, (_IMMUTABLE, type)) for item in items):
+            return default.copy
+    return lambda: copy.deepcopy(default)
+
+
+class EntitySchema:
+    """
+    The fields of an entity class and their default values, taken once from
+    an instance built by its __init__.
+
+    from_dict then builds instances without running __init__: the new
+    instance's __dict__ is filled with the defaults and the data, then the
+    unknown keys are removed and fresh copies of the missing mutable
+    defaults added, instead of a hasattr and a setattr per key. A class
+    whose __init__ computes a default per instance lists how in
+    _default_factories, e.g. {"startTime": lambda: ...}.
+    """
+
+    def __init__(self, cls):
+        self.cls = cls
+        self.defaults: Dict[str, Any] = dict(cls().__dict__)
+        self.fields = frozenset(self.defaults)
+        self._factories = {}
+        for name, default in self.defaults.items():
+            factory = _factory(default)
+            if factory is not None:
+                self._factories[name] = factory
+        # defaults __init__ computes per instance, e.g. the current time
+        self._factories.update(getattr(cls, "_default_factories", {}))
+        self._per_instance = frozenset(self._factories)
+        self._plans: Dict[tuple, Tuple[tuple, tuple]] = {}
+
+    def new(self):
+        """
+        :return: an instance with every field at its default value
+        """
+        entity = self.cls.__new__(self.cls)
+        values = entity.__dict__
+        values.update(self.defaults)
+        for name, factory in self._factories.items():
+            values[name] = factory()
+        return entity
+
+    def _plan(self, keys: tuple) -> Tuple[tuple, tuple]:
+        plan = self._plans.get(keys)
+        if plan is None:
+            if len(self._plans) >= _MAX_PLANS:
+                self._plans.clear()
+            plan = self._plans[keys] = (tuple(set(keys) - self.fields), tuple(self._per_instance.difference(keys)))
+        return plan
+
+    def from_dict(self, data: Dict[str, Any]):
+        """
+        :param data: the entity as returned by Casdoor; unknown keys are ignored
+        :return: an instance with the known fields of data set
+        """
+        # The elements of a list response share their keys, so the unknown
+        # keys and missing per-instance fields are worked out once per layout
+        unknown, missing = self._plan(tuple(data))
+        entity = self.cls.__new__(self.cls)
+        values = entity.__dict__
+        values.update(self.defaults)
+        values.update(data)
+        for name in unknown:
+            del values[name]
+        for name in missing:
+            values[name] = self._factories[name]()
+        return entity
+
+
+_schemas: Dict[type, EntitySchema] = {}
+
+
+def schema_of(cls) -> EntitySchema:
+    """
+    :return: the EntitySchema of cls, built on first use
+    """
+    schema = _schemas.get(cls)
+    if schema is None:
+        schema = _schemas[cls] = EntitySchema(cls)
+    return schema
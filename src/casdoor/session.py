@@ -12,10 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import json
-from typing import Dict, List
+from typing import Dict, Iterator, List
 
-import requests
+from . import codec
+from .entity_list import entity_list
+from .pagination import DEFAULT_PAGE_SIZE, iter_entities
+from .schema import schema_of
 
 
 class Session:
@@ -40,17 +42,13 @@ class Session:
     def from_dict(cls, data: dict):
         if data is None:
             return None
-        session = cls()
-        for key, value in data.items():
-            if hasattr(session, key):
-                setattr(session, key, value)
-        return session
+        return schema_of(cls).from_dict(data)
 
     def __str__(self):
         return str(self.__dict__)
 
     def to_dict(self) -> dict:
-        return self.__dict__
+        return dict(self.__dict__)
 
 
 class _SessionSDK:
@@ -66,14 +64,23 @@ class _SessionSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        r = requests.get(url, params)
-        response = r.json()
+        r = self.http_session.get(url, params=params)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
-        sessions = []
-        for session in response["data"]:
-            sessions.append(Session.from_dict(session))
-        return sessions
+        return entity_list(self, Session, response["data"])
+
+    def iter_sessions(self, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True) -> Iterator[Session]:
+        """
+        Iterate over the sessions from Casdoor one page at a time, without
+        holding the whole list in memory.
+
+        :param page_size: the number of sessions requested per page
+        :param prefetch: request the next page in the background while the
+            current one is consumed
+        """
+        params = {"owner": self.org_name}
+        return iter_entities(self, "/api/get-sessions", Session, params, page_size, prefetch)
 
     def get_session(self, session_id: str, application: str) -> Dict:
         """
@@ -89,8 +96,8 @@ class _SessionSDK:
             "clientSecret": self.client_secret,
             "sessionPkId": f"{self.org_name}/{session_id}/{application}",
         }
-        r = requests.get(url, params)
-        response = r.json()
+        r = self.http_session.get(url, params=params)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
         return Session.from_dict(response["data"])
@@ -103,9 +110,9 @@ class _SessionSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        session_info = json.dumps(session.to_dict())
-        r = requests.post(url, params=params, data=session_info)
-        response = r.json()
+        session_info = codec.dumps(session.to_dict())
+        r = self.http_session.post(url, params=params, data=session_info)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
         return response
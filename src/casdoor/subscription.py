@@ -12,21 +12,30 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import json
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, Iterator, List
 
-import requests
+from . import codec
+from .entity_list import entity_list
+from .pagination import DEFAULT_PAGE_SIZE, iter_entities
+from .schema import schema_of
+
+
+def _now() -> str:
+    return datetime.now().isoformat()
 
 
 class Subscription:
+    # the defaults from_dict computes per instance, see schema.EntitySchema
+    _default_factories = {"startTime": _now, "endTime": _now}
+
     def __init__(self):
         self.owner = ""
         self.name = ""
         self.createdTime = ""
         self.displayName = ""
-        self.startTime = datetime.now().isoformat()
-        self.endTime = datetime.now().isoformat()
+        self.startTime = _now()
+        self.endTime = _now()
         self.duration = 0
         self.description = ""
         self.user = ""
@@ -52,17 +61,13 @@ class Subscription:
         if data is None:
             return None
 
-        subscription = cls()
-        for key, value in data.items():
-            if hasattr(subscription, key):
-                setattr(subscription, key, value)
-        return subscription
+        return schema_of(cls).from_dict(data)
 
     def __str__(self):
         return str(self.__dict__)
 
     def to_dict(self) -> dict:
-        return self.__dict__
+        return dict(self.__dict__)
 
 
 class _SubscriptionSDK:
@@ -78,14 +83,23 @@ class _SubscriptionSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        r = requests.get(url, params)
-        response = r.json()
+        r = self.http_session.get(url, params=params)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
-        subscriptions = []
-        for subscription in response["data"]:
-            subscriptions.append(Subscription.from_dict(subscription))
-        return subscriptions
+        return entity_list(self, Subscription, response["data"])
+
+    def iter_subscriptions(self, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True) -> Iterator[Subscription]:
+        """
+        Iterate over the subscriptions from Casdoor one page at a time, without
+        holding the whole list in memory.
+
+        :param page_size: the number of subscriptions requested per page
+        :param prefetch: request the next page in the background while the
+            current one is consumed
+        """
+        params = {"owner": self.org_name}
+        return iter_entities(self, "/api/get-subscriptions", Subscription, params, page_size, prefetch)
 
     def get_subscription(self, subscription_id: str) -> Dict:
         """
@@ -100,8 +114,8 @@ class _SubscriptionSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        r = requests.get(url, params)
-        response = r.json()
+        r = self.http_session.get(url, params=params)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
         return Subscription.from_dict(response["data"])
@@ -114,9 +128,9 @@ class _SubscriptionSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        subscription_info = json.dumps(subscription.to_dict())
-        r = requests.post(url, params=params, data=subscription_info)
-        response = r.json()
+        subscription_info = codec.dumps(subscription.to_dict())
+        r = self.http_session.post(url, params=params, data=subscription_info)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
         return response
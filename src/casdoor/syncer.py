@@ -12,10 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import json
-from typing import Dict, List
+from typing import Dict, Iterator, List
 
-import requests
+from . import codec
+from .entity_list import entity_list
+from .pagination import DEFAULT_PAGE_SIZE, iter_entities
+from .schema import schema_of
 
 
 class TableColumn:
@@ -31,7 +33,7 @@ class TableColumn:
         return str(self.__dict__)
 
     def to_dict(self) -> dict:
-        return self.__dict__
+        return dict(self.__dict__)
 
 
 class Syncer:
@@ -93,17 +95,13 @@ class Syncer:
         if not d:
             return None
 
-        syncer = cls()
-        for key, value in d.items():
-            if hasattr(syncer, key):
-                setattr(syncer, key, value)
-        return syncer
+        return schema_of(cls).from_dict(d)
 
     def __str__(self):
         return str(self.__dict__)
 
     def to_dict(self) -> dict:
-        return self.__dict__
+        return dict(self.__dict__)
 
 
 class _SyncerSDK:
@@ -119,14 +117,23 @@ class _SyncerSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        r = requests.get(url, params)
-        response = r.json()
+        r = self.http_session.get(url, params=params)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
-        syncers = []
-        for syncer in response["data"]:
-            syncers.append(Syncer.from_dict(syncer))
-        return syncers
+        return entity_list(self, Syncer, response["data"])
+
+    def iter_syncers(self, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True) -> Iterator[Syncer]:
+        """
+        Iterate over the syncers from Casdoor one page at a time, without
+        holding the whole list in memory.
+
+        :param page_size: the number of syncers requested per page
+        :param prefetch: request the next page in the background while the
+            current one is consumed
+        """
+        params = {"owner": self.org_name}
+        return iter_entities(self, "/api/get-syncers", Syncer, params, page_size, prefetch)
 
     def get_syncer(self, syncer_id: str) -> Dict:
         """
@@ -141,8 +148,8 @@ class _SyncerSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        r = requests.get(url, params)
-        response = r.json()
+        r = self.http_session.get(url, params=params)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
         return Syncer.from_dict(response["data"])
@@ -155,9 +162,9 @@ class _SyncerSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        syncer_info = json.dumps(syncer.to_dict(), default=self.custom_encoder)
-        r = requests.post(url, params=params, data=syncer_info)
-        response = r.json()
+        syncer_info = codec.dumps(syncer.to_dict(), default=self.custom_encoder)
+        r = self.http_session.post(url, params=params, data=syncer_info)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
         return response
@@ -12,10 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import json
-from typing import Dict, List
+from typing import Dict, Iterator, List
 
-import requests
+from . import codec
+from .entity_list import entity_list
+from .pagination import DEFAULT_CONCURRENCY, DEFAULT_PAGE_SIZE, get_all_entities, iter_entities
+from .schema import schema_of
 
 
 class Token:
@@ -78,17 +80,13 @@ class Token:
         if data is None:
             return None
 
-        token = cls()
-        for key, value in data.items():
-            if hasattr(token, key):
-                setattr(token, key, value)
-        return token
+        return schema_of(cls).from_dict(data)
 
     def __str__(self):
         return str(self.__dict__)
 
     def to_dict(self) -> dict:
-        return self.__dict__
+        return dict(self.__dict__)
 
 
 class _TokenSDK:
@@ -106,14 +104,35 @@ class _TokenSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        r = requests.get(url, params)
-        response = r.json()
+        r = self.http_session.get(url, params=params)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
-        tokens = []
-        for token in response["data"]:
-            tokens.append(Token.from_dict(token))
-        return tokens
+        return entity_list(self, Token, response["data"])
+
+    def iter_tokens(self, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True) -> Iterator[Token]:
+        """
+        Iterate over the tokens from Casdoor one page at a time, without
+        holding the whole list in memory.
+
+        :param page_size: the number of tokens requested per page
+        :param prefetch: request the next page in the background while the
+            current one is consumed
+        """
+        params = {"owner": self.org_name}
+        return iter_entities(self, "/api/get-tokens", Token, params, page_size, prefetch)
+
+    def get_all_tokens(self, page_size: int = DEFAULT_PAGE_SIZE, concurrency: int = DEFAULT_CONCURRENCY) -> List[Token]:
+        """
+        Get all the tokens from Casdoor with parallel page requests, for
+        large exports. Page 1 gives the total count, then the other pages are
+        requested concurrently and put back in order.
+
+        :param page_size: the number of tokens requested per page
+        :param concurrency: the maximum number of pages requested at once
+        """
+        params = {"owner": self.org_name}
+        return get_all_entities(self, "/api/get-tokens", Token, params, page_size, concurrency)
 
     def get_token(self, token_id: str) -> Dict:
         """
@@ -128,8 +147,8 @@ class _TokenSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        r = requests.get(url, params)
-        response = r.json()
+        r = self.http_session.get(url, params=params)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
         return Token.from_dict(response["data"])
@@ -143,9 +162,9 @@ class _TokenSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        token_info = json.dumps(token.to_dict())
-        r = requests.post(url, params=params, data=token_info)
-        response = r.json()
+        token_info = codec.dumps(token.to_dict())
+        r = self.http_session.post(url, params=params, data=token_info)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
         return response
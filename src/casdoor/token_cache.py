@@ -0,0 +1,96 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+
+class TokenCache:
+    """
+    Bounded LRU cache of verified JWT claims.
+
+    Entries are keyed by a SHA-256 digest of the token string, so raw bearer
+    tokens are never kept in memory, and are dropped once the token's ``exp``
+    claim is reached. Tokens without ``exp`` are only cached when ``ttl`` is
+    set. The cache is safe to share between threads.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = None, timer: Callable[[], float] = time.time):
+        """
+        :param max_size: the maximum number of tokens to keep
+        :param ttl: an optional upper bound, in seconds, on how long a token stays cached
+        :param timer: the clock used to compare against ``exp``, in epoch seconds
+        """
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.timer = timer
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> Optional[Dict]:
+        """
+        Return a copy of the cached claims of token, or None if it is not
+        cached or has expired.
+        """
+        key = self._key(token)
+        now = self.timer()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, claims = entry
+            if now >= expires_at:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(claims)
+
+    def set(self, token: str, claims: Dict):
+        """
+        Cache the verified claims of token until its expiry.
+        """
+        now = self.timer()
+        expires_at = claims.get("exp")
+        if self.ttl is not None:
+            expires_at = now + self.ttl if expires_at is None else min(expires_at, now + self.ttl)
+        if expires_at is None or now >= expires_at:
+            return
+
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (expires_at, dict(claims))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
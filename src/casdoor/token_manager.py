@@ -0,0 +1,227 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+
+class _TokenState:
+    """
+    The cached token, its refresh deadlines and the refresh metrics shared by
+    the threaded and asyncio managers.
+    """
+
+    def __init__(self, refresh_margin: float, default_expires_in: float, timer: Callable[[], float]):
+        self.refresh_margin = refresh_margin
+        self.default_expires_in = default_expires_in
+        self.timer = timer
+        self.token = None
+        self.refresh_at = 0.0
+        self.expires_at = 0.0
+        self.refresh_count = 0
+        self.failure_count = 0
+        self.last_refresh_latency = None
+        self.total_refresh_latency = 0.0
+        self.last_error = None
+
+    def is_fresh(self) -> bool:
+        return self.token is not None and self.timer() < self.refresh_at
+
+    def is_valid(self) -> bool:
+        return self.token is not None and self.timer() < self.expires_at
+
+    def store(self, token: Dict, latency: float):
+        if not isinstance(token, dict) or not token.get("access_token"):
+            raise ValueError("Casdoor response error:\n" + json.dumps(token))
+        now = self.timer()
+        expires_in = float(token.get("expires_in") or self.default_expires_in)
+        self.token = token
+        self.expires_at = now + expires_in
+        self.refresh_at = now + max(expires_in - self.refresh_margin, 0.0)
+        self.refresh_count += 1
+        self.last_refresh_latency = latency
+        self.total_refresh_latency += self.last_refresh_latency
+        self.last_error = None
+
+    def fail(self, error: Exception):
+        self.failure_count += 1
+        self.last_error = error
+
+    def invalidate(self):
+        self.token = None
+        self.refresh_at = 0.0
+        self.expires_at = 0.0
+
+    def metrics(self) -> Dict:
+        return {
+            "refresh_count": self.refresh_count,
+            "failure_count": self.failure_count,
+            "last_refresh_latency": self.last_refresh_latency,
+            "average_refresh_latency": (
+                self.total_refresh_latency / self.refresh_count if self.refresh_count else None
+            ),
+            "last_error": repr(self.last_error) if self.last_error else None,
+        }
+
+
+class ClientCredentialsTokenManager:
+    """
+    Caches the application's client-credentials token of a CasdoorSDK and
+    refreshes it refresh_margin seconds before it expires.
+
+    Concurrent threads share a single in-flight refresh. While the cached
+    token is still valid, only the thread doing the refresh waits for it and
+    the others keep using the current token; a failed proactive refresh is
+    recorded and retried by the next caller.
+    """
+
+    def __init__(
+        self,
+        sdk,
+        refresh_margin: float = 60.0,
+        default_expires_in: float = 300.0,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        """
+        :param sdk: the CasdoorSDK used to request tokens
+        :param refresh_margin: how long, in seconds, before expiry to refresh
+        :param default_expires_in: the lifetime assumed when Casdoor omits expires_in
+        :param timer: the monotonic clock used for expiry
+        """
+        self.sdk = sdk
+        self._state = _TokenState(refresh_margin, default_expires_in, timer)
+        self._lock = threading.Lock()
+
+    def _refresh(self):
+        started = time.perf_counter()
+        try:
+            token = self.sdk.get_oauth_token()
+            self._state.store(token, time.perf_counter() - started)
+        except Exception as e:
+            self._state.fail(e)
+            raise
+
+    def get_token(self) -> Dict:
+        """
+        Return the cached token response, refreshing it when needed.
+
+        :return: the OAuth token dict with access_token, expires_in, etc.
+        """
+        state = self._state
+        if state.is_fresh():
+            return state.token
+
+        if state.is_valid():
+            if self._lock.acquire(blocking=False):
+                try:
+                    if not state.is_fresh():
+                        self._refresh()
+                except Exception:
+                    pass
+                finally:
+                    self._lock.release()
+            return state.token
+
+        with self._lock:
+            if not state.is_valid():
+                self._refresh()
+            return state.token
+
+    def get_access_token(self) -> str:
+        return self.get_token()["access_token"]
+
+    def invalidate(self):
+        """
+        Drop the cached token, e.g. after Casdoor rejected it.
+        """
+        with self._lock:
+            self._state.invalidate()
+
+    def metrics(self) -> Dict:
+        """
+        :return: refresh_count, failure_count, last_refresh_latency,
+                 average_refresh_latency (in seconds) and last_error
+        """
+        return self._state.metrics()
+
+
+class AsyncClientCredentialsTokenManager:
+    """
+    Asyncio counterpart of ClientCredentialsTokenManager for AsyncCasdoorSDK:
+    concurrent tasks share a single in-flight refresh.
+    """
+
+    def __init__(
+        self,
+        sdk,
+        refresh_margin: float = 60.0,
+        default_expires_in: float = 300.0,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        self.sdk = sdk
+        self._state = _TokenState(refresh_margin, default_expires_in, timer)
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    async def _refresh(self):
+        started = time.perf_counter()
+        try:
+            token = await self.sdk.get_oauth_token()
+            self._state.store(token, time.perf_counter() - started)
+        except Exception as e:
+            self._state.fail(e)
+            raise
+
+    def _start_refresh(self) -> asyncio.Task:
+        # No await between the check and the assignment, so at most one
+        # refresh task exists per manager.
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.ensure_future(self._refresh())
+            self._refresh_task.add_done_callback(_consume_exception)
+        return self._refresh_task
+
+    async def get_token(self) -> Dict:
+        """
+        Return the cached token response, refreshing it when needed.
+
+        :return: the OAuth token dict with access_token, expires_in, etc.
+        """
+        state = self._state
+        if state.is_fresh():
+            return state.token
+
+        task = self._start_refresh()
+        if state.is_valid():
+            # keep serving the current token, the refresh finishes in the background
+            return state.token
+        await asyncio.shield(task)
+        return state.token
+
+    async def get_access_token(self) -> str:
+        return (await self.get_token())["access_token"]
+
+    def invalidate(self):
+        self._state.invalidate()
+
+    def metrics(self) -> Dict:
+        return self._state.metrics()
+
+
+def _consume_exception(task: asyncio.Task):
+    # failures are recorded in the metrics and raised to waiting callers,
+    # don't let asyncio also log them as never retrieved
+    if not task.cancelled():
+        task.exception()
@@ -12,10 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import json
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 
-import requests
+from . import codec
+from .entity_cache import read_through
+from .entity_list import entity_list
+from .pagination import DEFAULT_CONCURRENCY, DEFAULT_PAGE_SIZE, get_all_entities, iter_entities
+from .schema import schema_of
+from .user_index import UserIndex
 
 
 class User:
@@ -191,37 +195,105 @@ class User:
         if data is None:
             return None
 
+        return schema_of(cls).from_dict(data)
+
+    def __str__(self):
+        return str(self.__dict__)
+
+    def to_dict(self) -> dict:
+        return dict(self.__dict__)
+
+    def get_id(self) -> str:
+        return f"{self.owner}/{self.name}"
+
+
+_USER_DEFAULTS = schema_of(User).defaults
+
+
+class CompactUser:
+    """
+    A memory-compact User for large user lists, with the same fields,
+    from_dict and to_dict.
+
+    The fields are __slots__ instead of a per-instance __dict__, and
+    from_dict skips the values equal to a field's default, e.g. the empty
+    provider ids of most users: such a field costs an empty slot and reads
+    as the default. An empty list or dict default is created, and kept, on
+    first access.
+    """
+
+    __slots__ = tuple(_USER_DEFAULTS)
+
+    def __getattr__(self, name):
+        # only called for the slots that were never assigned
+        if name not in _USER_DEFAULTS:
+            raise AttributeError(f"'CompactUser' object has no attribute '{name}'")
+        value = _USER_DEFAULTS[name]
+        if isinstance(value, (list, dict)):
+            value = type(value)()
+            setattr(self, name, value)
+        return value
+
+    @classmethod
+    def new(cls, owner, name, created_time, display_name, email="", phone=""):
+        self = cls()
+        self.name = name
+        self.owner = owner
+        self.createdTime = created_time
+        self.displayName = display_name
+        self.email = email
+        self.phone = phone
+        return self
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Optional["CompactUser"]:
+        if data is None:
+            return None
+
         user = cls()
         for key, value in data.items():
-            if hasattr(user, key):
-                setattr(user, key, value)
+            if key not in _USER_DEFAULTS:
+                continue
+            default = _USER_DEFAULTS[key]
+            if value == default and type(value) is type(default):
+                continue
+            setattr(user, key, value)
         return user
 
     def __str__(self):
-        return str(self.__dict__)
+        return str(self.to_dict())
 
     def to_dict(self) -> dict:
-        return self.__dict__
+        data = {}
+        for name, default in _USER_DEFAULTS.items():
+            try:
+                data[name] = _USER_SLOTS[name].__get__(self, CompactUser)
+            except AttributeError:
+                data[name] = type(default)() if isinstance(default, (list, dict)) else default
+        return data
 
     def get_id(self) -> str:
         return f"{self.owner}/{self.name}"
 
 
+_USER_SLOTS = {name: CompactUser.__dict__[name] for name in _USER_DEFAULTS}
+
+
 class _UserSDK:
+    def _user_class(self):
+        return CompactUser if getattr(self, "compact_users", False) else User
+
     def get_global_users(self) -> List[User]:
         url = self.endpoint + "/api/get-global-users"
         params = {
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        r = requests.get(url, params)
-        response = r.json()
+        r = self.http_session.get(url, params=params)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
-        users = []
-        for user in response["data"]:
-            users.append(User.from_dict(user))
-        return users
+        return entity_list(self, self._user_class(), response["data"])
 
     def get_sorted_users(self, sorter: str, limit: str) -> List[User]:
         """
@@ -238,14 +310,11 @@ class _UserSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        r = requests.get(url, params)
-        response = r.json()
+        r = self.http_session.get(url, params=params)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
-        users = []
-        for user in response["data"]:
-            users.append(User.from_dict(user))
-        return users
+        return entity_list(self, self._user_class(), response["data"])
 
     def get_users(self) -> List[User]:
         """
@@ -259,33 +328,82 @@ class _UserSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        r = requests.get(url, params)
-        response = r.json()
+        r = self.http_session.get(url, params=params)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
-        users = []
-        for user in response["data"]:
-            users.append(User.from_dict(user))
-        return users
+        return entity_list(self, self._user_class(), response["data"])
 
-    def get_user(self, name: str) -> User:
+    def iter_users(self, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True) -> Iterator[User]:
         """
-        Get the user from Casdoor providing the name.
+        Iterate over the users from Casdoor one page at a time, without
+        holding the whole list in memory.
 
-        :param name: the name of the user
-        :return: a dict that contains user's info
+        :param page_size: the number of users requested per page
+        :param prefetch: request the next page in the background while the
+            current one is consumed
+        """
+        params = {"owner": self.org_name}
+        return iter_entities(self, "/api/get-users", self._user_class(), params, page_size, prefetch)
+
+    def get_all_users(self, page_size: int = DEFAULT_PAGE_SIZE, concurrency: int = DEFAULT_CONCURRENCY) -> List[User]:
+        """
+        Get all the users from Casdoor with parallel page requests, for
+        large exports. Page 1 gives the total count, then the other pages are
+        requested concurrently and put back in order.
+
+        :param page_size: the number of users requested per page
+        :param concurrency: the maximum number of pages requested at once
+        """
+        params = {"owner": self.org_name}
+        return get_all_entities(self, "/api/get-users", self._user_class(), params, page_size, concurrency)
+
+    def load_user_index(self, page_size: int = DEFAULT_PAGE_SIZE, concurrency: int = DEFAULT_CONCURRENCY) -> UserIndex:
         """
+        Fill the SDK's user index with all the users of the organization, read
+        with get_all_users, creating the index if the SDK has none. Call it
+        again to take a fresh snapshot.
+
+        :return: the index
+        """
+        if getattr(self, "user_index", None) is None:
+            self.user_index = UserIndex()
+        self.user_index.load(self.get_all_users(page_size, concurrency))
+        return self.user_index
+
+    def _get_user_by(self, field: str, value: str) -> User:
         url = self.endpoint + "/api/get-user"
         params = {
-            "id": f"{self.org_name}/{name}",
+            field: value,
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        r = requests.get(url, params)
-        response = r.json()
-        if response["status"] != "ok":
-            raise Exception(response["msg"])
-        return User.from_dict(response["data"])
+
+        def fetch():
+            r = self.http_session.get(url, params=params)
+            response = codec.loads(r.content)
+            if response["status"] != "ok":
+                raise Exception(response["msg"])
+            return response["data"]
+
+        index = getattr(self, "user_index", None)
+        if index is not None:
+            data = index.get(field, value)
+            if data is not None:
+                return self._user_class().from_dict(data)
+        data = read_through(self, "user", f"{field}:{value}", fetch)
+        if index is not None and data is not None:
+            index.put(data)
+        return self._user_class().from_dict(data)
+
+    def get_user(self, name: str) -> User:
+        """
+        Get the user from Casdoor providing the name.
+
+        :param name: the name of the user
+        :return: a dict that contains user's info
+        """
+        return self._get_user_by("id", f"{self.org_name}/{name}")
 
     def get_user_by_email(self, email: str) -> User:
         """
@@ -294,17 +412,7 @@ class _UserSDK:
         :param email: the email of the user
         :return: a User object that contains user's info
         """
-        url = self.endpoint + "/api/get-user"
-        params = {
-            "email": email,
-            "clientId": self.client_id,
-            "clientSecret": self.client_secret,
-        }
-        r = requests.get(url, params)
-        response = r.json()
-        if response["status"] != "ok":
-            raise Exception(response["msg"])
-        return User.from_dict(response["data"])
+        return self._get_user_by("email", email)
 
     def get_user_by_phone(self, phone: str) -> User:
         """
@@ -313,17 +421,7 @@ class _UserSDK:
         :param phone: the phone number of the user
         :return: a User object that contains user's info
         """
-        url = self.endpoint + "/api/get-user"
-        params = {
-            "phone": phone,
-            "clientId": self.client_id,
-            "clientSecret": self.client_secret,
-        }
-        r = requests.get(url, params)
-        response = r.json()
-        if response["status"] != "ok":
-            raise Exception(response["msg"])
-        return User.from_dict(response["data"])
+        return self._get_user_by("phone", phone)
 
     def get_user_by_user_id(self, user_id: str) -> User:
         """
@@ -332,17 +430,7 @@ class _UserSDK:
         :param user_id: the user ID of the user
         :return: a User object that contains user's info
         """
-        url = self.endpoint + "/api/get-user"
-        params = {
-            "userId": user_id,
-            "clientId": self.client_id,
-            "clientSecret": self.client_secret,
-        }
-        r = requests.get(url, params)
-        response = r.json()
-        if response["status"] != "ok":
-            raise Exception(response["msg"])
-        return User.from_dict(response["data"])
+        return self._get_user_by("userId", user_id)
 
     def get_user_count(self, is_online: bool = None) -> int:
         """
@@ -363,8 +451,8 @@ class _UserSDK:
         else:
             params["isOnline"] = "1" if is_online else "0"
 
-        r = requests.get(url, params)
-        response = r.json()
+        r = self.http_session.get(url, params=params)
+        response = codec.loads(r.content)
         count = response.get("data")
         return count
 
@@ -391,9 +479,13 @@ class _UserSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        user_info = json.dumps(user.to_dict())
-        r = requests.post(url, params=params, data=user_info)
-        response = r.json()
+        user_info = codec.dumps(user.to_dict())
+        r = self.http_session.post(url, params=params, data=user_info)
+        if getattr(self, "entity_cache", None) is not None:
+            self.entity_cache.invalidate("user", id)
+        if getattr(self, "user_index", None) is not None:
+            self.user_index.remove(id)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
         return response
@@ -0,0 +1,119 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+from . import codec
+
+# the /api/get-user query parameters the index answers
+FIELDS = ("id", "email", "phone", "userId")
+
+
+def _keys(data: Dict) -> Dict[str, str]:
+    keys = {
+        "id": f"{data.get('owner')}/{data.get('name')}",
+        "email": data.get("email"),
+        "phone": data.get("phone"),
+        "userId": data.get("id"),
+    }
+    return {field: value for field, value in keys.items() if value}
+
+
+class UserIndex:
+    """
+    In-process snapshot of users with a hash index per lookup field: id
+    (owner/name), email, phone and userId (the user's "id" field), so that
+    get_user, get_user_by_email, get_user_by_phone and get_user_by_user_id
+    are dictionary lookups once the index is warm.
+
+    Users are kept encoded, so every lookup returns a fresh dict. Putting a
+    user again replaces its entry and moves its secondary keys, and removing
+    it drops them all. The index is safe to share between threads.
+    """
+
+    def __init__(self, users: Iterable = ()):
+        """
+        :param users: the initial users, as User objects or dicts
+        """
+        self._lock = threading.Lock()
+        self.load(users)
+
+    @staticmethod
+    def _data(user) -> Dict:
+        return user if isinstance(user, dict) else user.to_dict()
+
+    @staticmethod
+    def _link(users: Dict[str, Tuple[bytes, Dict]], index: Dict[str, Dict[str, str]], data: Dict):
+        keys = _keys(data)
+        users[keys["id"]] = (codec.dumps(data), keys)
+        for field, value in keys.items():
+            index[field][value] = keys["id"]
+
+    def _unlink(self, user_id: str):
+        entry = self._users.pop(user_id, None)
+        if entry is None:
+            return
+        for field, value in entry[1].items():
+            # a key shared with another user belongs to the one put last
+            if self._index[field].get(value) == user_id:
+                del self._index[field][value]
+
+    def load(self, users: Iterable):
+        """
+        Replace the whole snapshot with users, e.g. the result of get_all_users.
+        """
+        entries, index = {}, {field: {} for field in FIELDS}
+        for user in users:
+            self._link(entries, index, self._data(user))
+        with self._lock:
+            self._users, self._index = entries, index
+
+    def put(self, user):
+        """
+        Add or replace a user, given as a User object or a dict.
+        """
+        data = self._data(user)
+        user_id = _keys(data)["id"]
+        with self._lock:
+            self._unlink(user_id)
+            self._link(self._users, self._index, data)
+
+    def remove(self, user_id: str):
+        """
+        Drop a user and all its keys.
+
+        :param user_id: the user's owner/name
+        """
+        with self._lock:
+            self._unlink(user_id)
+
+    def get(self, field: str, value: str) -> Optional[Dict]:
+        """
+        Return a copy of the user whose field equals value, or None.
+
+        :param field: "id" (owner/name), "email", "phone" or "userId"
+        """
+        with self._lock:
+            entry = self._users.get(self._index[field].get(value))
+        return None if entry is None else codec.loads(entry[0])
+
+    def clear(self):
+        self.load(())
+
+    def __contains__(self, user_id: str) -> bool:
+        return user_id in self._users
+
+    def __len__(self) -> int:
+        return len(self._users)
@@ -12,11 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import json
-from typing import Dict, List
-
-import requests
+from typing import Dict, Iterator, List
 
+from . import codec
+from .entity_list import entity_list
+from .pagination import DEFAULT_PAGE_SIZE, iter_entities
+from .schema import schema_of
 from .syncer import TableColumn
 
 
@@ -56,17 +57,13 @@ class Webhook:
     def from_dict(cls, d: dict):
         if d is None:
             return None
-        webhook = cls()
-        for key, value in d.items():
-            if hasattr(webhook, key):
-                setattr(webhook, key, value)
-        return webhook
+        return schema_of(cls).from_dict(d)
 
     def __str__(self):
         return str(self.__dict__)
 
     def to_dict(self) -> dict:
-        return self.__dict__
+        return dict(self.__dict__)
 
 
 class _WebhookSDK:
@@ -82,14 +79,23 @@ class _WebhookSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        r = requests.get(url, params)
-        response = r.json()
+        r = self.http_session.get(url, params=params)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
-        webhooks = []
-        for webhook in response["data"]:
-            webhooks.append(Webhook.from_dict(webhook))
-        return webhooks
+        return entity_list(self, Webhook, response["data"])
+
+    def iter_webhooks(self, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True) -> Iterator[Webhook]:
+        """
+        Iterate over the webhooks from Casdoor one page at a time, without
+        holding the whole list in memory.
+
+        :param page_size: the number of webhooks requested per page
+        :param prefetch: request the next page in the background while the
+            current one is consumed
+        """
+        params = {"owner": self.org_name}
+        return iter_entities(self, "/api/get-webhooks", Webhook, params, page_size, prefetch)
 
     def get_webhook(self, webhook_id: str) -> Dict:
         """
@@ -104,8 +110,8 @@ class _WebhookSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        r = requests.get(url, params)
-        response = r.json()
+        r = self.http_session.get(url, params=params)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
         return Webhook.from_dict(response["data"])
@@ -118,9 +124,9 @@ class _WebhookSDK:
             "clientId": self.client_id,
             "clientSecret": self.client_secret,
         }
-        webhook_info = json.dumps(webhook.to_dict(), default=self.custom_encoder)
-        r = requests.post(url, params=params, data=webhook_info)
-        response = r.json()
+        webhook_info = codec.dumps(webhook.to_dict(), default=self.custom_encoder)
+        r = self.http_session.post(url, params=params, data=webhook_info)
+        response = codec.loads(r.content)
         if response["status"] != "ok":
             raise Exception(response["msg"])
         return response
@@ -0,0 +1,102 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import threading
+import unittest
+import warnings
+from unittest import IsolatedAsyncioTestCase
+
+import src.tests.test_util as test_util
+from src.casdoor.async_main import AsyncCasdoorSDK
+
+
+def get_user_route(query, body):
+    return {"status": "ok", "data": {"owner": test_util.TestOrganization, "name": query["id"].split("/")[1]}}
+
+
+class ServerMixin:
+    def setUp(self):
+        self.server = test_util.LocalCasdoorServer({"/api/get-user": get_user_route}).start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def get_sdk(self, **kwargs):
+        return AsyncCasdoorSDK(
+            endpoint=self.server.endpoint,
+            client_id=test_util.TestClientId,
+            client_secret=test_util.TestClientSecret,
+            certificate=test_util.TestJwtPublicKey,
+            org_name=test_util.TestOrganization,
+            application_name=test_util.TestApplication,
+            **kwargs,
+        )
+
+
+class AioHttpClientTest(ServerMixin, IsolatedAsyncioTestCase):
+
+    async def test_session_is_shared(self):
+        async with self.get_sdk() as sdk:
+            await sdk.get_user("alice")
+            session = sdk._session.session
+            await sdk.get_user("bob")
+            self.assertIs(sdk._session.session, session)
+        self.assertTrue(session.closed)
+        self.assertIsNone(sdk._session.session)
+
+    async def test_concurrent_fan_out(self):
+        async with self.get_sdk(connection_limit=4) as sdk:
+            names = [f"user{i}" for i in range(200)]
+            users = await asyncio.gather(*(sdk.get_user(name) for name in names))
+        self.assertEqual([user["name"] for user in users], names)
+        self.assertLessEqual(self.server.connections, 4)
+
+    async def test_close_and_reopen(self):
+        sdk = self.get_sdk()
+        await sdk.get_user("alice")
+        await sdk.close()
+        user = await sdk.get_user("alice")
+        self.assertEqual(user["name"], "alice")
+        await sdk.close()
+
+
+class AioHttpClientLoopTest(ServerMixin, unittest.TestCase):
+    def test_new_loop_closes_previous_session(self):
+        sdk = self.get_sdk()
+        asyncio.run(sdk.get_user("alice"))
+        first = sdk._session.session
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            self.assertEqual(asyncio.run(sdk.get_user("bob"))["name"], "bob")
+            self.assertTrue(first.closed)
+            self.assertIsNot(sdk._session.session, first)
+            asyncio.run(sdk.close())
+            del first
+        self.assertEqual([w for w in caught if "Unclosed" in str(w.message)], [])
+
+    def test_concurrent_loops_are_rejected(self):
+        sdk = self.get_sdk()
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever)
+        thread.start()
+        try:
+            asyncio.run_coroutine_threadsafe(sdk.get_user("alice"), loop).result()
+            with self.assertRaises(RuntimeError):
+                asyncio.run(sdk.get_user("bob"))
+            asyncio.run_coroutine_threadsafe(sdk.close(), loop).result()
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
@@ -0,0 +1,75 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from unittest import mock
+
+import requests
+
+import src.tests.test_util as test_util
+from src.casdoor import CasdoorSDK
+
+
+class AuthLinkTest(unittest.TestCase):
+    @staticmethod
+    def get_sdk():
+        return CasdoorSDK(
+            endpoint="http://localhost:8000",
+            client_id=test_util.TestClientId,
+            client_secret=test_util.TestClientSecret,
+            certificate=test_util.TestJwtPublicKey,
+            org_name=test_util.TestOrganization,
+            application_name="app built-in/é",
+        )
+
+    @staticmethod
+    def expected_link(sdk, redirect_uri, response_type, scope):
+        params = {
+            "client_id": sdk.client_id,
+            "response_type": response_type,
+            "redirect_uri": redirect_uri,
+            "scope": scope,
+            "state": sdk.application_name,
+        }
+        return requests.Request("GET", sdk.front_endpoint + "/login/oauth/authorize", params=params).prepare().url
+
+    def test_matches_requests_encoding(self):
+        sdk = self.get_sdk()
+        cases = [
+            ("http://localhost:9000/callback", "code", "read"),
+            ("https://example.com/cb?next=/a b&x=1#frag", "token", "openid profile"),
+        ]
+        for redirect_uri, response_type, scope in cases:
+            self.assertEqual(
+                sdk.get_auth_link(redirect_uri, response_type, scope),
+                self.expected_link(sdk, redirect_uri, response_type, scope),
+            )
+
+    def test_no_request_is_sent(self):
+        sdk = self.get_sdk()
+        with mock.patch("requests.Session.send") as send, mock.patch("requests.request") as request:
+            link = sdk.get_auth_link("http://localhost:9000/callback")
+        send.assert_not_called()
+        request.assert_not_called()
+        self.assertTrue(link.startswith("http://localhost:7001/login/oauth/authorize?client_id="))
+
+    def test_reflects_reassigned_settings(self):
+        sdk = self.get_sdk()
+        sdk.get_auth_link("http://localhost:9000/callback")
+        sdk.front_endpoint = "https://door.example.com"
+        sdk.application_name = "other"
+        self.assertEqual(
+            sdk.get_auth_link("http://localhost:9000/callback"),
+            self.expected_link(sdk, "http://localhost:9000/callback", "code", "read"),
+        )
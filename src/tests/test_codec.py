@@ -0,0 +1,118 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import unittest
+from unittest import IsolatedAsyncioTestCase
+
+import src.tests.test_util as test_util
+from src.casdoor import AsyncCasdoorSDK, CasdoorSDK, User, codec
+
+LIBRARIES = [library for library in ("json", "orjson", "ujson") if codec._CODECS[library][1] is not None]
+
+
+class Point:
+    def __init__(self, x, y):
+        self.x, self.y = x, y
+
+
+class CodecTestCase(unittest.TestCase):
+    def setUp(self):
+        self.addCleanup(codec.use, codec.name)
+
+
+class CodecTest(CodecTestCase):
+    def test_round_trip(self):
+        document = {"name": "élodie/1", "tags": ["a", "b"], "score": 1.5, "ok": True, "none": None, "n": 2**40}
+        for library in LIBRARIES:
+            with self.subTest(library):
+                codec.use(library)
+                encoded = codec.dumps(document)
+                self.assertIsInstance(encoded, bytes)
+                self.assertEqual(json.loads(encoded), document)
+                self.assertEqual(codec.loads(encoded), document)
+                self.assertEqual(codec.loads(encoded.decode("utf-8")), document)
+
+    def test_default(self):
+        for library in LIBRARIES:
+            with self.subTest(library):
+                codec.use(library)
+                encoded = codec.dumps({"point": Point(1, 2)}, default=lambda o: o.__dict__)
+                self.assertEqual(json.loads(encoded), {"point": {"x": 1, "y": 2}})
+
+    def test_invalid_json(self):
+        for library in LIBRARIES:
+            with self.subTest(library), self.assertRaises(ValueError):
+                codec.use(library)
+                codec.loads(b"<html>")
+
+    def test_unknown_library(self):
+        with self.assertRaises(ValueError):
+            codec.use("simplejson")
+
+
+class UserEndpoint:
+    def __init__(self):
+        self.bodies = []
+
+    def get(self, query, body):
+        return {"status": "ok", "data": [{"owner": "built-in", "name": "élodie", "score": 3}]}
+
+    def update(self, query, body):
+        self.bodies.append(json.loads(body))
+        return {"status": "ok", "data": "Affected"}
+
+    def routes(self):
+        return {"/api/get-users": self.get, "/api/update-user": self.update}
+
+
+def get_sdk(sdk_class, endpoint):
+    return sdk_class(
+        endpoint,
+        test_util.TestClientId,
+        test_util.TestClientSecret,
+        test_util.TestJwtPublicKey,
+        test_util.TestOrganization,
+        test_util.TestApplication,
+    )
+
+
+class SdkCodecTest(CodecTestCase):
+    def test_requests_and_responses(self):
+        for library in LIBRARIES:
+            with self.subTest(library):
+                codec.use(library)
+                endpoint = UserEndpoint()
+                with test_util.LocalCasdoorServer(endpoint.routes()) as server:
+                    sdk = get_sdk(CasdoorSDK, server.endpoint)
+                    users = sdk.get_users()
+                    sdk.update_user(users[0])
+                self.assertEqual((users[0].name, users[0].score), ("élodie", 3))
+                self.assertEqual(endpoint.bodies[0], User.from_dict(endpoint.bodies[0]).to_dict())
+                self.assertEqual(endpoint.bodies[0]["name"], "élodie")
+
+
+class AsyncSdkCodecTest(IsolatedAsyncioTestCase):
+    async def test_requests_and_responses(self):
+        self.addCleanup(codec.use, codec.name)
+        for library in LIBRARIES:
+            with self.subTest(library):
+                codec.use(library)
+                endpoint = UserEndpoint()
+                with test_util.LocalCasdoorServer(endpoint.routes()) as server:
+                    async with get_sdk(AsyncCasdoorSDK, server.endpoint) as sdk:
+                        users = await sdk.get_users()
+                        await sdk.update_user(User.from_dict(users[0]))
+                self.assertEqual(users[0]["name"], "élodie")
+                self.assertEqual(endpoint.bodies[0]["name"], "élodie")
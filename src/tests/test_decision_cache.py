@@ -0,0 +1,228 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import unittest
+from unittest import IsolatedAsyncioTestCase
+
+import src.tests.test_util as test_util
+from src.casdoor import AsyncCasdoorSDK, CasdoorSDK, DecisionCache
+from src.casdoor.model import Model
+from src.casdoor.permission import Permission
+from src.casdoor.role import Role
+
+PERMISSION_ID = f"{test_util.TestOrganization}/permission-built-in"
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def allow_alice(query, body):
+    # only alice may do anything
+    return {"status": "ok", "data": [json.loads(body)[0] == "alice"]}
+
+
+def get_sdk(sdk_class, endpoint, decision_cache):
+    return sdk_class(
+        endpoint=endpoint,
+        client_id=test_util.TestClientId,
+        client_secret=test_util.TestClientSecret,
+        certificate=test_util.TestJwtPublicKey,
+        org_name=test_util.TestOrganization,
+        application_name=test_util.TestApplication,
+        decision_cache=decision_cache,
+    )
+
+
+class DecisionCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.timer = FakeTimer()
+
+    def test_allow_and_deny_ttls(self):
+        cache = DecisionCache(ttl=60, deny_ttl=5, timer=self.timer)
+        params = {"permissionId": PERMISSION_ID}
+        cache.set(params, ["alice", "data1", "read"], True)
+        cache.set(params, ["bob", "data1", "read"], False)
+
+        self.timer.now = 5
+        self.assertTrue(cache.get(params, ["alice", "data1", "read"]))
+        self.assertIsNone(cache.get(params, ["bob", "data1", "read"]))
+        self.timer.now = 60
+        self.assertIsNone(cache.get(params, ["alice", "data1", "read"]))
+        self.assertEqual(len(cache), 0)
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+        self.assertAlmostEqual(cache.hit_rate, 1 / 3)
+
+    def test_keys_include_selector(self):
+        cache = DecisionCache(timer=self.timer)
+        cache.set({"permissionId": PERMISSION_ID}, ["alice", "data1", "read"], True)
+        self.assertIsNone(cache.get({"modelId": PERMISSION_ID}, ["alice", "data1", "read"]))
+        self.assertIsNone(cache.get({"permissionId": PERMISSION_ID}, ["alice", "data1", "write"]))
+
+    def test_invalidation(self):
+        cache = DecisionCache(timer=self.timer)
+        request = ["alice", "data1", "read"]
+        cache.set({"permissionId": "org/p1"}, request, True)
+        cache.set({"permissionId": "org/p2"}, request, True)
+        cache.set({"modelId": "org/m1"}, request, False)
+
+        cache.invalidate_permission("org/p1")
+        self.assertIsNone(cache.get({"permissionId": "org/p1"}, request))
+        self.assertTrue(cache.get({"permissionId": "org/p2"}, request))
+        cache.invalidate_model("org/m1")
+        self.assertIsNone(cache.get({"modelId": "org/m1"}, request))
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_lru_eviction(self):
+        cache = DecisionCache(max_size=2, timer=self.timer)
+        params = {"owner": "built-in"}
+        cache.set(params, ["a"], True)
+        cache.set(params, ["b"], True)
+        cache.get(params, ["a"])
+        cache.set(params, ["c"], True)
+        self.assertTrue(cache.get(params, ["a"]))
+        self.assertIsNone(cache.get(params, ["b"]))
+        self.assertEqual(len(cache), 2)
+
+    def test_stale_generation_is_not_stored(self):
+        cache = DecisionCache(timer=self.timer)
+        params = {"permissionId": PERMISSION_ID}
+        generation = cache.generation
+        cache.invalidate_permission("org/other")
+        cache.set(params, ["alice"], True, generation)
+        generation = cache.generation
+        cache.clear()
+        cache.set(params, ["bob"], True, generation)
+        self.assertEqual(len(cache), 0)
+        cache.set(params, ["alice"], True, cache.generation)
+        self.assertTrue(cache.get(params, ["alice"]))
+
+    def test_unhashable_requests_are_not_cached(self):
+        cache = DecisionCache(timer=self.timer)
+        params = {"permissionId": PERMISSION_ID}
+        cache.set(params, [{"Owner": "alice"}, "data1", "read"], True)
+        self.assertEqual(len(cache), 0)
+        self.assertIsNone(cache.get(params, [{"Owner": "alice"}, "data1", "read"]))
+
+
+class EnforceDecisionCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.server = test_util.LocalCasdoorServer({"/api/enforce": allow_alice}).start()
+        self.cache = DecisionCache(ttl=60)
+        self.sdk = get_sdk(CasdoorSDK, self.server.endpoint, self.cache)
+
+    def tearDown(self):
+        self.sdk.close()
+        self.server.stop()
+
+    def enforce(self, *casbin_request):
+        return self.sdk.enforce(PERMISSION_ID, "", "", "", "", list(casbin_request))
+
+    def test_repeated_checks_are_cached(self):
+        for _ in range(3):
+            self.assertTrue(self.enforce("alice", "data1", "read"))
+            self.assertFalse(self.enforce("bob", "data1", "read"))
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertEqual((self.cache.hits, self.cache.misses), (4, 2))
+
+    def test_update_permission_invalidates(self):
+        self.enforce("alice", "data1", "read")
+        permission = Permission.new(
+            owner=test_util.TestOrganization,
+            name="permission-built-in",
+            created_time="",
+            display_name="",
+            description="",
+            users=[],
+            roles=[],
+            domains=[],
+            model="",
+            resource_type="",
+            resources=[],
+            actions=[],
+            effect="",
+            is_enabled=True,
+        )
+        self.sdk.update_permission(permission)
+        self.enforce("alice", "data1", "read")
+        paths = [path for _, path, _, _ in self.server.requests]
+        self.assertEqual(paths, ["/api/enforce", "/api/update-permission", "/api/enforce"])
+
+    def test_clear_during_check_drops_its_decision(self):
+        def clear_while_in_flight(query, body):
+            self.cache.clear()
+            return allow_alice(query, body)
+
+        self.server.routes["/api/enforce"] = clear_while_in_flight
+        self.assertTrue(self.enforce("alice", "data1", "read"))
+        self.assertEqual(len(self.cache), 0)
+        self.server.routes["/api/enforce"] = allow_alice
+        self.assertTrue(self.enforce("alice", "data1", "read"))
+        self.assertEqual(len(self.cache), 1)
+
+    def test_writes_clear_every_selector(self):
+        writes = [
+            lambda: self.sdk.update_permission(Permission.from_dict({"name": "permission-built-in"})),
+            lambda: self.sdk.update_model(Model.from_dict({"name": "model-built-in"})),
+            lambda: self.sdk.update_role(Role.from_dict({"name": "role-built-in"})),
+        ]
+        for write in writes:
+            self.enforce("alice", "data1", "read")
+            self.sdk.enforce("", "", "", "", test_util.TestOrganization, ["alice", "data1", "read"])
+            self.sdk.enforce("", f"{test_util.TestOrganization}/model-built-in", "", "", "", ["alice", "data1", "read"])
+            self.assertEqual(len(self.cache), 3)
+            write()
+            self.assertEqual(len(self.cache), 0)
+
+
+class AsyncEnforceDecisionCacheTest(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.server = test_util.LocalCasdoorServer({"/api/enforce": allow_alice}).start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    async def test_repeated_checks_are_cached(self):
+        cache = DecisionCache(ttl=60)
+        async with get_sdk(AsyncCasdoorSDK, self.server.endpoint, cache) as sdk:
+            for _ in range(3):
+                self.assertTrue(await sdk.enforce(PERMISSION_ID, "", "", "", "", ["alice", "data1", "read"]))
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual(cache.hits, 2)
+
+    async def test_update_role_clears(self):
+        cache = DecisionCache(ttl=60)
+        async with get_sdk(AsyncCasdoorSDK, self.server.endpoint, cache) as sdk:
+            await sdk.enforce("", "", "", "", test_util.TestOrganization, ["alice", "data1", "read"])
+            self.assertEqual(len(cache), 1)
+            await sdk.update_role({"owner": test_util.TestOrganization, "name": "role-built-in", "users": []})
+        self.assertEqual(len(cache), 0)
+
+    async def test_clear_during_check_drops_its_decision(self):
+        cache = DecisionCache(ttl=60)
+
+        def clear_while_in_flight(query, body):
+            cache.clear()
+            return allow_alice(query, body)
+
+        self.server.routes["/api/enforce"] = clear_while_in_flight
+        async with get_sdk(AsyncCasdoorSDK, self.server.endpoint, cache) as sdk:
+            self.assertTrue(await sdk.enforce(PERMISSION_ID, "", "", "", "", ["alice", "data1", "read"]))
+        self.assertEqual(len(cache), 0)
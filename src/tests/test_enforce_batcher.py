@@ -0,0 +1,157 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import IsolatedAsyncioTestCase
+
+import src.tests.test_util as test_util
+from src.casdoor import AsyncCasdoorSDK, CasdoorSDK, EnforceBatcher
+
+PERMISSION_ID = f"{test_util.TestOrganization}/permission-built-in"
+
+
+def batch_allow_alice(query, body):
+    return {"status": "ok", "data": [[request[0] == "alice" for request in json.loads(body)]]}
+
+
+def allow_alice(query, body):
+    return {"status": "ok", "data": [json.loads(body)[0] == "alice"]}
+
+
+def user_request(i):
+    return ["alice" if i % 2 == 0 else "bob", f"data{i}", "read"]
+
+
+def get_sdk(sdk_class, endpoint, **kwargs):
+    return sdk_class(
+        endpoint=endpoint,
+        client_id=test_util.TestClientId,
+        client_secret=test_util.TestClientSecret,
+        certificate=test_util.TestJwtPublicKey,
+        org_name=test_util.TestOrganization,
+        application_name=test_util.TestApplication,
+        **kwargs,
+    )
+
+
+class InterruptingCondition(threading.Condition):
+    """
+    Interrupts the leader's wait once size requests are queued.
+    """
+
+    def __init__(self, batcher, size):
+        super().__init__()
+        self.batcher = batcher
+        self.size = size
+
+    def wait(self, timeout=None):
+        while sum(len(batch.requests) for batch in self.batcher._pending.values()) < self.size:
+            super().wait(0.01)
+        raise KeyboardInterrupt
+
+
+class EnforceBatcherTest(unittest.TestCase):
+    def setUp(self):
+        self.server = test_util.LocalCasdoorServer(
+            {"/api/batch-enforce": batch_allow_alice, "/api/enforce": allow_alice}
+        ).start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def batch_requests(self):
+        return [json.loads(body) for _, path, _, body in self.server.requests if path == "/api/batch-enforce"]
+
+    def test_concurrent_calls_share_batches(self):
+        with get_sdk(CasdoorSDK, self.server.endpoint, enforce_batch_window=5.0, enforce_max_batch_size=8) as sdk:
+            with ThreadPoolExecutor(max_workers=16) as executor:
+                results = list(
+                    executor.map(lambda i: sdk.enforce(PERMISSION_ID, "", "", "", "", user_request(i)), range(16))
+                )
+        self.assertEqual(results, [i % 2 == 0 for i in range(16)])
+        self.assertEqual([len(batch) for batch in self.batch_requests()], [8, 8])
+        metrics = sdk.enforce_batcher.metrics()
+        self.assertEqual((metrics["batch_count"], metrics["request_count"]), (2, 16))
+        self.assertEqual(metrics["average_batch_size"], 8)
+        self.assertLess(metrics["max_queue_delay"], 5.0)
+
+    def test_window_closes_batch(self):
+        with get_sdk(CasdoorSDK, self.server.endpoint, enforce_batch_window=0.01) as sdk:
+            self.assertTrue(sdk.enforce(PERMISSION_ID, "", "", "", "", user_request(0)))
+            self.assertFalse(sdk.enforce(PERMISSION_ID, "", "", "", "", user_request(1)))
+        self.assertEqual(self.batch_requests(), [[user_request(0)], [user_request(1)]])
+
+    def test_resource_checks_are_not_batched(self):
+        with get_sdk(CasdoorSDK, self.server.endpoint, enforce_batch_window=0.01) as sdk:
+            self.assertTrue(sdk.enforce("", "", "built-in/resource", "", "", user_request(0)))
+        self.assertEqual(self.server.requests[0][1], "/api/enforce")
+
+    def test_errors_reach_every_caller(self):
+        self.server.routes["/api/batch-enforce"] = lambda query, body: {"status": "ok", "data": [[True]]}
+        with get_sdk(CasdoorSDK, self.server.endpoint) as sdk:
+            batcher = EnforceBatcher(sdk, window=5.0, max_batch_size=4)
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                futures = [
+                    executor.submit(batcher.enforce, PERMISSION_ID, "", "", "", user_request(i)) for i in range(4)
+                ]
+        for future in futures:
+            self.assertIsInstance(future.exception(), ValueError)
+
+    def test_interrupted_leader_fails_its_batch(self):
+        with get_sdk(CasdoorSDK, self.server.endpoint) as sdk:
+            batcher = EnforceBatcher(sdk, window=5.0, max_batch_size=8)
+            batcher._cond = InterruptingCondition(batcher, 4)
+            executor = ThreadPoolExecutor(max_workers=4)
+            futures = [executor.submit(batcher.enforce, PERMISSION_ID, "", "", "", user_request(i)) for i in range(4)]
+            for future in futures:
+                self.assertIsInstance(future.exception(timeout=5), KeyboardInterrupt)
+            executor.shutdown(wait=False)
+        self.assertEqual(batcher._pending, {})
+        self.assertEqual(self.batch_requests(), [])
+
+
+class AsyncEnforceBatcherTest(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.server = test_util.LocalCasdoorServer({"/api/batch-enforce": batch_allow_alice}).start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    async def test_burst_is_batched(self):
+        async with get_sdk(
+            AsyncCasdoorSDK, self.server.endpoint, enforce_batch_window=0.05, enforce_max_batch_size=100
+        ) as sdk:
+            results = await asyncio.gather(
+                *(sdk.enforce(PERMISSION_ID, "", "", "", "", user_request(i)) for i in range(500))
+            )
+            other = await sdk.enforce("", "", "", "", "built-in", user_request(0))
+        self.assertEqual(results, [i % 2 == 0 for i in range(500)])
+        self.assertTrue(other)
+        self.assertEqual(len(self.server.requests), 6)
+        self.assertEqual(self.server.requests[-1][2], {"owner": "built-in"})
+        self.assertEqual(sdk.enforce_batcher.metrics()["max_batch_size"], 100)
+
+    async def test_errors_reach_every_caller(self):
+        self.server.routes["/api/batch-enforce"] = lambda query, body: {"status": "error", "data": None}
+        async with get_sdk(AsyncCasdoorSDK, self.server.endpoint, enforce_batch_window=0.01) as sdk:
+            results = await asyncio.gather(
+                *(sdk.enforce(PERMISSION_ID, "", "", "", "", user_request(i)) for i in range(3)),
+                return_exceptions=True,
+            )
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+        self.assertEqual(len(self.server.requests), 1)
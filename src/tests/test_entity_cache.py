@@ -0,0 +1,304 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import unittest
+from unittest import IsolatedAsyncioTestCase
+
+import src.tests.test_util as test_util
+from src.casdoor import AsyncCasdoorSDK, CasdoorSDK, EntityCache
+from src.casdoor.application import Application
+from src.casdoor.permission import Permission
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def alice(**fields):
+    return dict({"owner": "built-in", "name": "alice", "email": "alice@example.com", "groups": ["staff"]}, **fields)
+
+
+class EntityCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = EntityCache(max_size=3, ttl=60, ttls={"role": 5}, negative_ttl=1, timer=self.clock)
+
+    def test_hits_return_fresh_copies(self):
+        self.assertEqual(self.cache.get("user", "id:built-in/alice"), (False, None))
+        self.cache.set("user", "id:built-in/alice", alice())
+        found, data = self.cache.get("user", "id:built-in/alice")
+        self.assertTrue(found)
+        self.assertEqual(data, alice())
+        data["groups"].append("admin")
+        self.assertEqual(self.cache.get("user", "id:built-in/alice")[1], alice())
+        self.assertEqual((self.cache.hits, self.cache.misses), (2, 1))
+
+    def test_ttl_per_kind(self):
+        self.cache.set("user", "id:built-in/alice", alice())
+        self.cache.set("role", "id:built-in/admin", {"owner": "built-in", "name": "admin"})
+        self.clock.now += 10
+        self.assertTrue(self.cache.get("user", "id:built-in/alice")[0])
+        self.assertFalse(self.cache.get("role", "id:built-in/admin")[0])
+        self.clock.now += 60
+        self.assertFalse(self.cache.get("user", "id:built-in/alice")[0])
+        self.assertEqual(len(self.cache), 0)
+
+    def test_negative_entries(self):
+        self.cache.set("user", "email:bob@example.com", None)
+        self.assertEqual(self.cache.get("user", "email:bob@example.com"), (True, None))
+        self.clock.now += 1
+        self.assertEqual(self.cache.get("user", "email:bob@example.com"), (False, None))
+
+        cache = EntityCache(negative_ttl=0)
+        cache.set("user", "email:bob@example.com", None)
+        self.assertEqual(len(cache), 0)
+
+    def test_lru_eviction(self):
+        for name in ("a", "b", "c"):
+            self.cache.set("user", f"id:built-in/{name}", alice(name=name))
+        self.cache.get("user", "id:built-in/a")
+        self.cache.set("user", "id:built-in/d", alice(name="d"))
+        self.assertFalse(self.cache.get("user", "id:built-in/b")[0])
+        self.assertTrue(self.cache.get("user", "id:built-in/a")[0])
+        self.assertEqual(len(self.cache), 3)
+        self.assertNotIn(("user", "built-in/b"), self.cache._by_entity)
+
+    def test_invalidate(self):
+        self.cache.set("user", "id:built-in/alice", alice())
+        self.cache.set("user", "email:alice@example.com", alice())
+        self.cache.set("user", "email:bob@example.com", None)
+        other = EntityCache()
+        other.set("role", "id:built-in/alice", {"owner": "built-in", "name": "alice"})
+        self.cache.invalidate("user", "built-in/alice")
+        self.assertEqual(len(self.cache), 0)
+        other.invalidate("user", "built-in/alice")
+        self.assertEqual(len(other), 1)
+
+
+class UserEndpoint:
+    def __init__(self):
+        self.users = {"built-in/alice": alice()}
+
+    def get(self, query, body):
+        if "id" in query:
+            return {"status": "ok", "data": self.users.get(query["id"])}
+        matches = [user for user in self.users.values() if user["email"] == query.get("email")]
+        return {"status": "ok", "data": matches[0] if matches else None}
+
+    def update(self, query, body):
+        self.users[query["id"]] = json.loads(body)
+        return {"status": "ok", "data": "Affected"}
+
+    def add(self, query, body):
+        user = json.loads(body)
+        self.users[f"{user['owner']}/{user['name']}"] = user
+        return {"status": "ok", "data": "Affected"}
+
+    def routes(self):
+        return {"/api/get-user": self.get, "/api/update-user": self.update, "/api/add-user": self.add}
+
+
+def get_sdk(sdk_class, endpoint, **kwargs):
+    return sdk_class(
+        endpoint,
+        test_util.TestClientId,
+        test_util.TestClientSecret,
+        test_util.TestJwtPublicKey,
+        "built-in",
+        test_util.TestApplication,
+        **kwargs,
+    )
+
+
+class SdkEntityCacheTest(unittest.TestCase):
+    def test_user_lookups(self):
+        endpoint = UserEndpoint()
+        with test_util.LocalCasdoorServer(endpoint.routes()) as server:
+            sdk = get_sdk(CasdoorSDK, server.endpoint, entity_cache=EntityCache())
+            user = sdk.get_user("alice")
+            user.displayName = "changed locally"
+            self.assertEqual(sdk.get_user("alice").displayName, "")
+            self.assertEqual(sdk.get_user_by_email("alice@example.com").name, "alice")
+            self.assertEqual(sdk.get_user_by_email("alice@example.com").name, "alice")
+            self.assertIsNone(sdk.get_user("bob"))
+            self.assertIsNone(sdk.get_user("bob"))
+            self.assertEqual(len(server.requests), 3)
+
+            user.displayName = "Alice"
+            sdk.update_user(user)
+            self.assertEqual(sdk.get_user("alice").displayName, "Alice")
+            self.assertEqual(sdk.get_user_by_email("alice@example.com").displayName, "Alice")
+
+            bob = sdk.get_user("alice")
+            bob.name, bob.email = "bob", "bob@example.com"
+            sdk.add_user(bob)
+            self.assertEqual(sdk.get_user("bob").email, "bob@example.com")
+
+    def test_without_cache(self):
+        endpoint = UserEndpoint()
+        with test_util.LocalCasdoorServer(endpoint.routes()) as server:
+            sdk = get_sdk(CasdoorSDK, server.endpoint)
+            sdk.get_user("alice")
+            sdk.get_user("alice")
+        self.assertEqual(len(server.requests), 2)
+
+    def test_errors_are_not_cached(self):
+        routes = {"/api/get-role": lambda query, body: {"status": "error", "msg": "denied"}}
+        with test_util.LocalCasdoorServer(routes) as server:
+            sdk = get_sdk(CasdoorSDK, server.endpoint, entity_cache=EntityCache())
+            for _ in range(2):
+                with self.assertRaisesRegex(Exception, "denied"):
+                    sdk.get_role("admin")
+        self.assertEqual(len(server.requests), 2)
+
+    def test_role_changes(self):
+        roles = {"built-in/admin": {"owner": "built-in", "name": "admin", "users": []}}
+
+        def update_role(query, body):
+            roles[query["id"]] = json.loads(body)
+            return {"status": "ok", "data": "Affected"}
+
+        routes = {
+            "/api/get-role": lambda query, body: {"status": "ok", "data": roles.get(query["id"])},
+            "/api/update-role": update_role,
+        }
+        with test_util.LocalCasdoorServer(routes) as server:
+            sdk = get_sdk(CasdoorSDK, server.endpoint, entity_cache=EntityCache())
+            sdk.assign_role_to_user("alice", "admin")
+            self.assertEqual(sdk.get_role("admin").users, ["built-in/alice"])
+            sdk.assign_users_to_role("admin", ["bob"])
+            self.assertEqual(sdk.get_role("admin").users, ["built-in/alice", "built-in/bob"])
+            sdk.remove_role_from_user("alice", "admin")
+            self.assertEqual(sdk.get_role("admin").users, ["built-in/bob"])
+
+    def test_role_membership_changes_read_fresh_roles(self):
+        roles = {"built-in/staff": {"owner": "built-in", "name": "staff", "users": ["built-in/alice"]}}
+
+        def update_role(query, body):
+            roles[query["id"]] = json.loads(body)
+            return {"status": "ok", "data": "Affected"}
+
+        routes = {
+            "/api/get-role": lambda query, body: {"status": "ok", "data": roles.get(query["id"])},
+            "/api/update-role": update_role,
+        }
+        with test_util.LocalCasdoorServer(routes) as server:
+            sdk = get_sdk(CasdoorSDK, server.endpoint, entity_cache=EntityCache())
+            sdk.get_role("staff")
+            # changed by another client while the role is cached
+            roles["built-in/staff"]["users"].append("built-in/bob")
+            sdk.assign_users_to_role("staff", ["carol"])
+            self.assertEqual(roles["built-in/staff"]["users"], ["built-in/alice", "built-in/bob", "built-in/carol"])
+
+            sdk.get_role("staff")
+            roles["built-in/staff"]["users"].append("built-in/dave")
+            sdk.assign_role_to_user("erin", "staff")
+            sdk.get_role("staff")
+            roles["built-in/staff"]["users"].append("built-in/frank")
+            sdk.remove_role_from_user("alice", "staff")
+        self.assertEqual(
+            roles["built-in/staff"]["users"],
+            ["built-in/bob", "built-in/carol", "built-in/dave", "built-in/erin", "built-in/frank"],
+        )
+
+    def test_application_and_permission(self):
+        store = {
+            "admin/app": {"owner": "admin", "name": "app", "displayName": "App"},
+            "built-in/read": {"owner": "built-in", "name": "read", "actions": ["Read"]},
+        }
+
+        def update(query, body):
+            store[query["id"]] = json.loads(body)
+            return {"status": "ok", "data": "Affected"}
+
+        def get(query, body):
+            return {"status": "ok", "data": store.get(query["id"])}
+
+        routes = {
+            "/api/get-application": get,
+            "/api/update-application": update,
+            "/api/get-permission": get,
+            "/api/update-permission": update,
+        }
+        with test_util.LocalCasdoorServer(routes) as server:
+            sdk = get_sdk(CasdoorSDK, server.endpoint, entity_cache=EntityCache())
+            application = sdk.get_application("app")
+            self.assertIsInstance(application, Application)
+            self.assertIsInstance(sdk.get_permission("read"), Permission)
+            application.displayName = "Renamed"
+            sdk.update_application(application)
+            self.assertEqual(sdk.get_application("app").displayName, "Renamed")
+            self.assertEqual(sdk.get_permission("read").actions, ["Read"])
+        paths = [request[1] for request in server.requests]
+        self.assertEqual(paths.count("/api/get-application"), 2)
+        self.assertEqual(paths.count("/api/get-permission"), 1)
+
+
+class AsyncSdkEntityCacheTest(IsolatedAsyncioTestCase):
+    async def test_user_and_role(self):
+        endpoint = UserEndpoint()
+        roles = {"built-in/admin": {"owner": "built-in", "name": "admin", "users": []}}
+
+        def update_role(query, body):
+            roles[query["id"]] = json.loads(body)
+            return {"status": "ok", "data": "Affected"}
+
+        routes = dict(
+            endpoint.routes(),
+            **{
+                "/api/get-role": lambda query, body: {"status": "ok", "data": roles.get(query["id"])},
+                "/api/update-role": update_role,
+            },
+        )
+        with test_util.LocalCasdoorServer(routes) as server:
+            async with get_sdk(AsyncCasdoorSDK, server.endpoint, entity_cache=EntityCache()) as sdk:
+                user = await sdk.get_user("alice")
+                user["displayName"] = "changed locally"
+                self.assertNotIn("displayName", await sdk.get_user("alice"))
+                self.assertEqual(len(server.requests), 1)
+
+                await sdk.assign_role_to_user("alice", "admin")
+                self.assertEqual((await sdk.get_role("admin"))["users"], ["built-in/alice"])
+                self.assertEqual((await sdk.get_role("admin"))["users"], ["built-in/alice"])
+        paths = [request[1] for request in server.requests]
+        self.assertEqual(paths.count("/api/get-role"), 2)
+
+    async def test_role_membership_changes_read_fresh_roles(self):
+        roles = {"built-in/staff": {"owner": "built-in", "name": "staff", "users": ["built-in/alice"]}}
+
+        def update_role(query, body):
+            roles[query["id"]] = json.loads(body)
+            return {"status": "ok", "data": "Affected"}
+
+        routes = {
+            "/api/get-role": lambda query, body: {"status": "ok", "data": roles.get(query["id"])},
+            "/api/update-role": update_role,
+        }
+        with test_util.LocalCasdoorServer(routes) as server:
+            async with get_sdk(AsyncCasdoorSDK, server.endpoint, entity_cache=EntityCache()) as sdk:
+                await sdk.get_role("staff")
+                roles["built-in/staff"]["users"].append("built-in/bob")
+                await sdk.assign_users_to_role("staff", ["carol"])
+                await sdk.get_role("staff")
+                roles["built-in/staff"]["users"].append("built-in/dave")
+                await sdk.assign_role_to_user("erin", "staff")
+        self.assertEqual(
+            roles["built-in/staff"]["users"],
+            ["built-in/alice", "built-in/bob", "built-in/carol", "built-in/dave", "built-in/erin"],
+        )
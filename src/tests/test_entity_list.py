@@ -0,0 +1,118 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import src.tests.test_util as test_util
+from src.casdoor import CasdoorSDK, LazyList, User
+from src.casdoor.role import Role
+
+
+class CountingUser(User):
+    built = 0
+
+    @classmethod
+    def from_dict(cls, data):
+        cls.built += 1
+        return super().from_dict(data)
+
+
+def raw_users(count):
+    return [{"owner": "built-in", "name": f"user{i}", "score": i} for i in range(count)]
+
+
+class LazyListTest(unittest.TestCase):
+    def setUp(self):
+        CountingUser.built = 0
+
+    def test_builds_on_access(self):
+        users = LazyList(CountingUser, raw_users(100))
+        self.assertEqual(len(users), 100)
+        self.assertEqual(sum(1 for user in users.raw if user["score"] >= 90), 10)
+        self.assertEqual(CountingUser.built, 0)
+
+        self.assertEqual(users[5].name, "user5")
+        self.assertEqual(users[-1].name, "user99")
+        self.assertIs(users[5], users[5])
+        self.assertEqual(CountingUser.built, 2)
+
+        with self.assertRaises(IndexError):
+            users[100]
+
+    def test_slices(self):
+        users = LazyList(CountingUser, raw_users(10))
+        first = users[0]
+        head = users[:3]
+        self.assertIsInstance(head, LazyList)
+        self.assertEqual([user.name for user in head], ["user0", "user1", "user2"])
+        self.assertIs(head[0], first)
+        self.assertEqual([user.name for user in users[::-4]], ["user9", "user5", "user1"])
+
+    def test_slices_share_elements(self):
+        users = LazyList(CountingUser, raw_users(10))
+        tail = users[5:]
+        self.assertIs(tail[1], users[6])
+        self.assertIs(tail[::-2][0], users[9])
+        self.assertIs(users[9], tail[-1])
+        self.assertEqual(tail.raw, users.raw[5:])
+        self.assertEqual(CountingUser.built, 2)
+
+    def test_sequence_behaviour(self):
+        users = LazyList(User, raw_users(3))
+        names = [user.name for user in users]
+        self.assertEqual(names, ["user0", "user1", "user2"])
+        self.assertIn(users[1], users)
+        self.assertEqual(users.index(users[2]), 2)
+        self.assertEqual(users, list(users))
+        self.assertEqual(repr(users), "LazyList(User, 3 items)")
+
+        users[0].displayName = "changed"
+        self.assertEqual(users[0].displayName, "changed")
+
+
+class SdkLazyListsTest(unittest.TestCase):
+    def setUp(self):
+        routes = {
+            "/api/get-users": lambda query, body: {"status": "ok", "data": raw_users(5)},
+            "/api/get-roles": lambda query, body: {"status": "ok", "data": [{"owner": "built-in", "name": "admin"}]},
+        }
+        self.server = test_util.LocalCasdoorServer(routes).start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def get_sdk(self, **kwargs):
+        return CasdoorSDK(
+            self.server.endpoint,
+            test_util.TestClientId,
+            test_util.TestClientSecret,
+            test_util.TestJwtPublicKey,
+            test_util.TestOrganization,
+            test_util.TestApplication,
+            **kwargs,
+        )
+
+    def test_lazy_lists(self):
+        sdk = self.get_sdk(lazy_lists=True)
+        users = sdk.get_users()
+        self.assertIsInstance(users, LazyList)
+        self.assertEqual(len(users), 5)
+        self.assertEqual(users[4].name, "user4")
+        roles = sdk.get_roles()
+        self.assertIsInstance(roles[0], Role)
+
+    def test_lists_by_default(self):
+        users = self.get_sdk().get_users()
+        self.assertIsInstance(users, list)
+        self.assertEqual([user.name for user in users], [f"user{i}" for i in range(5)])
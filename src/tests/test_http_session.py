@@ -0,0 +1,69 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import src.tests.test_util as test_util
+from src.casdoor import CasdoorSDK
+
+
+def get_users_route(query, body):
+    return {"status": "ok", "data": [{"owner": test_util.TestOrganization, "name": "alice"}]}
+
+
+class HttpSessionTest(unittest.TestCase):
+    def setUp(self):
+        self.server = test_util.LocalCasdoorServer({"/api/get-users": get_users_route}).start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def get_sdk(self, **kwargs):
+        return CasdoorSDK(
+            endpoint=self.server.endpoint,
+            client_id=test_util.TestClientId,
+            client_secret=test_util.TestClientSecret,
+            certificate=test_util.TestJwtPublicKey,
+            org_name=test_util.TestOrganization,
+            application_name=test_util.TestApplication,
+            **kwargs,
+        )
+
+    def test_connection_reuse(self):
+        with self.get_sdk() as sdk:
+            for _ in range(20):
+                users = sdk.get_users()
+                self.assertEqual(users[0].name, "alice")
+        self.assertEqual(len(self.server.requests), 20)
+        self.assertEqual(self.server.connections, 1)
+
+    def test_concurrent_requests_respect_pool_size(self):
+        with self.get_sdk(pool_maxsize=4, pool_block=True) as sdk:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                results = list(executor.map(lambda _: sdk.get_users(), range(64)))
+        self.assertEqual(len(results), 64)
+        self.assertLessEqual(self.server.connections, 4)
+
+    def test_close(self):
+        sdk = self.get_sdk()
+        sdk.get_users()
+        sdk.close()
+        self.assertEqual(len(sdk.http_session.adapters["http://"].poolmanager.pools), 0)
+
+    def test_cookies_are_not_persisted(self):
+        self.server.response_headers = {"Set-Cookie": "casdoor_session_id=leaked; Path=/"}
+        with self.get_sdk() as sdk:
+            sdk.get_users()
+            self.assertEqual(len(sdk.http_session.cookies), 0)
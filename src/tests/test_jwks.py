@@ -0,0 +1,149 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import unittest
+
+import jwt
+import requests
+
+import src.tests.test_util as test_util
+from src.casdoor import CasdoorSDK, JwksKeySet
+
+
+def to_jwk(private_key, kid):
+    jwk = jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key(), as_dict=True)
+    jwk.update({"kid": kid, "alg": "RS256", "use": "sig"})
+    return jwk
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FailingSession:
+    def __init__(self):
+        self.calls = 0
+
+    def get(self, url, **kwargs):
+        self.calls += 1
+        raise requests.ConnectionError("connection refused")
+
+
+class JwksKeySetTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.old_key, cls.certificate = test_util.generate_signing_key()
+        cls.new_key, _ = test_util.generate_signing_key("Rotated Cert")
+
+    def setUp(self):
+        self.published = [to_jwk(self.old_key, "cert-old")]
+        self.gate = threading.Event()
+        self.gate.set()
+        routes = {"/.well-known/jwks": self.jwks_route}
+        self.server = test_util.LocalCasdoorServer(routes).start()
+        self.timer = FakeTimer()
+        self.key_set = JwksKeySet.from_endpoint(
+            self.server.endpoint, min_refresh_interval=30, ttl=300, timer=self.timer
+        )
+
+    def tearDown(self):
+        self.gate.set()
+        self.server.stop()
+
+    def jwks_route(self, query, body):
+        self.gate.wait(5)
+        return {"keys": list(self.published)}
+
+    def fetches(self):
+        return len([request for request in self.server.requests if request[1] == "/.well-known/jwks"])
+
+    def get_sdk(self):
+        return CasdoorSDK(
+            endpoint=self.server.endpoint,
+            client_id=test_util.TestClientId,
+            client_secret=test_util.TestClientSecret,
+            certificate=self.certificate,
+            org_name=test_util.TestOrganization,
+            application_name=test_util.TestApplication,
+            key_set=self.key_set,
+        )
+
+    def test_verifies_by_kid(self):
+        sdk = self.get_sdk()
+        for _ in range(3):
+            claims = sdk.parse_jwt_token(test_util.sign_token(self.old_key, kid="cert-old", name="alice"))
+            self.assertEqual(claims["name"], "alice")
+        self.assertEqual(self.fetches(), 1)
+
+    def test_unknown_kid_triggers_refresh(self):
+        sdk = self.get_sdk()
+        sdk.parse_jwt_token(test_util.sign_token(self.old_key, kid="cert-old"))
+        self.timer.now = 31
+
+        self.published.append(to_jwk(self.new_key, "cert-new"))
+        claims = sdk.parse_jwt_token(test_util.sign_token(self.new_key, kid="cert-new", name="bob"))
+        self.assertEqual(claims["name"], "bob")
+        self.assertEqual(self.fetches(), 2)
+
+    def test_refresh_is_rate_limited(self):
+        sdk = self.get_sdk()
+        sdk.parse_jwt_token(test_util.sign_token(self.old_key, kid="cert-old"))
+        for _ in range(5):
+            with self.assertRaises(jwt.PyJWKClientError):
+                sdk.parse_jwt_token(test_util.sign_token(self.new_key, kid="cert-unknown"))
+        self.assertEqual(self.fetches(), 1)
+
+        self.timer.now = 31
+        with self.assertRaises(jwt.PyJWKClientError):
+            sdk.parse_jwt_token(test_util.sign_token(self.new_key, kid="cert-unknown"))
+        self.assertEqual(self.fetches(), 2)
+
+    def test_failed_load_is_rate_limited(self):
+        session = FailingSession()
+        key_set = JwksKeySet("http://casdoor.invalid/.well-known/jwks", session=session, timer=self.timer)
+        for _ in range(5):
+            with self.assertRaises(jwt.PyJWKClientError):
+                key_set.get_signing_key("cert-old")
+        self.assertEqual(session.calls, 1)
+        self.assertIsInstance(key_set.last_error, requests.ConnectionError)
+
+        self.timer.now = 31
+        with self.assertRaises(jwt.PyJWKClientError):
+            key_set.get_signing_key("cert-old")
+        self.assertEqual(session.calls, 2)
+
+    def test_stale_key_set_is_refreshed(self):
+        self.key_set.get_signing_key("cert-old")
+        self.timer.now = 301
+        self.published[:] = [to_jwk(self.new_key, "cert-new")]
+
+        # the stale key is still served while the refresh runs in the background
+        self.gate.clear()
+        self.assertIsNotNone(self.key_set.get_signing_key("cert-old"))
+        self.gate.set()
+        self.key_set.get_signing_key("cert-new")
+        self.assertEqual(self.key_set.refresh_count, 2)
+        with self.assertRaises(jwt.PyJWKClientError):
+            self.key_set.get_signing_key("cert-old")
+
+    def test_token_without_kid_uses_certificate(self):
+        sdk = self.get_sdk()
+        claims = sdk.parse_jwt_token(test_util.sign_token(self.old_key, name="alice"))
+        self.assertEqual(claims["name"], "alice")
+        self.assertEqual(self.fetches(), 0)
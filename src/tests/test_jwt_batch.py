@@ -0,0 +1,215 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from unittest import IsolatedAsyncioTestCase, mock
+
+import jwt
+
+import src.tests.test_util as test_util
+from src.casdoor import AsyncCasdoorSDK, CasdoorSDK, TokenCache, jwt_batch
+
+jwt_decode = jwt.decode
+
+
+def get_sdk(sdk_class, certificate, **kwargs):
+    return sdk_class(
+        endpoint=test_util.TestEndpoint,
+        client_id=test_util.TestClientId,
+        client_secret=test_util.TestClientSecret,
+        certificate=certificate,
+        org_name=test_util.TestOrganization,
+        application_name=test_util.TestApplication,
+        **kwargs,
+    )
+
+
+class Tokens:
+    """
+    Tokens shared by the tests: two valid ones, an expired one and one signed
+    with another key. The batch repeats the first token at the end.
+    """
+
+    def __init__(self):
+        self.private_key, self.certificate = test_util.generate_signing_key()
+        other_key, _ = test_util.generate_signing_key("Other Cert")
+        alice = test_util.sign_token(self.private_key, name="alice")
+        bob = test_util.sign_token(self.private_key, name="bob")
+        expired = test_util.sign_token(self.private_key, expires_in=-10, name="carol")
+        forged = test_util.sign_token(other_key, name="mallory")
+        self.batch = [alice, expired, bob, forged, alice]
+
+    def check_results(self, test, results):
+        test.assertEqual(len(results), 5)
+        test.assertEqual(results[0]["name"], "alice")
+        test.assertIsInstance(results[1], jwt.ExpiredSignatureError)
+        test.assertEqual(results[2]["name"], "bob")
+        test.assertIsInstance(results[3], jwt.InvalidSignatureError)
+        test.assertEqual(results[4], results[0])
+        test.assertIsNot(results[4], results[0])
+
+
+class ParseJwtTokensTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tokens = Tokens()
+
+    def test_sequential_dedupes(self):
+        sdk = get_sdk(CasdoorSDK, self.tokens.certificate)
+        with mock.patch("jwt.decode", wraps=jwt.decode) as decode:
+            results = sdk.parse_jwt_tokens(self.tokens.batch)
+        self.tokens.check_results(self, results)
+        self.assertEqual(decode.call_count, 4)
+
+    def test_thread_pool(self):
+        sdk = get_sdk(CasdoorSDK, self.tokens.certificate)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            self.tokens.check_results(self, sdk.parse_jwt_tokens(self.tokens.batch, executor=executor))
+
+    def test_public_key_pem_once_per_key(self):
+        sdk = get_sdk(CasdoorSDK, self.tokens.certificate)
+        key_pem = jwt_batch._public_key_pem(sdk.public_key)
+        self.assertIs(jwt_batch._public_key_pem(sdk.public_key), key_pem)
+        other = get_sdk(CasdoorSDK, self.tokens.certificate)
+        self.assertEqual(jwt_batch._public_key_pem(other.public_key), key_pem)
+        self.assertIsNot(jwt_batch._public_key_pem(other.public_key), key_pem)
+
+    def test_process_pool_fills_token_cache(self):
+        sdk = get_sdk(CasdoorSDK, self.tokens.certificate, token_cache=TokenCache())
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            self.tokens.check_results(self, sdk.parse_jwt_tokens(self.tokens.batch, executor=executor))
+            self.assertEqual(len(sdk.token_cache), 2)
+            self.tokens.check_results(self, sdk.parse_jwt_tokens(self.tokens.batch, executor=executor))
+        self.assertEqual(sdk.token_cache.hits, 2)
+
+
+class AsyncParseJwtTokensTest(IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tokens = Tokens()
+
+    async def test_default_executor(self):
+        sdk = get_sdk(AsyncCasdoorSDK, self.tokens.certificate)
+        self.tokens.check_results(self, await sdk.aparse_jwt_tokens(self.tokens.batch))
+
+    async def test_process_pool(self):
+        sdk = get_sdk(AsyncCasdoorSDK, self.tokens.certificate)
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            self.tokens.check_results(self, await sdk.aparse_jwt_tokens(self.tokens.batch, executor=executor))
+
+
+class AsyncParseJwtTokenTest(IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tokens = Tokens()
+
+    async def test_runs_on_executor(self):
+        threads = set()
+
+        def record_thread(*args, **kwargs):
+            threads.add(threading.get_ident())
+            return jwt_decode(*args, **kwargs)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            sdk = get_sdk(AsyncCasdoorSDK, self.tokens.certificate, verification_executor=executor)
+            with mock.patch("jwt.decode", side_effect=record_thread):
+                claims = await sdk.aparse_jwt_token(self.tokens.batch[0])
+        self.assertEqual(claims["name"], "alice")
+        self.assertNotIn(threading.get_ident(), threads)
+
+    async def test_raises_verification_errors(self):
+        sdk = get_sdk(AsyncCasdoorSDK, self.tokens.certificate)
+        with self.assertRaises(jwt.ExpiredSignatureError):
+            await sdk.aparse_jwt_token(self.tokens.batch[1])
+
+    async def test_bounded_concurrency(self):
+        lock = threading.Lock()
+        in_flight = [0, 0]
+
+        def slow_decode(*args, **kwargs):
+            with lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight)
+            time.sleep(0.01)
+            with lock:
+                in_flight[0] -= 1
+            return jwt_decode(*args, **kwargs)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            sdk = get_sdk(
+                AsyncCasdoorSDK,
+                self.tokens.certificate,
+                verification_executor=executor,
+                verification_concurrency=2,
+            )
+            with mock.patch("jwt.decode", side_effect=slow_decode):
+                tokens = [test_util.sign_token(self.tokens.private_key, name=f"user{i}") for i in range(8)]
+                results = await asyncio.gather(*(sdk.aparse_jwt_token(token) for token in tokens))
+        self.assertEqual([claims["name"] for claims in results], [f"user{i}" for i in range(8)])
+        self.assertEqual(in_flight[1], 2)
+
+    async def test_shares_token_cache(self):
+        sdk = get_sdk(AsyncCasdoorSDK, self.tokens.certificate, token_cache=TokenCache())
+        await sdk.aparse_jwt_token(self.tokens.batch[0])
+        sdk.parse_jwt_token(self.tokens.batch[0])
+        await sdk.aparse_jwt_token(self.tokens.batch[0])
+        self.assertEqual((sdk.token_cache.hits, sdk.token_cache.misses), (2, 1))
+
+
+class SlowKeySet:
+    """
+    A key set whose lookups block like a JWKS fetch.
+    """
+
+    def __init__(self, key, delay):
+        self.key = key
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.in_flight = [0, 0]
+
+    def get_signing_key(self, kid):
+        with self.lock:
+            self.in_flight[0] += 1
+            self.in_flight[1] = max(self.in_flight)
+        time.sleep(self.delay)
+        with self.lock:
+            self.in_flight[0] -= 1
+        return self.key
+
+
+class AsyncProcessPoolKeyTest(IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tokens = Tokens()
+
+    async def test_key_lookup_off_the_loop(self):
+        sdk = get_sdk(AsyncCasdoorSDK, self.tokens.certificate, verification_concurrency=1)
+        sdk.key_set = SlowKeySet(sdk.public_key, 0.2)
+        tokens = [test_util.sign_token(self.tokens.private_key, kid="k1", name=f"user{i}") for i in range(3)]
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            await asyncio.get_running_loop().run_in_executor(executor, abs, 0)
+            verification = asyncio.ensure_future(sdk.aparse_jwt_tokens(tokens, executor=executor))
+            longest_gap = 0.0
+            while not verification.done():
+                started = time.monotonic()
+                await asyncio.sleep(0.01)
+                longest_gap = max(longest_gap, time.monotonic() - started)
+            results = await verification
+        self.assertEqual([claims["name"] for claims in results], ["user0", "user1", "user2"])
+        self.assertLess(longest_gap, 0.15)
+        self.assertEqual(sdk.key_set.in_flight[1], 1)
@@ -0,0 +1,110 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from src.casdoor import matcher
+from src.casdoor.matcher import (
+    bind_matcher,
+    compile_matcher,
+    glob_match,
+    ip_match,
+    key_match,
+    key_match2,
+    key_match3,
+    regex_match,
+)
+
+REQUEST = ["r_sub", "r_obj", "r_act"]
+POLICY = ["p_sub", "p_obj", "p_act"]
+
+
+class BuiltinFunctionsTest(unittest.TestCase):
+    def test_key_match(self):
+        self.assertTrue(key_match("/foo/bar", "/foo/*"))
+        self.assertTrue(key_match("/foo", "/foo*"))
+        self.assertFalse(key_match("/foo", "/foo/*"))
+        self.assertTrue(key_match("/foo", "/foo"))
+        self.assertFalse(key_match("/foo/bar", "/foo"))
+
+    def test_key_match2(self):
+        self.assertTrue(key_match2("/resource/1", "/resource/:id"))
+        self.assertFalse(key_match2("/resource/1/keys", "/resource/:id"))
+        self.assertTrue(key_match2("/resource/1/keys", "/resource/:id/*"))
+        self.assertTrue(key_match2("/anything", "*"))
+        self.assertFalse(key_match2("/foo/bar", "/foo"))
+
+    def test_key_match3(self):
+        self.assertTrue(key_match3("/resource/1", "/resource/{id}"))
+        self.assertFalse(key_match3("/resource/1/keys", "/resource/{id}"))
+
+    def test_regex_match_searches(self):
+        self.assertTrue(regex_match("read", "^(read|write)$"))
+        self.assertTrue(regex_match("/topic/create", "create"))
+        self.assertFalse(regex_match("delete", "^(read|write)$"))
+
+    def test_glob_match(self):
+        self.assertTrue(glob_match("/foo/bar", "/foo/*"))
+        self.assertFalse(glob_match("/foo/bar/baz", "/foo/*"))
+        self.assertTrue(glob_match("/foo/b", "/foo/?"))
+        self.assertTrue(glob_match("/foo/c", "/foo/[a-c]"))
+        self.assertFalse(glob_match("/foo/d", "/foo/[a-c]"))
+        self.assertTrue(glob_match("/foo.bar", "/foo.bar"))
+        self.assertFalse(glob_match("/fooxbar", "/foo.bar"))
+
+    def test_ip_match(self):
+        self.assertTrue(ip_match("192.168.2.123", "192.168.2.0/24"))
+        self.assertTrue(ip_match("192.168.2.123", "192.168.2.123"))
+        self.assertFalse(ip_match("192.168.3.1", "192.168.2.0/24"))
+
+
+class CompileMatcherTest(unittest.TestCase):
+    def test_compiled_callable(self):
+        code = compile_matcher("g(r.sub, p.sub) && keyMatch2(r.obj, p.obj) && r.act == p.act", REQUEST, POLICY, ["g"])
+        match = bind_matcher(code, {"g": lambda name, role: (name, role) == ("alice", "admin")})
+        self.assertTrue(match(["alice", "/users/1", "read"], ["admin", "/users/:id", "read"]))
+        self.assertFalse(match(["bob", "/users/1", "read"], ["admin", "/users/:id", "read"]))
+        self.assertFalse(match(["alice", "/users/1", "write"], ["admin", "/users/:id", "read"]))
+
+    def test_cached_by_model_id_and_content(self):
+        first = compile_matcher("r.sub == p.sub", REQUEST, POLICY, model_id="built-in/cached")
+        self.assertIs(compile_matcher("r.sub == p.sub", REQUEST, POLICY, model_id="built-in/cached"), first)
+
+        changed = compile_matcher("r.obj == p.obj", REQUEST, POLICY, model_id="built-in/cached")
+        self.assertIsNot(changed, first)
+        self.assertIs(matcher._compiled["built-in/cached"][1], changed)
+
+        # without a model id the content hash alone is the key
+        self.assertIs(
+            compile_matcher("r.act == p.act", REQUEST, POLICY), compile_matcher("r.act == p.act", REQUEST, POLICY)
+        )
+
+    def test_cache_is_bounded(self):
+        kept = compile_matcher("r.sub == p.sub", REQUEST, POLICY, model_id="built-in/kept")
+        for i in range(matcher._COMPILED_MAX_SIZE + 10):
+            compile_matcher(f"r.sub == '{i}'", REQUEST, POLICY)
+            compile_matcher("r.sub == p.sub", REQUEST, POLICY, model_id="built-in/kept")
+        self.assertEqual(len(matcher._compiled), matcher._COMPILED_MAX_SIZE)
+        self.assertIs(matcher._compiled["built-in/kept"][1], kept)
+
+    def test_rejects_unknown_names(self):
+        for expression in (
+            "os.system(r.sub)",
+            "__import__(r.sub)",
+            "r.sub.__class__ == p.sub",
+            "r.sub == q.sub",
+            "r.sub = p.sub",
+        ):
+            with self.subTest(expression), self.assertRaises(ValueError):
+                compile_matcher(expression, REQUEST, POLICY)
@@ -0,0 +1,348 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import threading
+import time
+import unittest
+from unittest import IsolatedAsyncioTestCase
+
+import src.tests.test_util as test_util
+from src.casdoor import AsyncCasdoorSDK, CasdoorSDK
+from src.casdoor.pagination import afetch_all_pages, aiter_pages, fetch_all_pages, iter_pages
+from src.casdoor.resource import Resource
+from src.casdoor.user import User
+
+
+class PagedEndpoint:
+    def __init__(self, count, send_total=True, paginate=True):
+        self.items = [{"owner": "built-in", "name": f"item{i}"} for i in range(count)]
+        self.send_total = send_total
+        self.paginate = paginate
+
+    def __call__(self, query, body):
+        if not self.paginate or "p" not in query:
+            return {"status": "ok", "data": self.items}
+        p, page_size = int(query["p"]), int(query["pageSize"])
+        response = {"status": "ok", "data": self.items[(p - 1) * page_size : p * page_size]}
+        if self.send_total:
+            response["data2"] = len(self.items)
+        return response
+
+
+class ConcurrencyProbe:
+    def __init__(self):
+        self.active = self.peak = 0
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        with self._lock:
+            self.active -= 1
+
+
+def get_sdk(endpoint, sdk_class=CasdoorSDK):
+    return sdk_class(
+        endpoint,
+        test_util.TestClientId,
+        test_util.TestClientSecret,
+        test_util.TestJwtPublicKey,
+        test_util.TestOrganization,
+        test_util.TestApplication,
+    )
+
+
+class IterPagesTest(unittest.TestCase):
+    def test_prefetches_next_page(self):
+        requested = {1: threading.Event(), 2: threading.Event(), 3: threading.Event()}
+
+        def fetch_page(p):
+            requested[p].set()
+            return [p] * (2 if p < 3 else 1), None
+
+        pages = iter_pages(fetch_page, 2)
+        self.assertEqual(next(pages), [1, 1])
+        self.assertTrue(requested[2].wait(5))
+        self.assertEqual(next(pages), [2, 2])
+        self.assertTrue(requested[3].wait(5))
+        self.assertEqual(list(pages), [[3]])
+
+    def test_without_prefetch(self):
+        calls = []
+
+        def fetch_page(p):
+            calls.append(p)
+            return [p] * 2, 5
+
+        pages = iter_pages(fetch_page, 2, prefetch=False)
+        self.assertEqual(next(pages), [1, 1])
+        self.assertEqual(calls, [1])
+        self.assertEqual(list(pages), [[2, 2], [3, 3]])
+        self.assertEqual(calls, [1, 2, 3])
+
+    def test_errors_are_raised_to_the_caller(self):
+        def fetch_page(p):
+            if p == 2:
+                raise Exception("page 2 failed")
+            return [p], None
+
+        pages = iter_pages(fetch_page, 1)
+        self.assertEqual(next(pages), [1])
+        with self.assertRaisesRegex(Exception, "page 2 failed"):
+            next(pages)
+
+    def test_invalid_page_size(self):
+        with self.assertRaises(ValueError):
+            next(iter_pages(lambda p: ([], None), 0))
+
+
+class SdkIterTest(unittest.TestCase):
+    def iterate(self, endpoint, method="iter_users", *args, **kwargs):
+        with test_util.LocalCasdoorServer({"/api/get-users": endpoint, "/api/get-resources": endpoint}) as server:
+            items = list(getattr(get_sdk(server.endpoint), method)(*args, **kwargs))
+        return items, [request[2] for request in server.requests]
+
+    def test_iter_users(self):
+        users, queries = self.iterate(PagedEndpoint(250), page_size=100)
+        self.assertTrue(all(isinstance(user, User) for user in users))
+        self.assertEqual([user.name for user in users], [f"item{i}" for i in range(250)])
+        self.assertEqual(
+            [(query["p"], query["pageSize"]) for query in queries], [("1", "100"), ("2", "100"), ("3", "100")]
+        )
+        self.assertEqual(queries[0]["owner"], test_util.TestOrganization)
+        self.assertEqual(queries[0]["clientId"], test_util.TestClientId)
+
+    def test_total_ends_iteration(self):
+        users, queries = self.iterate(PagedEndpoint(200), page_size=100)
+        self.assertEqual(len(users), 200)
+        self.assertEqual(len(queries), 2)
+
+        users, queries = self.iterate(PagedEndpoint(200, send_total=False), page_size=100, prefetch=False)
+        self.assertEqual(len(users), 200)
+        self.assertEqual(len(queries), 3)
+
+    def test_server_without_pagination(self):
+        users, queries = self.iterate(PagedEndpoint(30, paginate=False), page_size=10)
+        self.assertEqual(len(users), 30)
+        self.assertEqual(len(queries), 1)
+
+    def test_error(self):
+        with self.assertRaisesRegex(Exception, "denied"):
+            self.iterate(lambda query, body: {"status": "error", "msg": "denied"})
+
+    def test_iter_resources(self):
+        resources, queries = self.iterate(
+            PagedEndpoint(3), "iter_resources", "built-in", "alice", "name", "a", "name", "asc", page_size=2
+        )
+        self.assertTrue(all(isinstance(resource, Resource) for resource in resources))
+        self.assertEqual(len(resources), 3)
+        self.assertEqual((queries[0]["user"], queries[0]["sortOrder"], queries[1]["p"]), ("alice", "asc", "2"))
+
+    def test_stop_early(self):
+        endpoint = PagedEndpoint(1000)
+        with test_util.LocalCasdoorServer({"/api/get-users": endpoint}) as server:
+            users = get_sdk(server.endpoint).iter_users(page_size=10)
+            self.assertEqual(next(users).name, "item0")
+            users.close()
+        self.assertLessEqual(len(server.requests), 2)
+
+
+class FetchAllPagesTest(unittest.TestCase):
+    def test_pages_in_order_with_bounded_concurrency(self):
+        probe = ConcurrencyProbe()
+
+        def fetch_page(p):
+            with probe:
+                # later pages answer first
+                time.sleep(0.002 * (12 - p))
+                return list(range((p - 1) * 10, min(p * 10, 115))), 115
+
+        self.assertEqual(fetch_all_pages(fetch_page, 10, concurrency=3), list(range(115)))
+        self.assertGreater(probe.peak, 1)
+        self.assertLessEqual(probe.peak, 3)
+
+    def test_without_total(self):
+        calls = []
+
+        def fetch_page(p):
+            calls.append(p)
+            return [p] * (2 if p < 4 else 1), None
+
+        self.assertEqual(fetch_all_pages(fetch_page, 2), [1, 1, 2, 2, 3, 3, 4])
+        self.assertEqual(calls, [1, 2, 3, 4])
+
+    def test_collection_grew(self):
+        def fetch_page(p):
+            # 4 items when page 1 was read, 5 by the time of page 2
+            return ([p] * 2, 4) if p == 1 else ([p] * (2 if p < 3 else 1), 5)
+
+        self.assertEqual(fetch_all_pages(fetch_page, 2), [1, 1, 2, 2, 3])
+
+    def test_errors_are_raised_to_the_caller(self):
+        def fetch_page(p):
+            if p == 3:
+                raise Exception("page 3 failed")
+            return [p], 5
+
+        with self.assertRaisesRegex(Exception, "page 3 failed"):
+            fetch_all_pages(fetch_page, 1)
+
+
+class SdkGetAllTest(unittest.TestCase):
+    def test_get_all(self):
+        endpoint = PagedEndpoint(1050)
+        routes = {"/api/get-users": endpoint, "/api/get-tokens": endpoint, "/api/get-payments": endpoint}
+        with test_util.LocalCasdoorServer(routes) as server:
+            sdk = get_sdk(server.endpoint)
+            users = sdk.get_all_users(page_size=100, concurrency=4)
+            self.assertEqual(len(server.requests), 11)
+            self.assertEqual(len(sdk.get_all_tokens(page_size=500)), 1050)
+            self.assertEqual(len(sdk.get_all_payments(page_size=2000)), 1050)
+        self.assertTrue(all(isinstance(user, User) for user in users))
+        self.assertEqual([user.name for user in users], [f"item{i}" for i in range(1050)])
+        self.assertEqual({request[2]["pageSize"] for request in server.requests[:11]}, {"100"})
+
+
+class AsyncFetchAllTest(IsolatedAsyncioTestCase):
+    async def test_pages_in_order_with_bounded_concurrency(self):
+        probe = ConcurrencyProbe()
+
+        async def fetch_page(p):
+            with probe:
+                await asyncio.sleep(0.002 * (12 - p))
+                return list(range((p - 1) * 10, min(p * 10, 115))), 115
+
+        self.assertEqual(await afetch_all_pages(fetch_page, 10, concurrency=3), list(range(115)))
+        self.assertEqual(probe.peak, 3)
+
+    async def test_error_cancels_other_pages(self):
+        finished = []
+
+        async def fetch_page(p):
+            if p == 2:
+                raise Exception("page 2 failed")
+            await asyncio.sleep(0 if p == 1 else 0.05)
+            finished.append(p)
+            return [p], 5
+
+        with self.assertRaisesRegex(Exception, "page 2 failed"):
+            await afetch_all_pages(fetch_page, 1)
+        await asyncio.sleep(0.1)
+        self.assertEqual(finished, [1])
+
+    async def test_get_all(self):
+        endpoint = PagedEndpoint(250)
+        routes = {"/api/get-users": endpoint, "/api/get-tokens": endpoint, "/api/get-payments": endpoint}
+        with test_util.LocalCasdoorServer(routes) as server:
+            async with get_sdk(server.endpoint, AsyncCasdoorSDK) as sdk:
+                users = await sdk.get_all_users(page_size=100)
+                self.assertEqual(len(await sdk.get_all_tokens(page_size=100)), 250)
+                self.assertEqual(len(await sdk.get_all_payments(page_size=100)), 250)
+        self.assertEqual([user["name"] for user in users], [f"item{i}" for i in range(250)])
+        self.assertEqual(len(server.requests), 9)
+        self.assertEqual(server.requests[0][2]["owner"], test_util.TestOrganization)
+
+
+class AsyncIterPagesTest(IsolatedAsyncioTestCase):
+    async def test_one_page_ahead(self):
+        calls = []
+
+        async def fetch_page(p):
+            calls.append(p)
+            return [p] * 2, 10
+
+        pages = aiter_pages(fetch_page, 2)
+        self.assertEqual(await pages.__anext__(), [1, 1])
+        await asyncio.sleep(0.01)
+        # the consumer is busy with page 1: only page 2 has been requested
+        self.assertEqual(calls, [1, 2])
+        self.assertEqual([page async for page in pages], [[2, 2], [3, 3], [4, 4], [5, 5]])
+        self.assertEqual(calls, [1, 2, 3, 4, 5])
+
+    async def test_without_prefetch(self):
+        calls = []
+
+        async def fetch_page(p):
+            calls.append(p)
+            return [p], None if p < 3 else 3
+
+        pages = aiter_pages(fetch_page, 1, prefetch=False)
+        self.assertEqual(await pages.__anext__(), [1])
+        await asyncio.sleep(0.01)
+        self.assertEqual(calls, [1])
+        self.assertEqual([page async for page in pages], [[2], [3]])
+
+    async def test_aclose_cancels_pending_request(self):
+        cancelled = asyncio.Event()
+
+        async def fetch_page(p):
+            if p == 1:
+                return [1], None
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        pages = aiter_pages(fetch_page, 1)
+        self.assertEqual(await pages.__anext__(), [1])
+        await asyncio.sleep(0)
+        await pages.aclose()
+        await asyncio.wait_for(cancelled.wait(), 5)
+
+
+class AsyncSdkIterTest(IsolatedAsyncioTestCase):
+    async def test_aiter(self):
+        endpoint = PagedEndpoint(25)
+        paths = ["users", "roles", "permissions", "tokens", "sessions"]
+        routes = {f"/api/get-{path}": endpoint for path in paths}
+        with test_util.LocalCasdoorServer(routes) as server:
+            async with get_sdk(server.endpoint, AsyncCasdoorSDK) as sdk:
+                for path in paths:
+                    with self.subTest(path):
+                        items = [item async for item in getattr(sdk, f"aiter_{path}")(page_size=10)]
+                        self.assertEqual([item["name"] for item in items], [f"item{i}" for i in range(25)])
+        self.assertEqual(
+            [request[1] for request in server.requests], [f"/api/get-{path}" for path in paths for _ in range(3)]
+        )
+        self.assertEqual(server.requests[0][2]["owner"], test_util.TestOrganization)
+
+    async def test_aiter_resources(self):
+        with test_util.LocalCasdoorServer({"/api/get-resources": PagedEndpoint(3)}) as server:
+            async with get_sdk(server.endpoint, AsyncCasdoorSDK) as sdk:
+                resources = sdk.aiter_resources("built-in", "alice", "name", "a", "name", "asc", page_size=2)
+                self.assertEqual(len([resource async for resource in resources]), 3)
+        self.assertEqual(server.requests[1][2]["user"], "alice")
+
+    async def test_stop_early(self):
+        with test_util.LocalCasdoorServer({"/api/get-users": PagedEndpoint(1000)}) as server:
+            async with get_sdk(server.endpoint, AsyncCasdoorSDK) as sdk:
+                users = sdk.aiter_users(page_size=10)
+                async for user in users:
+                    self.assertEqual(user["name"], "item0")
+                    break
+                await users.aclose()
+                await asyncio.sleep(0.05)
+        self.assertLessEqual(len(server.requests), 2)
+
+    async def test_error(self):
+        routes = {"/api/get-users": lambda query, body: {"status": "error", "msg": "denied"}}
+        with test_util.LocalCasdoorServer(routes) as server:
+            async with get_sdk(server.endpoint, AsyncCasdoorSDK) as sdk:
+                with self.assertRaisesRegex(Exception, "denied"):
+                    [user async for user in sdk.aiter_users()]
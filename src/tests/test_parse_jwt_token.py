@@ -0,0 +1,66 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from unittest import mock
+
+import jwt
+
+import src.tests.test_util as test_util
+from src.casdoor import AsyncCasdoorSDK, CasdoorSDK
+
+
+class ParseJwtTokenTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.private_key, cls.certificate = test_util.generate_signing_key()
+        cls.other_private_key, cls.other_certificate = test_util.generate_signing_key("Rotated Cert")
+
+    def get_sdk(self, sdk_class=CasdoorSDK):
+        return sdk_class(
+            endpoint=test_util.TestEndpoint,
+            client_id=test_util.TestClientId,
+            client_secret=test_util.TestClientSecret,
+            certificate=self.certificate,
+            org_name=test_util.TestOrganization,
+            application_name=test_util.TestApplication,
+        )
+
+    def test_public_key_is_loaded_once(self):
+        for sdk_class in (CasdoorSDK, AsyncCasdoorSDK):
+            sdk = self.get_sdk(sdk_class)
+            token = test_util.sign_token(self.private_key, name="alice")
+            with mock.patch(
+                "cryptography.x509.load_pem_x509_certificate", wraps=test_util.x509.load_pem_x509_certificate
+            ) as load:
+                for _ in range(5):
+                    self.assertEqual(sdk.parse_jwt_token(token)["name"], "alice")
+            self.assertEqual(load.call_count, 1)
+
+    def test_reassigning_certificate_invalidates_key(self):
+        sdk = self.get_sdk()
+        token = test_util.sign_token(self.private_key, name="alice")
+        rotated_token = test_util.sign_token(self.other_private_key, name="bob")
+        self.assertEqual(sdk.parse_jwt_token(token)["name"], "alice")
+
+        sdk.certificate = self.other_certificate
+        self.assertEqual(sdk.parse_jwt_token(rotated_token)["name"], "bob")
+        with self.assertRaises(jwt.InvalidSignatureError):
+            sdk.parse_jwt_token(token)
+
+    def test_certificate_must_be_str(self):
+        sdk = self.get_sdk()
+        sdk.certificate = self.certificate.encode("utf-8")
+        with self.assertRaises(TypeError):
+            sdk.parse_jwt_token(test_util.sign_token(self.private_key))
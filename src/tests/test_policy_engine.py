@@ -0,0 +1,179 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import unittest
+
+import src.tests.test_util as test_util
+from src.casdoor import CasdoorSDK, LocalEnforcer
+from src.casdoor.permission import Permission
+from src.casdoor.role import Role
+
+DECISIONS_PATH = os.path.join(os.path.dirname(__file__), "enforce_decisions.json")
+
+RBAC_MODEL = """
+[request_definition]
+r = sub, obj, act
+
+[policy_definition]
+p = sub, obj, act
+
+[role_definition]
+g = _, _
+
+[policy_effect]
+e = some(where (p.eft == allow))
+
+[matchers]
+m = g(r.sub, p.sub) && r.obj == p.obj \\
+    && r.act == p.act  # trailing comment
+"""
+
+ABAC_MODEL = """
+[request_definition]
+r = sub, obj, act
+
+[policy_definition]
+p = sub, obj, act
+
+[policy_effect]
+e = some(where (p.eft == allow))
+
+[matchers]
+m = r.sub.Owner == r.obj.Owner && r.act == "read" || r.sub.Name == p.sub
+"""
+
+
+def load_cases():
+    with open(DECISIONS_PATH) as f:
+        return json.load(f)
+
+
+class LocalEnforcerDifferentialTest(unittest.TestCase):
+    """
+    Replays recorded decisions of the reference enforcer for Casdoor
+    permissions and roles under several models and effects.
+    """
+
+    def test_recorded_decisions(self):
+        for case in load_cases():
+            with self.subTest(case["name"]):
+                enforcer = LocalEnforcer.from_permissions(
+                    case["modelText"],
+                    [Permission.from_dict(permission) for permission in case["permissions"]],
+                    [Role.from_dict(role) for role in case["roles"]],
+                )
+                self.assertEqual(enforcer.batch_enforce(case["requests"]), case["decisions"])
+
+
+class LocalEnforcerTest(unittest.TestCase):
+    def test_nested_roles(self):
+        enforcer = LocalEnforcer(
+            RBAC_MODEL,
+            [["viewer", "data1", "read"]],
+            {"g": [["alice", "admin"], ["admin", "editor"], ["editor", "viewer"], ["viewer", "admin"]]},
+        )
+        self.assertTrue(enforcer.enforce(["alice", "data1", "read"]))
+        self.assertFalse(enforcer.enforce(["bob", "data1", "read"]))
+
+    def test_abac_attributes(self):
+        enforcer = LocalEnforcer(ABAC_MODEL, [["bob", "", ""]])
+        alice = {"Owner": "built-in", "Name": "alice"}
+        self.assertTrue(enforcer.enforce([alice, {"Owner": "built-in"}, "read"]))
+        self.assertFalse(enforcer.enforce([alice, {"Owner": "other"}, "read"]))
+        self.assertTrue(enforcer.enforce([{"Owner": "x", "Name": "bob"}, {"Owner": "other"}, "write"]))
+
+    def test_invalid_input(self):
+        enforcer = LocalEnforcer(RBAC_MODEL)
+        with self.assertRaises(ValueError):
+            enforcer.enforce(["alice", "data1"])
+        with self.assertRaises(ValueError):
+            LocalEnforcer(RBAC_MODEL.replace("g(r.sub, p.sub)", "unknownFunc(r.sub, p.sub)"))
+        with self.assertRaises(ValueError):
+            LocalEnforcer(RBAC_MODEL.replace("r.obj == p.obj", "r.obj == p.dom"))
+        with self.assertRaises(ValueError):
+            LocalEnforcer(RBAC_MODEL.replace("some(where (p.eft == allow))", "subjectPriority(p.eft) || deny"))
+        with self.assertRaises(ValueError):
+            LocalEnforcer("[request_definition]\nr = sub\n")
+
+
+class LoadLocalEnforcerTest(unittest.TestCase):
+    def setUp(self):
+        case = load_cases()[0]
+        model = {"owner": "built-in", "name": "m", "modelText": case["modelText"]}
+        permissions = case["permissions"] + [dict(case["permissions"][0], name="other", model="other-model")]
+        self.case = case
+        self.server = test_util.LocalCasdoorServer(
+            {
+                "/api/get-model": lambda query, body: {
+                    "status": "ok",
+                    "data": model if query["id"] == "built-in/m" else None,
+                },
+                "/api/get-permissions": lambda query, body: {"status": "ok", "data": permissions},
+                "/api/get-permission": lambda query, body: {
+                    "status": "ok",
+                    "data": next((p for p in permissions if f"built-in/{p['name']}" == query["id"]), None),
+                },
+                "/api/get-roles": lambda query, body: {"status": "ok", "data": case["roles"]},
+            }
+        ).start()
+        self.sdk = self.get_sdk("built-in")
+
+    def get_sdk(self, org_name):
+        return CasdoorSDK(
+            self.server.endpoint,
+            test_util.TestClientId,
+            test_util.TestClientSecret,
+            test_util.TestJwtPublicKey,
+            org_name,
+            test_util.TestApplication,
+        )
+
+    def tearDown(self):
+        self.sdk.close()
+        self.server.stop()
+
+    def test_by_model(self):
+        enforcer = self.sdk.load_local_enforcer(model_id="built-in/m")
+        self.assertEqual(enforcer.batch_enforce(self.case["requests"]), self.case["decisions"])
+        self.assertEqual(len(enforcer.policies), 8)
+
+    def test_by_permission(self):
+        enforcer = self.sdk.load_local_enforcer(permission_id="built-in/p-viewer")
+        # sub-roles pass a role down to their members, not up: admin lists editor and viewer below it
+        self.assertTrue(enforcer.enforce(["built-in/carol", "data1", "read"]))
+        self.assertFalse(enforcer.enforce(["built-in/alice", "data1", "read"]))
+        self.assertFalse(enforcer.enforce(["built-in/carol", "data2", "read"]))
+        self.assertEqual(self.server.requests[0][2]["id"], "built-in/p-viewer")
+
+    def test_uses_the_owner_in_the_id(self):
+        with self.get_sdk("other-org") as sdk:
+            enforcer = sdk.load_local_enforcer(permission_id="built-in/p-viewer")
+            self.assertTrue(enforcer.enforce(["built-in/carol", "data1", "read"]))
+            self.assertEqual(len(sdk.load_local_enforcer(model_id="built-in/m").policies), 8)
+        self.assertEqual(
+            [request[2].get("id", request[2].get("owner")) for request in self.server.requests],
+            ["built-in/p-viewer", "built-in/m", "built-in", "built-in", "built-in/m", "built-in"],
+        )
+
+    def test_missing_permission_or_model(self):
+        with self.assertRaisesRegex(ValueError, "built-in/missing"):
+            self.sdk.load_local_enforcer(permission_id="built-in/missing")
+        with self.assertRaisesRegex(ValueError, "built-in/other-model"):
+            self.sdk.load_local_enforcer(permission_id="built-in/other")
+
+    def test_requires_one_selector(self):
+        with self.assertRaises(ValueError):
+            self.sdk.load_local_enforcer()
@@ -0,0 +1,109 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import random
+import unittest
+
+from src.casdoor import LocalEnforcer
+from src.casdoor.policy_index import _pattern_key
+
+MODEL = """
+[request_definition]
+r = sub, dom, obj, act
+
+[policy_definition]
+p = sub, dom, obj, act, eft
+
+[role_definition]
+g = _, _, _
+
+[policy_effect]
+e = {effect}
+
+[matchers]
+m = {matcher}
+"""
+
+MATCHERS = [
+    "g(r.sub, p.sub, r.dom) && r.dom == p.dom && keyMatch2(r.obj, p.obj) && r.act == p.act",
+    "g(r.sub, p.sub, r.dom) && keyMatch(r.obj, p.obj) && regexMatch(r.act, p.act)",
+    "r.sub == p.sub && (globMatch(r.obj, p.obj) || r.obj == p.obj) && keyMatch3(r.dom, p.dom)",
+    "g(r.sub, p.sub, r.dom) && r.act == p.act || r.sub == 'root'",
+]
+EFFECTS = ["some(where (p.eft == allow))", "!some(where (p.eft == deny))", "priority(p.eft) || deny"]
+
+OBJECTS = ["/api/users/:id", "/api/users/*", "/api/*", "/api/orders/:id/items", "*", "/static/app.js", "/a.b", "/ab*"]
+ACTIONS = ["read", "write", "^read$", "^(read|write)$", "wr.*"]
+DOMAINS = ["tenant1", "tenant2", "{tenant}", "tenant*"]
+REQUEST_OBJECTS = ["/api/users/1", "/api/users/1/keys", "/api/orders/7/items", "/static/app.js", "/axb", "/a", "/abbb"]
+
+
+def random_enforcer(rng, matcher, effect, use_index):
+    subjects = [f"user{i}" for i in range(6)] + [f"role{i}" for i in range(3)]
+    policies = [
+        [
+            rng.choice(subjects),
+            rng.choice(DOMAINS),
+            rng.choice(OBJECTS),
+            rng.choice(ACTIONS),
+            rng.choice(["allow", "allow", "deny"]),
+        ]
+        for _ in range(200)
+    ]
+    grouping = [[f"user{i}", f"role{i % 3}", rng.choice(["tenant1", "tenant2"])] for i in range(6)]
+    grouping.append(["role0", "role1", "tenant1"])
+    return LocalEnforcer(MODEL.format(effect=effect, matcher=matcher), policies, {"g": grouping}, use_index=use_index)
+
+
+class PolicyIndexTest(unittest.TestCase):
+    def test_pattern_keys(self):
+        self.assertEqual(_pattern_key("keyMatch2", "/api/users/:id"), (False, "/api/users/"))
+        self.assertEqual(_pattern_key("keyMatch2", "/api/users"), (True, "/api/users"))
+        self.assertEqual(_pattern_key("keyMatch2", "*"), (False, ""))
+        self.assertEqual(_pattern_key("keyMatch2", "/ab*"), (False, "/a"))
+        self.assertEqual(_pattern_key("keyMatch", "/api/*"), (False, "/api/"))
+        self.assertEqual(_pattern_key("globMatch", "/static/?.js"), (False, "/static/"))
+        self.assertEqual(_pattern_key("regexMatch", "^read$"), (True, "read"))
+        self.assertEqual(_pattern_key("regexMatch", "^(read|write)$"), (False, ""))
+        self.assertEqual(_pattern_key("regexMatch", "read"), (False, ""))
+
+    def test_same_decisions_as_full_scan(self):
+        rng = random.Random(7)
+        for matcher in MATCHERS:
+            for effect in EFFECTS:
+                with self.subTest(matcher=matcher, effect=effect):
+                    seed = rng.random()
+                    indexed = random_enforcer(random.Random(seed), matcher, effect, True)
+                    scanned = random_enforcer(random.Random(seed), matcher, effect, False)
+                    for _ in range(300):
+                        request = [
+                            rng.choice([f"user{i}" for i in range(7)] + ["role1", "root"]),
+                            rng.choice(["tenant1", "tenant2", "tenant3"]),
+                            rng.choice(REQUEST_OBJECTS),
+                            rng.choice(["read", "write", "delete"]),
+                        ]
+                        self.assertEqual(indexed.enforce(request), scanned.enforce(request), request)
+
+    def test_candidates_are_narrowed(self):
+        policies = [[f"user{i}", "tenant1", f"/api/resource{i}/:id", "read", "allow"] for i in range(1000)]
+        enforcer = LocalEnforcer(MODEL.format(effect=EFFECTS[0], matcher=MATCHERS[0]), policies)
+        candidates = enforcer._index.candidates(["user5", "tenant1", "/api/resource5/1", "read"])
+        self.assertEqual(candidates, [policies[5]])
+        self.assertTrue(enforcer.enforce(["user5", "tenant1", "/api/resource5/1", "read"]))
+        self.assertFalse(enforcer.enforce(["user5", "tenant1", "/api/resource6/1", "read"]))
+
+    def test_unindexable_matchers_scan(self):
+        enforcer = LocalEnforcer(MODEL.format(effect=EFFECTS[0], matcher=MATCHERS[3]), [["a", "b", "c", "d", "allow"]])
+        self.assertEqual(len(enforcer._index.fields), 0)
+        self.assertTrue(enforcer.enforce(["root", "x", "y", "z"]))
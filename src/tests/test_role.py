@@ -13,11 +13,15 @@
 # limitations under the License.
 
 import datetime
+import json
+import threading
 import unittest
+from unittest import IsolatedAsyncioTestCase
 
-from src.casdoor import CasdoorSDK
+from src.casdoor import AsyncCasdoorSDK, CasdoorSDK
 from src.casdoor.role import Role
 from src.tests.test_util import (
+    LocalCasdoorServer,
     TestApplication,
     TestClientId,
     TestClientSecret,
@@ -91,3 +95,96 @@ class RoleTest(unittest.TestCase):
         except Exception as e:
             self.fail(f"Failed to get object: {e}")
         self.assertIsNone(deleted_role, "Failed to delete object, it's still retrievable")
+
+
+class RoleStore:
+    """
+    Stand-in for Casdoor's get-role and update-role endpoints. When
+    competing_users is set, the next update is overwritten by a concurrent
+    writer that had read the role before it.
+    """
+
+    def __init__(self, users):
+        self.role = {"owner": TestOrganization, "name": "staff", "users": users, "roles": [], "domains": []}
+        self.competing_users = None
+        self._lock = threading.Lock()
+
+    def get(self, query, body):
+        with self._lock:
+            return {"status": "ok", "data": json.loads(json.dumps(self.role))}
+
+    def update(self, query, body):
+        with self._lock:
+            self.role = json.loads(body)
+            if self.competing_users is not None:
+                self.role["users"] = self.competing_users
+                self.competing_users = None
+        return {"status": "ok", "data": "Affected"}
+
+    def routes(self):
+        return {"/api/get-role": self.get, "/api/update-role": self.update}
+
+
+def user_ids(*names):
+    return [f"{TestOrganization}/{name}" for name in names]
+
+
+class RoleUsersTest(unittest.TestCase):
+    def setUp(self):
+        self.store = RoleStore(user_ids("alice", "bob"))
+        self.server = LocalCasdoorServer(self.store.routes()).start()
+        self.sdk = CasdoorSDK(
+            self.server.endpoint, TestClientId, TestClientSecret, TestJwtPublicKey, TestOrganization, TestApplication
+        )
+
+    def tearDown(self):
+        self.server.stop()
+
+    def paths(self):
+        return [request[1] for request in self.server.requests]
+
+    def test_assign_many_users_in_one_write(self):
+        usernames = [f"user{i}" for i in range(10000)] + ["alice"]
+        self.sdk.assign_users_to_role("staff", usernames)
+        self.assertEqual(self.paths(), ["/api/get-role", "/api/update-role", "/api/get-role"])
+        self.assertEqual(self.store.role["users"], user_ids("alice", "bob", *[f"user{i}" for i in range(10000)]))
+
+    def test_remove_users(self):
+        self.sdk.remove_users_from_role("staff", ["alice", "carol"])
+        self.assertEqual(self.store.role["users"], user_ids("bob"))
+
+    def test_no_change_skips_the_write(self):
+        response = self.sdk.assign_users_to_role("staff", ["bob"])
+        self.assertEqual(response["status"], "ok")
+        self.assertEqual(self.paths(), ["/api/get-role"])
+
+    def test_concurrent_update_is_retried(self):
+        self.store.competing_users = user_ids("alice", "bob", "dave")
+        self.sdk.assign_users_to_role("staff", ["carol"])
+        self.assertEqual(self.store.role["users"], user_ids("alice", "bob", "dave", "carol"))
+        self.assertEqual(self.paths().count("/api/update-role"), 2)
+
+    def test_gives_up_after_max_attempts(self):
+        self.store.competing_users = user_ids("alice", "bob")
+        with self.assertRaisesRegex(Exception, "modified concurrently"):
+            self.sdk.assign_users_to_role("staff", ["carol"], max_attempts=1)
+
+
+class AsyncRoleUsersTest(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.store = RoleStore(user_ids("alice", "bob"))
+        self.server = LocalCasdoorServer(self.store.routes()).start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    async def test_assign_and_remove(self):
+        async with AsyncCasdoorSDK(
+            self.server.endpoint, TestClientId, TestClientSecret, TestJwtPublicKey, TestOrganization, TestApplication
+        ) as sdk:
+            self.store.competing_users = user_ids("alice", "bob", "dave")
+            await sdk.assign_users_to_role("staff", ["carol", "erin"])
+            self.assertEqual(self.store.role["users"], user_ids("alice", "bob", "dave", "carol", "erin"))
+
+            await sdk.remove_users_from_role("staff", ["alice", "erin"])
+            self.assertEqual(self.store.role["users"], user_ids("bob", "dave", "carol"))
@@ -0,0 +1,189 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import threading
+import time
+import unittest
+from unittest import IsolatedAsyncioTestCase
+
+import src.tests.test_util as test_util
+from src.casdoor import AsyncCasdoorSDK, CasdoorSDK, RoleGraph
+from src.casdoor.role import Role
+
+ORG = test_util.TestOrganization
+
+
+def role(name, users=(), roles=()):
+    return {
+        "owner": ORG,
+        "name": name,
+        "users": [f"{ORG}/{user}" for user in users],
+        "roles": [f"{ORG}/{sub_role}" for sub_role in roles],
+        "domains": [],
+        "isEnabled": True,
+    }
+
+
+ROLES = [
+    role("admin", users=["alice"], roles=["editor"]),
+    role("editor", users=["bob"], roles=["viewer-lead"]),
+    role("viewer-lead", users=["carol"]),
+    role("auditor", users=["carol", "dave"]),
+    # a cycle must not loop forever
+    role("ping", users=["erin"], roles=["pong"]),
+    role("pong", roles=["ping"]),
+]
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class RolesEndpoint:
+    def __init__(self, roles):
+        self.roles = roles
+        self.calls = 0
+        self.delay = 0.0
+
+    def __call__(self, query, body):
+        time.sleep(self.delay)
+        self.calls += 1
+        return {"status": "ok", "data": self.roles}
+
+
+def get_sdk(sdk_class, endpoint, **kwargs):
+    return sdk_class(
+        endpoint=endpoint,
+        client_id=test_util.TestClientId,
+        client_secret=test_util.TestClientSecret,
+        certificate=test_util.TestJwtPublicKey,
+        org_name=ORG,
+        application_name=test_util.TestApplication,
+        **kwargs,
+    )
+
+
+class RoleGraphTest(unittest.TestCase):
+    def test_inheritance_closure(self):
+        graph = RoleGraph([Role.from_dict(r) for r in ROLES])
+        self.assertEqual(len(graph), 6)
+        self.assertEqual(
+            graph.inherited_role_ids(f"{ORG}/viewer-lead"), {f"{ORG}/{r}" for r in ("viewer-lead", "editor", "admin")}
+        )
+        self.assertEqual(
+            graph.user_role_ids(f"{ORG}/carol"), {f"{ORG}/{r}" for r in ("viewer-lead", "editor", "admin", "auditor")}
+        )
+        self.assertEqual(graph.user_role_ids(f"{ORG}/carol", inherited=False), {f"{ORG}/viewer-lead", f"{ORG}/auditor"})
+        self.assertEqual(graph.user_role_ids(f"{ORG}/alice"), {f"{ORG}/admin"})
+        self.assertEqual(graph.user_role_ids(f"{ORG}/erin"), {f"{ORG}/ping", f"{ORG}/pong"})
+        self.assertEqual(graph.user_role_ids(f"{ORG}/nobody"), set())
+
+        self.assertTrue(graph.has_role(f"{ORG}/bob", f"{ORG}/admin"))
+        self.assertFalse(graph.has_role(f"{ORG}/alice", f"{ORG}/editor"))
+        self.assertEqual([r.name for r in graph.get_user_roles(f"{ORG}/bob")], ["admin", "editor"])
+
+    def test_role_dicts(self):
+        graph = RoleGraph(ROLES)
+        self.assertEqual([r["name"] for r in graph.get_user_roles(f"{ORG}/dave")], ["auditor"])
+
+
+class RoleGraphRefresherTest(unittest.TestCase):
+    def setUp(self):
+        self.endpoint = RolesEndpoint(ROLES)
+        self.server = test_util.LocalCasdoorServer(
+            {"/api/get-roles": self.endpoint, "/api/update-role": lambda query, body: {"status": "ok"}}
+        ).start()
+        self.sdk = get_sdk(CasdoorSDK, self.server.endpoint, role_graph_ttl=60)
+        self.timer = FakeTimer()
+        self.sdk.role_graph._snapshot.timer = self.timer
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_get_user_roles(self):
+        self.assertEqual([r.name for r in self.sdk.get_user_roles("carol")], ["viewer-lead", "auditor"])
+        self.assertEqual(
+            [r.name for r in self.sdk.get_user_roles("carol", inherited=True)],
+            ["admin", "editor", "viewer-lead", "auditor"],
+        )
+        self.assertEqual(self.endpoint.calls, 1)
+
+    def test_stale_graph_is_served_while_refreshing(self):
+        first = self.sdk.get_role_graph()
+        self.endpoint.delay = 0.2
+        self.timer.now = 61
+        self.assertIs(self.sdk.get_role_graph(), first)
+        self.assertIs(self.sdk.get_role_graph(), first)
+        deadline = time.monotonic() + 5
+        while self.sdk.role_graph.refresh_count < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.endpoint.calls, 2)
+        self.assertIsNot(self.sdk.get_role_graph(), first)
+
+    def test_role_changes_invalidate(self):
+        self.sdk.get_user_roles("alice")
+        self.sdk.update_role(Role.from_dict(ROLES[0]))
+        self.sdk.get_user_roles("alice")
+        self.assertEqual(self.endpoint.calls, 2)
+
+    def test_concurrent_cold_start_loads_once(self):
+        self.endpoint.delay = 0.1
+        threads = [threading.Thread(target=self.sdk.get_role_graph) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.endpoint.calls, 1)
+
+    def test_without_refresher(self):
+        sdk = get_sdk(CasdoorSDK, self.server.endpoint)
+        sdk.get_user_roles("alice")
+        sdk.get_user_roles("alice")
+        self.assertEqual(self.endpoint.calls, 2)
+
+
+class AsyncRoleGraphRefresherTest(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.endpoint = RolesEndpoint(ROLES)
+        self.server = test_util.LocalCasdoorServer(
+            {"/api/get-roles": self.endpoint, "/api/update-role": lambda query, body: {"status": "ok"}}
+        ).start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    async def test_get_user_roles(self):
+        async with get_sdk(AsyncCasdoorSDK, self.server.endpoint, role_graph_ttl=60) as sdk:
+            timer = FakeTimer()
+            sdk.role_graph._snapshot.timer = timer
+            roles = await sdk.get_user_roles("bob", inherited=True)
+            self.assertEqual([r["name"] for r in roles], ["admin", "editor"])
+            self.assertEqual([r["name"] for r in await sdk.get_user_roles("bob")], ["editor"])
+            self.assertEqual(self.endpoint.calls, 1)
+
+            # stale: served as is while a task refreshes it
+            first = await sdk.get_role_graph()
+            timer.now = 61
+            self.assertIs(await sdk.get_role_graph(), first)
+            await sdk.role_graph._refresh_task
+            self.assertEqual(self.endpoint.calls, 2)
+
+            await sdk.update_role(json.loads(json.dumps(ROLES[1])))
+            self.assertIsNot(await sdk.get_role_graph(), first)
+            self.assertEqual(self.endpoint.calls, 3)
@@ -0,0 +1,123 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from datetime import datetime
+
+from src.casdoor.adapter import Adapter
+from src.casdoor.application import Application
+from src.casdoor.cert import Cert
+from src.casdoor.enforcer import Enforcer
+from src.casdoor.group import Group
+from src.casdoor.model import Model
+from src.casdoor.organization import Organization
+from src.casdoor.payment import Payment
+from src.casdoor.permission import Permission
+from src.casdoor.plan import Plan
+from src.casdoor.pricing import Pricing
+from src.casdoor.product import Product
+from src.casdoor.provider import Provider
+from src.casdoor.resource import Resource
+from src.casdoor.role import Role
+from src.casdoor.schema import schema_of
+from src.casdoor.session import Session
+from src.casdoor.subscription import Subscription
+from src.casdoor.syncer import Syncer
+from src.casdoor.token import Token
+from src.casdoor.user import User
+from src.casdoor.webhook import Webhook
+
+ENTITIES = [
+    Adapter,
+    Application,
+    Cert,
+    Enforcer,
+    Group,
+    Model,
+    Organization,
+    Payment,
+    Permission,
+    Plan,
+    Pricing,
+    Product,
+    Provider,
+    Role,
+    Session,
+    Subscription,
+    Syncer,
+    Token,
+    User,
+    Webhook,
+]
+
+
+def legacy_from_dict(cls, data):
+    entity = cls()
+    for key, value in data.items():
+        if hasattr(entity, key):
+            setattr(entity, key, value)
+    return entity
+
+
+class EntitySchemaTest(unittest.TestCase):
+    def test_same_result_as_setattr_loop(self):
+        for cls in ENTITIES:
+            with self.subTest(cls.__name__):
+                fields = list(cls().__dict__)
+                layouts = [
+                    {"name": "n", "owner": "o", "unknownField": 1},
+                    {field: f"value-{field}" for field in fields[::2]},
+                    {},
+                ]
+                generated = getattr(cls, "_default_factories", {})
+                for data in layouts:
+                    entity = cls.from_dict(data) if data else schema_of(cls).from_dict(data)
+                    self.assertIs(type(entity), cls)
+                    expected = legacy_from_dict(cls, data).__dict__
+                    for name in generated:
+                        if name not in data:
+                            del expected[name], entity.__dict__[name]
+                    self.assertEqual(entity.__dict__, expected)
+                    self.assertEqual(list(entity.__dict__), [field for field in fields if field in expected])
+
+    def test_mutable_defaults_are_not_shared(self):
+        first, second = Role.from_dict({"name": "a"}), Role.from_dict({"name": "b"})
+        first.users.append("built-in/alice")
+        self.assertEqual(second.users, [""])
+        self.assertEqual(Role().users, [""])
+        self.assertEqual(schema_of(Role).new().users, [""])
+
+    def test_per_instance_defaults(self):
+        schema_of(Subscription)
+        before = datetime.now().isoformat()
+        subscription = Subscription.from_dict({"name": "a"})
+        self.assertGreaterEqual(subscription.startTime, before)
+        self.assertEqual(Subscription.from_dict({"startTime": "2025-01-01"}).startTime, "2025-01-01")
+
+    def test_given_values_are_kept(self):
+        users = ["built-in/alice"]
+        role = Role.from_dict({"name": "a", "users": users})
+        self.assertIs(role.users, users)
+
+    def test_to_dict_is_a_copy(self):
+        role = Role.from_dict({"name": "a"})
+        data = role.to_dict()
+        data["name"] = "b"
+        self.assertEqual(role.name, "a")
+        self.assertEqual(data, dict(role.__dict__, name="b"))
+
+    def test_resource_keeps_unknown_keys(self):
+        resource = Resource.from_dict({"name": "a", "unknownField": 1})
+        self.assertEqual(resource.unknownField, 1)
+        self.assertEqual(resource.fileSize, 0)
@@ -0,0 +1,108 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from unittest import mock
+
+import src.tests.test_util as test_util
+from src.casdoor import AsyncCasdoorSDK, CasdoorSDK, TokenCache
+
+
+class FakeTimer:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TokenCacheTest(unittest.TestCase):
+    def test_expires_at_exp(self):
+        timer = FakeTimer()
+        cache = TokenCache(timer=timer)
+        cache.set("token", {"name": "alice", "exp": 1010})
+        self.assertEqual(cache.get("token"), {"name": "alice", "exp": 1010})
+
+        timer.now = 1010
+        self.assertIsNone(cache.get("token"))
+        self.assertEqual(len(cache), 0)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_ttl_bounds_lifetime(self):
+        timer = FakeTimer()
+        cache = TokenCache(ttl=5, timer=timer)
+        cache.set("token", {"exp": 2000})
+        cache.set("no-exp", {"name": "app"})
+        timer.now = 1004
+        self.assertIsNotNone(cache.get("token"))
+        self.assertIsNotNone(cache.get("no-exp"))
+        timer.now = 1005
+        self.assertIsNone(cache.get("token"))
+        self.assertIsNone(cache.get("no-exp"))
+
+    def test_tokens_without_exp_are_not_cached_by_default(self):
+        cache = TokenCache(timer=FakeTimer())
+        cache.set("token", {"name": "app"})
+        self.assertEqual(len(cache), 0)
+
+    def test_lru_eviction(self):
+        cache = TokenCache(max_size=2, timer=FakeTimer())
+        cache.set("a", {"exp": 2000})
+        cache.set("b", {"exp": 2000})
+        cache.get("a")
+        cache.set("c", {"exp": 2000})
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("c"))
+
+    def test_returned_claims_are_copies(self):
+        cache = TokenCache(timer=FakeTimer())
+        cache.set("token", {"exp": 2000, "name": "alice"})
+        cache.get("token")["name"] = "mallory"
+        self.assertEqual(cache.get("token")["name"], "alice")
+
+
+class ParseJwtTokenCacheTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.private_key, cls.certificate = test_util.generate_signing_key()
+
+    def get_sdk(self, sdk_class):
+        return sdk_class(
+            endpoint=test_util.TestEndpoint,
+            client_id=test_util.TestClientId,
+            client_secret=test_util.TestClientSecret,
+            certificate=self.certificate,
+            org_name=test_util.TestOrganization,
+            application_name=test_util.TestApplication,
+            token_cache=TokenCache(max_size=16),
+        )
+
+    def test_parse_jwt_token_uses_cache(self):
+        for sdk_class in (CasdoorSDK, AsyncCasdoorSDK):
+            sdk = self.get_sdk(sdk_class)
+            token = test_util.sign_token(self.private_key, name="alice")
+            with mock.patch("jwt.decode", wraps=test_util.jwt.decode) as decode:
+                for _ in range(3):
+                    self.assertEqual(sdk.parse_jwt_token(token)["name"], "alice")
+                sdk.parse_jwt_token(token, leeway=10)
+            self.assertEqual(decode.call_count, 2)
+            self.assertEqual((sdk.token_cache.hits, sdk.token_cache.misses), (2, 1))
+
+    def test_certificate_change_clears_cache(self):
+        sdk = self.get_sdk(CasdoorSDK)
+        sdk.parse_jwt_token(test_util.sign_token(self.private_key))
+        self.assertEqual(len(sdk.token_cache), 1)
+        sdk.certificate = self.certificate
+        self.assertEqual(len(sdk.token_cache), 0)
@@ -0,0 +1,153 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import IsolatedAsyncioTestCase
+
+import src.tests.test_util as test_util
+from src.casdoor import (
+    AsyncCasdoorSDK,
+    AsyncClientCredentialsTokenManager,
+    CasdoorSDK,
+    ClientCredentialsTokenManager,
+)
+
+TOKEN_PATH = "/api/login/oauth/access_token"
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TokenEndpoint:
+    """
+    Stand-in for Casdoor's token endpoint issuing numbered tokens slowly
+    enough for concurrent callers to pile up.
+    """
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.issued = 0
+        self.failing = False
+        self._lock = threading.Lock()
+
+    def __call__(self, query, body):
+        time.sleep(self.delay)
+        if self.failing:
+            return {"error": "invalid_client", "error_description": "client is disabled"}
+        with self._lock:
+            self.issued += 1
+            return {"access_token": f"token-{self.issued}", "expires_in": 3600, "token_type": "Bearer"}
+
+
+def get_sdk(sdk_class, endpoint):
+    return sdk_class(
+        endpoint=endpoint,
+        client_id=test_util.TestClientId,
+        client_secret=test_util.TestClientSecret,
+        certificate=test_util.TestJwtPublicKey,
+        org_name=test_util.TestOrganization,
+        application_name=test_util.TestApplication,
+    )
+
+
+class ClientCredentialsTokenManagerTest(unittest.TestCase):
+    def setUp(self):
+        self.token_endpoint = TokenEndpoint()
+        self.server = test_util.LocalCasdoorServer({TOKEN_PATH: self.token_endpoint}).start()
+        self.sdk = get_sdk(CasdoorSDK, self.server.endpoint)
+        self.timer = FakeTimer()
+        self.manager = ClientCredentialsTokenManager(self.sdk, refresh_margin=60, timer=self.timer)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_cold_start_is_single_flight(self):
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            tokens = list(executor.map(lambda _: self.manager.get_access_token(), range(32)))
+        self.assertEqual(set(tokens), {"token-1"})
+        self.assertEqual(self.token_endpoint.issued, 1)
+        self.assertEqual(self.manager.metrics()["refresh_count"], 1)
+        self.assertGreater(self.manager.metrics()["last_refresh_latency"], 0)
+
+    def test_proactive_refresh(self):
+        self.assertEqual(self.manager.get_access_token(), "token-1")
+        self.timer.now = 3539
+        self.assertEqual(self.manager.get_access_token(), "token-1")
+        self.timer.now = 3540
+        self.assertEqual(self.manager.get_access_token(), "token-2")
+        self.assertEqual(self.token_endpoint.issued, 2)
+
+    def test_failures(self):
+        self.token_endpoint.failing = True
+        with self.assertRaises(ValueError):
+            self.manager.get_access_token()
+        self.assertEqual(self.manager.metrics()["failure_count"], 1)
+
+        self.token_endpoint.failing = False
+        self.assertEqual(self.manager.get_access_token(), "token-1")
+
+        # a failed proactive refresh keeps serving the still valid token
+        self.token_endpoint.failing = True
+        self.timer.now = 3550
+        self.assertEqual(self.manager.get_access_token(), "token-1")
+        self.assertEqual(self.manager.metrics()["failure_count"], 2)
+
+    def test_sdk_has_manager(self):
+        self.assertIsInstance(self.sdk.token_manager, ClientCredentialsTokenManager)
+        self.assertEqual(self.sdk.token_manager.get_access_token(), "token-1")
+        self.assertEqual(self.server.requests[0][1], TOKEN_PATH)
+
+
+class AsyncClientCredentialsTokenManagerTest(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.token_endpoint = TokenEndpoint()
+        self.server = test_util.LocalCasdoorServer({TOKEN_PATH: self.token_endpoint}).start()
+        self.timer = FakeTimer()
+
+    def tearDown(self):
+        self.server.stop()
+
+    async def test_cold_start_is_single_flight(self):
+        async with get_sdk(AsyncCasdoorSDK, self.server.endpoint) as sdk:
+            manager = AsyncClientCredentialsTokenManager(sdk, timer=self.timer)
+            tokens = await asyncio.gather(*(manager.get_access_token() for _ in range(50)))
+        self.assertEqual(set(tokens), {"token-1"})
+        self.assertEqual(self.token_endpoint.issued, 1)
+
+    async def test_proactive_refresh_in_background(self):
+        async with get_sdk(AsyncCasdoorSDK, self.server.endpoint) as sdk:
+            manager = AsyncClientCredentialsTokenManager(sdk, timer=self.timer)
+            self.assertEqual(await manager.get_access_token(), "token-1")
+            self.timer.now = 3545
+            tokens = await asyncio.gather(*(manager.get_access_token() for _ in range(10)))
+            self.assertEqual(set(tokens), {"token-1"})
+            await manager._refresh_task
+            self.assertEqual(await manager.get_access_token(), "token-2")
+        self.assertEqual(self.token_endpoint.issued, 2)
+
+    async def test_failures_reach_waiters(self):
+        self.token_endpoint.failing = True
+        async with get_sdk(AsyncCasdoorSDK, self.server.endpoint) as sdk:
+            results = await asyncio.gather(*(sdk.token_manager.get_token() for _ in range(5)), return_exceptions=True)
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+        self.assertEqual(sdk.token_manager.metrics()["failure_count"], 1)
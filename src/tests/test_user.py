@@ -13,11 +13,12 @@
 # limitations under the License.
 
 import datetime
+import json
 import unittest
 
 import src.tests.test_util as test_util
 from src.casdoor import CasdoorSDK
-from src.casdoor.user import User
+from src.casdoor.user import CompactUser, User
 
 
 class UserTest(unittest.TestCase):
@@ -124,3 +125,54 @@ class UserTest(unittest.TestCase):
         self.assertIsInstance(users, list, "The returned result is not a list")
         for user in users:
             self.assertIsInstance(user, User, "There are non User type objects in the list")
+
+
+class CompactUserTest(unittest.TestCase):
+    def test_same_fields_as_user(self):
+        data = User.new("built-in", "alice", "2025-01-01", "Alice", "alice@example.com").to_dict()
+        data.update(github="alice-gh", score=3, roles=[{"name": "admin"}], unknownField="x")
+        data = json.loads(json.dumps(data))
+
+        user = CompactUser.from_dict(data)
+        self.assertEqual(user.to_dict(), User.from_dict(data).to_dict())
+        self.assertEqual(user.get_id(), "built-in/alice")
+        self.assertEqual((user.github, user.google, user.isAdmin), ("alice-gh", "", False))
+        self.assertFalse(hasattr(user, "unknownField"))
+        self.assertFalse(hasattr(user, "__dict__"))
+        with self.assertRaises(AttributeError):
+            user.unknownField = "x"
+
+    def test_defaults_are_not_stored(self):
+        user = CompactUser.from_dict({"name": "bob", "google": "", "address": [], "properties": {}})
+        self.assertFalse(_stored(user, "google"))
+        self.assertFalse(_stored(user, "address"))
+        self.assertTrue(_stored(user, "name"))
+
+        # a mutable default is kept once handed out
+        user.address.append("Street 1")
+        self.assertEqual(user.to_dict()["address"], ["Street 1"])
+
+    def test_sdk_option(self):
+        users = [User.new("built-in", f"user{i}", "", "").to_dict() for i in range(3)]
+        routes = {"/api/get-users": lambda query, body: {"status": "ok", "data": users}}
+        with test_util.LocalCasdoorServer(routes) as server:
+            sdk = CasdoorSDK(
+                server.endpoint,
+                test_util.TestClientId,
+                test_util.TestClientSecret,
+                test_util.TestJwtPublicKey,
+                test_util.TestOrganization,
+                test_util.TestApplication,
+                compact_users=True,
+            )
+            result = sdk.get_users()
+        self.assertEqual([type(user) for user in result], [CompactUser] * 3)
+        self.assertEqual([user.name for user in result], ["user0", "user1", "user2"])
+
+
+def _stored(user, name):
+    try:
+        CompactUser.__dict__[name].__get__(user, CompactUser)
+        return True
+    except AttributeError:
+        return False
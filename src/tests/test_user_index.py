@@ -0,0 +1,176 @@
+# Copyright 2025 The Casdoor Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import unittest
+from unittest import IsolatedAsyncioTestCase
+
+import src.tests.test_util as test_util
+from src.casdoor import AsyncCasdoorSDK, CasdoorSDK, User, UserIndex
+
+
+def user_data(name, **fields):
+    data = {"owner": "built-in", "name": name, "id": f"uid-{name}", "email": f"{name}@example.com", "phone": ""}
+    return dict(data, **fields)
+
+
+class UserIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.index = UserIndex([user_data("alice", phone="5550100"), User.from_dict(user_data("bob"))])
+
+    def test_lookups(self):
+        self.assertEqual(len(self.index), 2)
+        self.assertIn("built-in/alice", self.index)
+        for field, value in (
+            ("id", "built-in/alice"),
+            ("email", "alice@example.com"),
+            ("phone", "5550100"),
+            ("userId", "uid-alice"),
+        ):
+            self.assertEqual(self.index.get(field, value)["name"], "alice")
+        self.assertEqual(self.index.get("email", "bob@example.com")["name"], "bob")
+        self.assertIsNone(self.index.get("phone", ""))
+        self.assertIsNone(self.index.get("email", "carol@example.com"))
+
+    def test_lookups_return_copies(self):
+        self.index.get("id", "built-in/alice")["email"] = "changed"
+        self.assertEqual(self.index.get("id", "built-in/alice")["email"], "alice@example.com")
+
+    def test_put_moves_keys(self):
+        self.index.put(user_data("alice", email="alice@new.example.com"))
+        self.assertIsNone(self.index.get("email", "alice@example.com"))
+        self.assertIsNone(self.index.get("phone", "5550100"))
+        self.assertEqual(self.index.get("email", "alice@new.example.com")["name"], "alice")
+        self.assertEqual(len(self.index), 2)
+
+    def test_remove(self):
+        self.index.remove("built-in/alice")
+        self.index.remove("built-in/carol")
+        for field, value in (("id", "built-in/alice"), ("email", "alice@example.com"), ("userId", "uid-alice")):
+            self.assertIsNone(self.index.get(field, value))
+        self.assertEqual(len(self.index), 1)
+
+    def test_shared_key(self):
+        self.index.put(user_data("carol", email="bob@example.com"))
+        self.assertEqual(self.index.get("email", "bob@example.com")["name"], "carol")
+        self.index.remove("built-in/bob")
+        self.assertEqual(self.index.get("email", "bob@example.com")["name"], "carol")
+
+    def test_load_replaces_snapshot(self):
+        self.index.load([user_data("carol")])
+        self.assertIsNone(self.index.get("id", "built-in/alice"))
+        self.assertEqual(self.index.get("userId", "uid-carol")["name"], "carol")
+        self.index.clear()
+        self.assertEqual(len(self.index), 0)
+
+
+class UserStore:
+    def __init__(self, count):
+        self.users = {f"built-in/user{i}": user_data(f"user{i}", phone=f"555{i:04}") for i in range(count)}
+
+    def get_users(self, query, body):
+        users = list(self.users.values())
+        p, page_size = int(query["p"]), int(query["pageSize"])
+        return {"status": "ok", "data": users[(p - 1) * page_size : p * page_size], "data2": len(users)}
+
+    def get_user(self, query, body):
+        field, value = next((key, value) for key, value in query.items() if key in ("id", "email", "phone", "userId"))
+        if field == "id":
+            return {"status": "ok", "data": self.users.get(value)}
+        key = "id" if field == "userId" else field
+        matches = [user for user in self.users.values() if user[key] == value]
+        return {"status": "ok", "data": matches[0] if matches else None}
+
+    def update_user(self, query, body):
+        self.users[query["id"]] = json.loads(body)
+        return {"status": "ok", "data": "Affected"}
+
+    def delete_user(self, query, body):
+        del self.users[query["id"]]
+        return {"status": "ok", "data": "Affected"}
+
+    def routes(self):
+        return {
+            "/api/get-users": self.get_users,
+            "/api/get-user": self.get_user,
+            "/api/update-user": self.update_user,
+            "/api/delete-user": self.delete_user,
+        }
+
+
+def get_sdk(sdk_class, endpoint, **kwargs):
+    return sdk_class(
+        endpoint,
+        test_util.TestClientId,
+        test_util.TestClientSecret,
+        test_util.TestJwtPublicKey,
+        "built-in",
+        test_util.TestApplication,
+        **kwargs,
+    )
+
+
+def get_user_requests(server):
+    return [request for request in server.requests if request[1] == "/api/get-user"]
+
+
+class SdkUserIndexTest(unittest.TestCase):
+    def test_loaded_index(self):
+        store = UserStore(250)
+        with test_util.LocalCasdoorServer(store.routes()) as server:
+            sdk = get_sdk(CasdoorSDK, server.endpoint)
+            index = sdk.load_user_index(page_size=100)
+            self.assertIs(sdk.user_index, index)
+            self.assertEqual(len(index), 250)
+            self.assertEqual(sdk.get_user("user7").email, "user7@example.com")
+            self.assertEqual(sdk.get_user_by_email("user8@example.com").name, "user8")
+            self.assertEqual(sdk.get_user_by_phone("5550009").name, "user9")
+            self.assertEqual(sdk.get_user_by_user_id("uid-user10").name, "user10")
+            self.assertEqual(get_user_requests(server), [])
+
+            user = sdk.get_user("user7")
+            user.email = "seven@example.com"
+            sdk.update_user(user)
+            self.assertNotIn("built-in/user7", index)
+            self.assertIsNone(sdk.get_user_by_email("user7@example.com"))
+            self.assertEqual(sdk.get_user_by_email("seven@example.com").name, "user7")
+            self.assertEqual(sdk.get_user("user7").email, "seven@example.com")
+            self.assertEqual(len(get_user_requests(server)), 2)
+
+            sdk.delete_user(sdk.get_user("user8"))
+            self.assertIsNone(sdk.get_user_by_email("user8@example.com"))
+
+    def test_warms_up_on_lookups(self):
+        store = UserStore(3)
+        with test_util.LocalCasdoorServer(store.routes()) as server:
+            sdk = get_sdk(CasdoorSDK, server.endpoint, user_index=UserIndex())
+            self.assertEqual(sdk.get_user_by_email("user1@example.com").name, "user1")
+            self.assertEqual(sdk.get_user("user1").phone, "5550001")
+            self.assertEqual(sdk.get_user_by_user_id("uid-user1").name, "user1")
+            self.assertIsNone(sdk.get_user("nobody"))
+        self.assertEqual(len(get_user_requests(server)), 2)
+
+
+class AsyncSdkUserIndexTest(IsolatedAsyncioTestCase):
+    async def test_get_user(self):
+        store = UserStore(3)
+        index = UserIndex(store.users.values())
+        with test_util.LocalCasdoorServer(store.routes()) as server:
+            async with get_sdk(AsyncCasdoorSDK, server.endpoint, user_index=index) as sdk:
+                self.assertEqual((await sdk.get_user("user1"))["email"], "user1@example.com")
+                self.assertEqual(get_user_requests(server), [])
+                await sdk.update_user(User.from_dict(user_data("user1", email="one@example.com")))
+                self.assertIsNone(index.get("email", "user1@example.com"))
+                self.assertEqual((await sdk.get_user("user1"))["email"], "one@example.com")
+                self.assertEqual(index.get("email", "one@example.com")["name"], "user1")
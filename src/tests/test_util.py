@@ -12,7 +12,19 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import datetime
+import json
 import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import jwt
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
 
 TestEndpoint = "https://demo.casdoor.com"
 TestClientId = "294b09fbc17f95daf2fe"
@@ -58,3 +70,118 @@ def get_random_code(length):
 
 def get_random_name(prefix):
     return f"{prefix}_{get_random_code(6)}"
+
+
+def generate_signing_key(common_name="Casdoor Cert"):
+    """
+    Generate an RSA key pair with a self-signed certificate, like the ones
+    Casdoor issues, so tokens can be signed and verified offline.
+
+    :return: a tuple of (private key, certificate PEM string)
+    """
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name(
+        [
+            x509.NameAttribute(NameOID.ORGANIZATION_NAME, "Casdoor Organization"),
+            x509.NameAttribute(NameOID.COMMON_NAME, common_name),
+        ]
+    )
+    now = datetime.datetime.now(datetime.timezone.utc)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(private_key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now)
+        .not_valid_after(now + datetime.timedelta(days=365))
+        .sign(private_key, hashes.SHA256())
+    )
+    return private_key, certificate.public_bytes(serialization.Encoding.PEM).decode("utf-8")
+
+
+def sign_token(private_key, audience=TestClientId, expires_in=3600, kid=None, **claims):
+    """
+    Sign an RS256 access token for audience with the given extra claims.
+    """
+    payload = {"aud": audience, "exp": int(time.time()) + expires_in, **claims}
+    headers = {"kid": kid} if kid else None
+    return jwt.encode(payload, private_key, algorithm="RS256", headers=headers)
+
+
+class LocalCasdoorServer:
+    """
+    A minimal keep-alive HTTP server standing in for Casdoor in offline tests
+    and benchmarks.
+
+    Each route maps an API path to a callable receiving the parsed query
+    (a dict of str to str) and the raw request body, and returning the object
+    to send back as JSON. Unknown paths answer {"status": "ok", "data": None}.
+    """
+
+    def __init__(self, routes=None):
+        self.routes = dict(routes or {})
+        self.requests = []
+        self.response_headers = {}
+        self.connections = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def log_message(self, format, *args):
+                pass
+
+            def _handle(self, method):
+                url = urlparse(self.path)
+                query = {key: values[-1] for key, values in parse_qs(url.query, keep_blank_values=True).items()}
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                with server._lock:
+                    server.requests.append((method, url.path, query, body))
+                route = server.routes.get(url.path)
+                result = route(query, body) if route else {"status": "ok", "data": None}
+                payload = json.dumps(result).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for key, value in server.response_headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                self._handle("GET")
+
+            def do_POST(self):
+                self._handle("POST")
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def endpoint(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()